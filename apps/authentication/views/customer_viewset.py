@@ -10,6 +10,8 @@ from rest_framework import status
 
 from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiExample
 
+from core.pagination import KeysetPagination
+
 from ..models import Customer
 from ..serializers import CustomerSerializer
 
@@ -120,6 +122,7 @@ from ..serializers import CustomerSerializer
 class CustomerViewSet(viewsets.ModelViewSet):
     queryset = Customer.objects.all()
     serializer_class = CustomerSerializer
+    pagination_class = KeysetPagination
 
     @method_decorator(cache_page(60))
     def list(self, request, *args, **kwargs):
@@ -0,0 +1,280 @@
+import logging
+import pickle
+import time
+
+from collections import OrderedDict
+from threading import Lock
+
+from django.core.cache import caches
+from django.core.cache.backends.base import BaseCache, DEFAULT_TIMEOUT
+
+logger = logging.getLogger('error')
+
+_MISSING = object()
+
+_tiers = {}
+_tiers_lock = Lock()
+
+
+class LocalTier:
+    """
+    In-process LRU cache bounded by the pickled size of its entries
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+
+        self.hits = 0
+        self.misses = 0
+
+        self.__entries: OrderedDict[str, tuple[bytes, float | None]] = OrderedDict()
+        self.__lock = Lock()
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def __discard(self, key: str):
+        payload, _ = self.__entries.pop(key)
+        self.size -= len(key) + len(payload)
+
+    def get(self, key: str):
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None and entry[1] is not None and entry[1] <= time.time():
+                self.__discard(key)
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return _MISSING
+
+            self.__entries.move_to_end(key)
+            self.hits += 1
+
+        return pickle.loads(entry[0])
+
+    def set(self, key: str, value, expires_at: float | None):
+        payload = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        entry_size = len(key) + len(payload)
+
+        with self.__lock:
+            if key in self.__entries:
+                self.__discard(key)
+
+            if entry_size > self.max_bytes:
+                return
+
+            while self.__entries and self.size + entry_size > self.max_bytes:
+                self.__discard(next(iter(self.__entries)))
+
+            self.__entries[key] = (payload, expires_at)
+            self.size += entry_size
+
+    def touch(self, key: str, expires_at: float | None):
+        with self.__lock:
+            if key not in self.__entries:
+                return False
+
+            self.__entries[key] = (self.__entries[key][0], expires_at)
+
+        return True
+
+    def delete(self, key: str):
+        with self.__lock:
+            if key not in self.__entries:
+                return False
+
+            self.__discard(key)
+
+        return True
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+            self.size = 0
+
+
+class SharedTierState:
+    """
+    Counters and availability of the shared store, kept per process
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.unavailable_until = 0.0
+
+
+class TieredCache(BaseCache):
+    """
+    Cache backend that keeps a byte-bounded LRU in front of another configured cache (usually Redis).
+
+    Reads are served from the local tier first and promoted from the shared one on a local miss.
+    When the shared store raises, it is skipped for ``RETRY_AFTER`` seconds and the cache degrades
+    to the local tier alone. Local entries never outlive ``LOCAL_TIMEOUT`` seconds, which bounds how
+    stale one process can be after another one writes or deletes a key in the shared store.
+    """
+
+    def __init__(self, location, params):
+        super().__init__(params)
+
+        options = params.get('OPTIONS', {})
+        self._shared_alias = options.get('SHARED_CACHE')
+        self._local_timeout = options.get('LOCAL_TIMEOUT', 60)
+        self._retry_after = options.get('RETRY_AFTER', 30)
+
+        with _tiers_lock:
+            if location not in _tiers:
+                _tiers[location] = (LocalTier(options.get('MAX_BYTES', 64 * 1024 * 1024)), SharedTierState())
+
+            self._local, self._shared_state = _tiers[location]
+
+    @property
+    def _shared(self):
+        if self._shared_alias is None or self._shared_state.unavailable_until > time.time():
+            return None
+
+        return caches[self._shared_alias]
+
+    def __shared_failed(self, operation: str, error: Exception):
+        self._shared_state.errors += 1
+        self._shared_state.unavailable_until = time.time() + self._retry_after
+
+        logger.error(f'Shared cache {self._shared_alias} failed on {operation}, '
+                     f'using local tier for {self._retry_after}s: {error!r}')
+
+    def __local_expiry(self, timeout=DEFAULT_TIMEOUT):
+        local_expiry = time.time() + self._local_timeout
+        backend_expiry = self.get_backend_timeout(timeout)
+
+        if backend_expiry is None:
+            return local_expiry
+
+        return min(backend_expiry, local_expiry)
+
+    def get(self, key, default=None, version=None):
+        local_key = self.make_and_validate_key(key, version=version)
+
+        value = self._local.get(local_key)
+        if value is not _MISSING:
+            return value
+
+        shared = self._shared
+        if shared is None:
+            return default
+
+        try:
+            value = shared.get(key, _MISSING, version=version)
+        except Exception as error:
+            self.__shared_failed('get', error)
+            return default
+
+        if value is _MISSING:
+            self._shared_state.misses += 1
+            return default
+
+        self._shared_state.hits += 1
+        self._local.set(local_key, value, self.__local_expiry())
+
+        return value
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        local_key = self.make_and_validate_key(key, version=version)
+
+        self._local.set(local_key, value, self.__local_expiry(timeout))
+
+        shared = self._shared
+        if shared is None:
+            return
+
+        try:
+            shared.set(key, value, timeout=self.__shared_timeout(timeout), version=version)
+        except Exception as error:
+            self.__shared_failed('set', error)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        local_key = self.make_and_validate_key(key, version=version)
+
+        shared = self._shared
+        if shared is not None:
+            try:
+                added = shared.add(key, value, timeout=self.__shared_timeout(timeout), version=version)
+            except Exception as error:
+                self.__shared_failed('add', error)
+            else:
+                if added:
+                    self._local.set(local_key, value, self.__local_expiry(timeout))
+
+                return added
+
+        if self._local.get(local_key) is not _MISSING:
+            return False
+
+        self._local.set(local_key, value, self.__local_expiry(timeout))
+
+        return True
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        local_key = self.make_and_validate_key(key, version=version)
+
+        touched = self._local.touch(local_key, self.__local_expiry(timeout))
+
+        shared = self._shared
+        if shared is None:
+            return touched
+
+        try:
+            return shared.touch(key, timeout=self.__shared_timeout(timeout), version=version)
+        except Exception as error:
+            self.__shared_failed('touch', error)
+
+        return touched
+
+    def delete(self, key, version=None):
+        local_key = self.make_and_validate_key(key, version=version)
+
+        deleted = self._local.delete(local_key)
+
+        shared = self._shared
+        if shared is None:
+            return deleted
+
+        try:
+            return shared.delete(key, version=version) or deleted
+        except Exception as error:
+            self.__shared_failed('delete', error)
+
+        return deleted
+
+    def clear(self):
+        self._local.clear()
+
+        shared = self._shared
+        if shared is None:
+            return
+
+        try:
+            shared.clear()
+        except Exception as error:
+            self.__shared_failed('clear', error)
+
+    def __shared_timeout(self, timeout):
+        return self.default_timeout if timeout is DEFAULT_TIMEOUT else timeout
+
+    def stats(self):
+        return {
+            'local': {
+                'hits': self._local.hits,
+                'misses': self._local.misses,
+                'entries': len(self._local),
+                'bytes': self._local.size,
+            },
+            'shared': {
+                'hits': self._shared_state.hits,
+                'misses': self._shared_state.misses,
+                'errors': self._shared_state.errors,
+                'available': self._shared_state.unavailable_until <= time.time(),
+            },
+        }
@@ -0,0 +1,281 @@
+import hashlib
+import logging
+import time
+
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches, DEFAULT_CACHE_ALIAS
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.db.models import Model
+from django.dispatch import receiver
+
+from rest_framework import status
+
+logger = logging.getLogger('error')
+
+LIST = 'list'
+
+# Version of a model bumped along with any of its tags, guarding responses whose tags are only known once built
+CHANGES = 'changes'
+
+# Version included in every tagged response, bumped after an outage of the tag store
+GENERATION = 'generation'
+
+
+def tag(model: type[Model] | Model, pk=LIST) -> str:
+    """
+    Tag of a single object (``products.product:1``) or of a model's listings (``products.product:list``)
+    """
+
+    return f'{model._meta.label_lower}:{pk}'
+
+
+def _tags_cache():
+    return caches[getattr(settings, 'CACHE_TAGS_ALIAS', DEFAULT_CACHE_ALIAS)]
+
+
+def _version_key(cache_tag: str) -> str:
+    return f'tag-version:{cache_tag}'
+
+
+def _changes_tag(cache_tag: str) -> str:
+    model_label, _, _ = cache_tag.rpartition(':')
+
+    return f'{model_label}:{CHANGES}'
+
+
+class TagStoreUnavailable(Exception):
+    pass
+
+
+class TagStore:
+    """
+    Tag versions, kept in the ``CACHE_TAGS_ALIAS`` cache and read by every process. Every set of versions
+    includes the ``GENERATION`` one, shared by all tagged responses.
+
+    When the store fails it is skipped for ``RETRY_AFTER`` seconds and tagged responses are served uncached.
+    Invalidations made during the outage cannot be written, so every process that noticed it bumps
+    the generation as soon as the store answers again, which discards every tagged response cached before.
+    That covers the invalidations of processes that exited meanwhile, unless none of the remaining ones
+    used the store during the outage. The outage is logged once, not on every request
+    """
+
+    RETRY_AFTER = 30
+
+    def __init__(self):
+        self.degraded = False
+        self.retry_at = 0.0
+
+    def __failed(self, error: Exception):
+        self.retry_at = time.time() + self.RETRY_AFTER
+
+        if not self.degraded:
+            self.degraded = True
+            logger.error(f'Cache tag store failed, serving tagged responses uncached until it answers again: '
+                         f'{error!r}')
+
+    def __recover(self, cache):
+        """
+        Bumps the generation, as the invalidations made during the outage were lost
+        """
+
+        cache.set(_version_key(GENERATION), time.time_ns(), timeout=None)
+
+        self.degraded = False
+
+    def versions(self, tags) -> dict[str, int]:
+        if self.retry_at > time.time():
+            raise TagStoreUnavailable()
+
+        cache = _tags_cache()
+        keys = {_version_key(cache_tag): cache_tag for cache_tag in {*tags, GENERATION}}
+
+        try:
+            if self.degraded:
+                self.__recover(cache)
+
+            versions = cache.get_many(keys.keys())
+            for key in keys.keys() - versions.keys():
+                cache.add(key, time.time_ns(), timeout=None)
+                versions[key] = cache.get(key)
+        except Exception as error:
+            self.__failed(error)
+            raise TagStoreUnavailable() from error
+
+        return {keys[key]: version for key, version in versions.items()}
+
+    def bump(self, tags):
+        # Until the store answers again, the generation bumped on recovery covers the tags
+        if self.retry_at > time.time():
+            return
+
+        cache = _tags_cache()
+
+        try:
+            if self.degraded:
+                self.__recover(cache)
+
+            changed = {*tags, *map(_changes_tag, tags)}
+            cache.set_many({_version_key(cache_tag): time.time_ns() for cache_tag in changed}, timeout=None)
+        except Exception as error:
+            self.__failed(error)
+
+
+_tag_store = TagStore()
+
+
+@receiver(setting_changed)
+def reset_tag_store(setting, **kwargs):
+    global _tag_store
+
+    if setting in ('CACHES', 'CACHE_TAGS_ALIAS'):
+        _tag_store = TagStore()
+
+
+def get_tag_versions(tags) -> dict[str, int]:
+    """
+    Current version of each tag, and of the ``GENERATION``. Missing versions are created, so an evicted tag never
+    matches the version stored by an older entry. Raises ``TagStoreUnavailable`` while the store is down
+    """
+
+    return _tag_store.versions(tags)
+
+
+def invalidate_tags(*tags: str):
+    """
+    Bumps the version of every tag once the current transaction commits,
+    so readers cannot cache the uncommitted state again
+    """
+
+    transaction.on_commit(lambda: _tag_store.bump(tags))
+
+
+def invalidate_object(instance: Model, membership_changed: bool = False):
+    """
+    Invalidates the cached responses containing the instance and, when an object was created or deleted,
+    every cached listing of its model
+    """
+
+    tags = [tag(instance, instance.pk)]
+    if membership_changed:
+        tags.append(tag(instance))
+
+    invalidate_tags(*tags)
+
+
+class TaggedCacheMixin:
+    """
+    Tags cached viewset responses with the objects they contain; used along with ``cache_response``
+    """
+
+    def get_cache_tags(self, request, *args, **kwargs) -> set[str]:
+        """
+        Tags known before the response is built
+        """
+
+        model = self.get_queryset().model
+
+        lookup = kwargs.get(self.lookup_url_kwarg or self.lookup_field)
+        if lookup is not None:
+            return {tag(model, lookup)}
+
+        return {tag(model)}
+
+    def get_response_cache_tags(self, response) -> set[str]:
+        """
+        Tags of the objects listed in the current page
+        """
+
+        page = getattr(getattr(self, 'paginator', None), 'page', None)
+        if page is None:
+            return set()
+
+        model = self.get_queryset().model
+        pk = model._meta.pk.attname
+
+        # Rows of values() querysets are dictionaries keyed by column
+        return {tag(model, row[pk] if isinstance(row, dict) else row.pk) for row in page}
+
+    def get_response_cache_models(self) -> set[type[Model]]:
+        """
+        Models of the tags returned by ``get_response_cache_tags``, known before the response is built
+        """
+
+        return {self.get_queryset().model}
+
+
+def _response_key(request, headers, vary_on_user: bool) -> str:
+    varying = [request.get_full_path(), request.headers.get('Accept', '')]
+    varying.extend(request.headers.get(header, '') for header in headers)
+    if vary_on_user:
+        varying.append(str(request.user.pk))
+
+    digest = hashlib.md5('|'.join(varying).encode()).hexdigest()
+
+    return f'tagged-response:{digest}'
+
+
+def cache_response(timeout=DEFAULT_TIMEOUT, vary_on_headers=(), vary_on_user=False):
+    """
+    Caches a ``TaggedCacheMixin`` viewset action until it expires or one of its tags is invalidated.
+    With ``vary_on_user``, each authenticated user has its own entry, which survives token refreshes.
+
+    The versions of the tags taken from the response are read once it is built, so the response is only stored
+    when no object of their models changed meanwhile
+    """
+
+    def decorator(action):
+
+        @wraps(action)
+        def wrapper(view, request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return action(view, request, *args, **kwargs)
+
+            cache = caches[DEFAULT_CACHE_ALIAS]
+            key = _response_key(request, vary_on_headers, vary_on_user)
+
+            try:
+                entry = cache.get(key)
+                if entry is not None and get_tag_versions(entry[1].keys()) == entry[1]:
+                    return entry[0]
+
+                guards = {tag(model, CHANGES) for model in view.get_response_cache_models()}
+
+                versions = get_tag_versions(view.get_cache_tags(request, *args, **kwargs) | guards)
+            except TagStoreUnavailable:
+                return action(view, request, *args, **kwargs)
+
+            response = action(view, request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+
+            response_tags = view.get_response_cache_tags(response)
+
+            try:
+                built = get_tag_versions(response_tags | guards)
+            except TagStoreUnavailable:
+                return response
+
+            # A change committed while the response was built may be missing from it
+            if not set(map(_changes_tag, response_tags)) <= guards or any(built[cache_tag] != versions[cache_tag] for cache_tag in {*guards, GENERATION}):
+                return response
+
+            versions = {cache_tag: version for cache_tag, version in (versions | built).items()
+                        if cache_tag not in guards}
+
+            def store(rendered_response):
+                cache.set(key, (rendered_response, versions), timeout)
+
+            if hasattr(response, 'render') and callable(response.render):
+                response.add_post_render_callback(store)
+            else:
+                store(response)
+
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,2 @@
+from .tiered_cache_tests import TieredCacheTests
+from .tag_store_tests import TagStoreTests
@@ -0,0 +1,111 @@
+from unittest import mock
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import override_settings
+
+from rest_framework import test
+from rest_framework.test import APIClient
+
+from rest_framework.reverse import reverse
+
+from products.models import Product, Supplier
+
+from ..tags import TagStore, reset_tag_store, tag
+
+
+class FlakyCache(LocMemCache):
+    """
+    Shared store that fails like an unreachable Redis server while ``down`` is set
+    """
+
+    down = False
+
+    def __check(self):
+        if FlakyCache.down:
+            raise ConnectionError('Shared store is down')
+
+    def get(self, key, default=None, version=None):
+        self.__check()
+        return super().get(key, default=default, version=version)
+
+    def set(self, key, value, timeout=None, version=None):
+        self.__check()
+        super().set(key, value, timeout=timeout, version=version)
+
+    def add(self, key, value, timeout=None, version=None):
+        self.__check()
+        return super().add(key, value, timeout=timeout, version=version)
+
+
+@override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tag-store-tests'},
+    'shared': {'BACKEND': 'caching.tests.tag_store_tests.FlakyCache', 'LOCATION': 'tag-store-tests-shared'},
+}, CACHE_TAGS_ALIAS='shared')
+class TagStoreTests(test.APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.client: APIClient = APIClient()
+
+        supplier: Supplier = Supplier.objects.create(name='TestCia', address='TestStreet', phone='99999999999')
+        cls.product: Product = Product.objects.create(name='Test Product', description='Test description',
+                                                      category=Product.Category.SCIENCE, supplier=supplier)
+
+    def setUp(self):
+        reset_tag_store('CACHE_TAGS_ALIAS')
+
+        FlakyCache.down = False
+        self.addCleanup(setattr, FlakyCache, 'down', False)
+
+    def test_if_an_unavailable_store_is_logged_once(self):
+        """
+        Tests if tagged responses are served uncached while the tag store is down and the outage is logged once
+        """
+
+        FlakyCache.down = True
+        url = reverse('product-detail', args=[self.product.id])
+
+        with self.assertLogs('error', level='ERROR') as logs:
+            responses = [self.client.get(url) for _ in range(3)]
+
+        self.assertListEqual([response.status_code for response in responses], [200] * 3)
+        self.assertEqual(len(logs.output), 1)
+
+    @mock.patch.object(TagStore, 'RETRY_AFTER', 0)
+    def test_if_invalidations_made_during_an_outage_are_applied_once_it_recovers(self):
+        """
+        Tests if a response cached before the tag store went down is not served once it recovers,
+        when its object changed during the outage
+        """
+
+        url = reverse('product-detail', args=[self.product.id])
+        self.client.get(url)
+
+        FlakyCache.down = True
+        self.product.name = 'Updated Name'
+        with self.assertLogs('error', level='ERROR'), self.captureOnCommitCallbacks(execute=True):
+            self.product.save()
+
+        FlakyCache.down = False
+
+        self.assertEqual(self.client.get(url).data.get('name'), 'Updated Name')
+
+    @mock.patch.object(TagStore, 'RETRY_AFTER', 0)
+    def test_if_invalidations_lost_with_another_process_are_covered_once_the_store_recovers(self):
+        """
+        Tests if a response cached before the tag store went down is not served once it recovers, when another
+        process changed its object during the outage and exited before writing the invalidation
+        """
+
+        url = reverse('product-detail', args=[self.product.id])
+        self.client.get(url)
+
+        FlakyCache.down = True
+        Product.objects.filter(pk=self.product.id).update(name='Updated Name')
+        with self.assertLogs('error', level='ERROR'):
+            TagStore().bump([tag(Product, self.product.id)])
+            self.client.get(url)
+
+        FlakyCache.down = False
+
+        self.assertEqual(self.client.get(url).data.get('name'), 'Updated Name')
@@ -0,0 +1,128 @@
+from django.test import SimpleTestCase, override_settings
+
+from django.core.cache import caches
+from django.core.cache.backends.base import BaseCache
+
+from ..backends import TieredCache
+
+
+class UnavailableCache(BaseCache):
+    """
+    Fake shared store that behaves like an unreachable Redis server
+    """
+
+    def __init__(self, location, params):
+        super().__init__(params)
+
+    def get(self, key, default=None, version=None):
+        raise ConnectionError('Shared store is down')
+
+    def set(self, key, value, timeout=None, version=None):
+        raise ConnectionError('Shared store is down')
+
+    def delete(self, key, version=None):
+        raise ConnectionError('Shared store is down')
+
+
+@override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+    'shared': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tiered-tests'},
+    'unavailable': {'BACKEND': 'caching.tests.tiered_cache_tests.UnavailableCache'},
+})
+class TieredCacheTests(SimpleTestCase):
+
+    def setUp(self):
+        caches['shared'].clear()
+
+    def __create_cache(self, shared='shared', **options):
+        options.setdefault('SHARED_CACHE', shared)
+
+        return TieredCache(self.id(), {'OPTIONS': options})
+
+    def test_if_values_are_written_to_both_tiers(self):
+        """
+        Tests if a set value is served by the local tier and also stored in the shared one
+        """
+
+        cache: TieredCache = self.__create_cache()
+
+        cache.set('product', {'id': 1})
+
+        self.assertDictEqual(cache.get('product'), {'id': 1})
+        self.assertDictEqual(caches['shared'].get('product'), {'id': 1})
+        self.assertEqual(cache.stats()['local']['hits'], 1)
+        self.assertEqual(cache.stats()['shared']['hits'], 0)
+
+    def test_if_a_local_miss_is_promoted_from_the_shared_tier(self):
+        """
+        Tests if a value written by another process is read from the shared tier once and then kept locally
+        """
+
+        cache: TieredCache = self.__create_cache()
+        caches['shared'].set('product', {'id': 1})
+
+        self.assertDictEqual(cache.get('product'), {'id': 1})
+        self.assertDictEqual(cache.get('product'), {'id': 1})
+
+        stats = cache.stats()
+        self.assertEqual(stats['local']['misses'], 1)
+        self.assertEqual(stats['local']['hits'], 1)
+        self.assertEqual(stats['shared']['hits'], 1)
+
+    def test_if_delete_removes_the_key_from_both_tiers(self):
+        """
+        Tests if delete removes the key from the local and shared tiers
+        """
+
+        cache: TieredCache = self.__create_cache()
+        cache.set('product', {'id': 1})
+
+        self.assertTrue(cache.delete('product'))
+
+        self.assertIsNone(cache.get('product'))
+        self.assertIsNone(caches['shared'].get('product'))
+
+    def test_if_local_tier_evicts_the_least_recently_used_entries_over_the_byte_budget(self):
+        """
+        Tests if the local tier evicts the least recently used entries once the byte budget is exceeded
+        """
+
+        cache: TieredCache = self.__create_cache(shared=None, MAX_BYTES=1024)
+
+        cache.set('first', 'x' * 400)
+        cache.set('second', 'x' * 400)
+        cache.get('first')
+        cache.set('third', 'x' * 400)
+
+        self.assertIsNotNone(cache.get('first'))
+        self.assertIsNone(cache.get('second'))
+        self.assertIsNotNone(cache.get('third'))
+        self.assertLessEqual(cache.stats()['local']['bytes'], 1024)
+
+    def test_if_local_tier_respects_the_timeout(self):
+        """
+        Tests if a value with an expired timeout is not served by the local tier
+        """
+
+        cache: TieredCache = self.__create_cache(shared=None)
+
+        cache.set('product', {'id': 1}, timeout=0)
+
+        self.assertIsNone(cache.get('product'))
+
+    def test_if_cache_degrades_to_the_local_tier_when_the_shared_store_is_unavailable(self):
+        """
+        Tests if the cache keeps serving from the local tier and stops calling the shared store after it fails
+        """
+
+        cache: TieredCache = self.__create_cache(shared='unavailable')
+
+        with self.assertLogs('error', level='ERROR'):
+            cache.set('product', {'id': 1})
+
+        self.assertDictEqual(cache.get('product'), {'id': 1})
+        self.assertIsNone(cache.get('supplier'))
+
+        stats = cache.stats()
+        self.assertEqual(stats['shared']['errors'], 1)
+        self.assertFalse(stats['shared']['available'])
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from django.utils.translation import gettext_lazy as _
+
+from cart.snapshots import SaleItemSnapshot
+
+
+class Command(BaseCommand):
+    help = _('Writes the line items of the sales made before they were recorded at checkout')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=10_000)
+
+    def handle(self, *args, **options):
+        created = SaleItemSnapshot.backfill(chunk_size=options['chunk_size'])
+
+        self.stdout.write(_(f'Created {created} sale items'))
@@ -0,0 +1,20 @@
+# Generated by Django 5.0.1 on 2026-10-18 09:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cart', '0002_remove_cart_products_cart_product_and_more'),
+        ('products', '0010_keyset_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='sale',
+            index=models.Index(fields=['customer', 'date', 'id'], name='sale_customer_date_idx'),
+        ),
+    ]
@@ -0,0 +1,84 @@
+# Generated by Django 5.0.1 on 2026-10-18 09:42
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def create_first_run(apps, schema_editor):
+    SalesRollupRun = apps.get_model('cart', 'SalesRollupRun')
+
+    # Every run locks the first one, so it must exist before the first run
+    if not SalesRollupRun.objects.exists():
+        SalesRollupRun.objects.create(sales=0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cart', '0003_sale_customer_date_index'),
+        ('products', '0010_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sale',
+            name='rolled_up',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.CreateModel(
+            name='DailySales',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('payment_method', models.IntegerField(choices=[(1, 'Pix'), (2, 'Credit'), (3, 'Debit')])),
+                ('revenue', models.BigIntegerField(default=0)),
+                ('units', models.PositiveIntegerField(default=0)),
+                ('orders', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'Daily sales',
+                'ordering': ['date', 'payment_method'],
+            },
+        ),
+        migrations.CreateModel(
+            name='SalesRollupRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sales', models.PositiveIntegerField()),
+                ('date', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyProductSales',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('payment_method', models.IntegerField(choices=[(1, 'Pix'), (2, 'Credit'), (3, 'Debit')])),
+                ('category', models.IntegerField(choices=[(1, 'Science'), (2, 'Fiction'), (3, 'Journalism'), (4, 'Didactic')])),
+                ('revenue', models.BigIntegerField(default=0)),
+                ('units', models.PositiveIntegerField(default=0)),
+                ('orders', models.PositiveIntegerField(default=0)),
+                ('supplier', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to='products.supplier')),
+            ],
+            options={
+                'verbose_name_plural': 'Daily product sales',
+                'ordering': ['date', 'payment_method', 'category', 'supplier'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='dailysales',
+            constraint=models.UniqueConstraint(fields=('date', 'payment_method'), name='unique_daily_sales'),
+        ),
+        migrations.AddConstraint(
+            model_name='dailyproductsales',
+            constraint=models.UniqueConstraint(fields=('date', 'payment_method', 'category', 'supplier'), name='unique_daily_product_sales'),
+        ),
+        migrations.AddIndex(
+            model_name='sale',
+            index=models.Index(condition=models.Q(('rolled_up', False)), fields=['id'], name='sale_rollup_pending_idx'),
+        ),
+        migrations.RunPython(create_first_run, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.0.1 on 2026-10-18 09:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cart', '0004_sales_rollups'),
+        ('products', '0010_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SaleItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('unit_price', models.IntegerField(null=True)),
+                ('quantity', models.PositiveIntegerField(default=1)),
+                ('category', models.IntegerField(choices=[(1, 'Science'), (2, 'Fiction'), (3, 'Journalism'), (4, 'Didactic')], null=True)),
+                ('product', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='products.product')),
+                ('sale', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='items', to='cart.sale')),
+                ('supplier', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='products.supplier')),
+            ],
+            options={
+                'ordering': ['sale', 'id'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='saleitem',
+            constraint=models.UniqueConstraint(fields=('sale', 'product'), name='unique_sale_item'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.0.1 on 2026-10-18 10:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cart', '0005_sale_items'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sale',
+            name='co_purchases_counted',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='sale',
+            index=models.Index(condition=models.Q(('co_purchases_counted', False)), fields=['id'], name='sale_co_purchase_pending_idx'),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import Q
 
 from django.utils.translation import gettext as _
 
@@ -22,6 +23,13 @@ class Sale(models.Model):
 
     class Meta:
         ordering = ['id']
+        indexes = [
+            models.Index(fields=['customer', 'date', 'id'], name='sale_customer_date_idx'),
+            # Sales waiting for the next run of SalesRollup
+            models.Index(fields=['id'], condition=Q(rolled_up=False), name='sale_rollup_pending_idx'),
+            # Sales waiting for the next run of CoPurchaseMatrix
+            models.Index(fields=['id'], condition=Q(co_purchases_counted=False), name='sale_co_purchase_pending_idx'),
+        ]
 
     class Payment(models.IntegerChoices):
         PIX = 1, _('Pix'),
@@ -35,6 +43,97 @@ class Sale(models.Model):
     delivery_address = models.CharField(max_length=64)
     payment_method = models.IntegerField(choices=Payment)
     date = models.DateField(auto_now=True)
+    rolled_up = models.BooleanField(default=False)
+    co_purchases_counted = models.BooleanField(default=False)
 
     def __str__(self) -> str:
         return f'Sold to {self.customer.username} at {self.date}'
+
+
+class SaleItem(models.Model):
+    """
+    Product of a sale with its price, category and supplier at checkout, so receipts and reports
+    never look them up again
+    """
+
+    class Meta:
+        ordering = ['sale', 'id']
+        constraints = [
+            models.UniqueConstraint(fields=['sale', 'product'], name='unique_sale_item'),
+        ]
+
+    sale = models.ForeignKey(Sale, on_delete=models.CASCADE, related_name='items')
+    product = models.ForeignKey(Product, on_delete=models.SET_NULL, null=True, related_name='+')
+    # Unknown for the sales backfilled on days their product had no price
+    unit_price = models.IntegerField(null=True)
+    quantity = models.PositiveIntegerField(default=1)
+    category = models.IntegerField(choices=Product.Category, null=True)
+    supplier = models.ForeignKey('products.Supplier', on_delete=models.SET_NULL, null=True, related_name='+')
+
+    def __str__(self) -> str:
+        return _(f'{self.quantity} x {self.product_id} in sale {self.sale_id}')
+
+
+class DailySales(models.Model):
+    """
+    Sales of a day paid with a payment method, kept up to date by ``SalesRollup``
+    """
+
+    class Meta:
+        ordering = ['date', 'payment_method']
+        verbose_name_plural = _('Daily sales')
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'payment_method'], name='unique_daily_sales'),
+        ]
+
+    date = models.DateField()
+    payment_method = models.IntegerField(choices=Sale.Payment)
+
+    revenue = models.BigIntegerField(default=0)
+    units = models.PositiveIntegerField(default=0)
+    orders = models.PositiveIntegerField(default=0)
+
+    def __str__(self) -> str:
+        return _(f'Sales of {self.date} paid with {self.get_payment_method_display()}')
+
+
+class DailyProductSales(models.Model):
+    """
+    Items of a day's sales by payment method, category and supplier, kept up to date by ``SalesRollup``.
+    A sale is counted in the orders of every cell it has items in
+    """
+
+    class Meta:
+        ordering = ['date', 'payment_method', 'category', 'supplier']
+        verbose_name_plural = _('Daily product sales')
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'payment_method', 'category', 'supplier'],
+                                    name='unique_daily_product_sales'),
+        ]
+
+    date = models.DateField()
+    payment_method = models.IntegerField(choices=Sale.Payment)
+    category = models.IntegerField(choices=Product.Category)
+    supplier = models.ForeignKey('products.Supplier', on_delete=models.SET_NULL, null=True)
+
+    revenue = models.BigIntegerField(default=0)
+    units = models.PositiveIntegerField(default=0)
+    orders = models.PositiveIntegerField(default=0)
+
+    def __str__(self) -> str:
+        return _(f'Product sales of {self.date}')
+
+
+class SalesRollupRun(models.Model):
+    """
+    Run of ``SalesRollup``. The first one, created by the migrations, is locked by every run
+    """
+
+    class Meta:
+        ordering = ['-id']
+
+    sales = models.PositiveIntegerField()
+    date = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self) -> str:
+        return _(f'Sales rollup of {self.sales} sales at {self.date}')
@@ -0,0 +1,154 @@
+from collections import defaultdict
+from datetime import date
+
+from django.db import transaction
+from django.db.models import Count, F, Sum, Value
+from django.db.models.functions import Coalesce
+
+from caching.tags import invalidate_tags, tag
+
+from .models import Sale, SaleItem, DailySales, DailyProductSales, SalesRollupRun
+
+MEASURES = ['revenue', 'units', 'orders']
+
+
+class SalesRollup:
+    """
+    Daily sales totals by payment method, and by category and supplier of the items sold, as they were at checkout.
+    Each run adds the sales not rolled up yet, aggregated by the database a chunk of sales at a time, so the cost
+    of a run depends on the new sales and a report reads the rollup cells only. Sales are marked as they are added
+    rather than read past the last id, so a sale committed after one with a greater id is still counted, once.
+    """
+
+    DIMENSIONS = ['date', 'payment_method', 'category', 'supplier']
+
+    @staticmethod
+    def __merge(model, fields: list[str], deltas: list[dict]):
+        """
+        Adds the measures of each delta to the cell with the same fields, creating the missing cells
+        """
+
+        cells = {
+            tuple(getattr(cell, field) for field in fields): cell
+            for cell in model.objects.filter(date__in={delta.get('date') for delta in deltas})
+        }
+
+        changed, created = [], []
+        for delta in deltas:
+            key = tuple(delta.get(field) for field in fields)
+
+            cell = cells.get(key)
+            if cell is None:
+                cell = cells[key] = model(**dict(zip(fields, key)))
+                created.append(cell)
+            else:
+                changed.append(cell)
+
+            for measure in MEASURES:
+                setattr(cell, measure, getattr(cell, measure) + delta.get(measure))
+
+        model.objects.bulk_update(changed, MEASURES)
+        model.objects.bulk_create(created)
+
+    @staticmethod
+    def __add_sales(sale_ids: list[int]) -> int:
+        items = list(SaleItem.objects
+                     .filter(sale_id__in=sale_ids)
+                     .values('category', 'supplier_id', date=F('sale__date'), payment_method=F('sale__payment_method'))
+                     .annotate(revenue=Coalesce(Sum(F('unit_price') * F('quantity')), Value(0)),
+                               units=Sum('quantity'),
+                               orders=Count('sale_id', distinct=True))
+                     .order_by())
+
+        sales = list(Sale.objects
+                     .filter(pk__in=sale_ids)
+                     .values('date', 'payment_method')
+                     .annotate(revenue=Sum('total'), orders=Count('id'))
+                     .order_by())
+
+        # The units of a day count every item, like its revenue and orders count every sale, while items
+        # of products deleted before their category was snapshotted have no product cell
+        units = defaultdict(int)
+        for item in items:
+            units[(item.get('date'), item.get('payment_method'))] += item.get('units')
+        for sale in sales:
+            sale['units'] = units[(sale.get('date'), sale.get('payment_method'))]
+
+        SalesRollup.__merge(DailyProductSales, ['date', 'payment_method', 'category', 'supplier_id'],
+                            [item for item in items if item.get('category') is not None])
+        SalesRollup.__merge(DailySales, ['date', 'payment_method'], sales)
+
+        Sale.objects.filter(pk__in=sale_ids).update(rolled_up=True)
+
+        return sum(sale.get('orders') for sale in sales)
+
+    @staticmethod
+    def __lock():
+        """
+        Serializes the chunks of every run on the first run, so concurrent runs never add the same sales
+        or overwrite each other's cells
+        """
+
+        if SalesRollupRun.objects.select_for_update().order_by('id').first() is None:
+            # Only if the runs were deleted, as the migrations create the first one
+            SalesRollupRun.objects.create(sales=0)
+
+    @staticmethod
+    def update(chunk_size: int = 1000, full: bool = False) -> SalesRollupRun | None:
+        """
+        Adds the sales not rolled up yet to the rollups, ``chunk_size`` sales per transaction. Sales are marked
+        in the transaction that adds them, so a failed run keeps the chunks it committed
+        """
+
+        if full:
+            with transaction.atomic():
+                SalesRollup.__lock()
+
+                DailySales.objects.all().delete()
+                DailyProductSales.objects.all().delete()
+                Sale.objects.filter(rolled_up=True).update(rolled_up=False)
+
+                invalidate_tags(tag(DailySales))
+
+        pending = Sale.objects.filter(rolled_up=False).order_by('id').values_list('id', flat=True)
+
+        sales = 0
+        while True:
+            with transaction.atomic():
+                SalesRollup.__lock()
+
+                # Read under the lock, so the sales added by a concurrent run are never added again
+                chunk = list(pending[:chunk_size])
+                if not chunk:
+                    break
+
+                sales += SalesRollup.__add_sales(chunk)
+
+                invalidate_tags(tag(DailySales))
+
+        if not sales:
+            return None
+
+        return SalesRollupRun.objects.create(sales=sales)
+
+    @staticmethod
+    def report(since: date | None = None, until: date | None = None, group_by=('date',)) -> list[dict]:
+        """
+        Revenue, units and orders between the dates, both included, summed by the ``group_by`` dimensions.
+        Grouped by category or supplier, orders are summed over the product cells, so a sale counts once
+        in each category and supplier pair it has items of
+        """
+
+        model = DailyProductSales if {'category', 'supplier'} & set(group_by) else DailySales
+
+        cells = model.objects.all()
+        if since is not None:
+            cells = cells.filter(date__gte=since)
+        if until is not None:
+            cells = cells.filter(date__lte=until)
+
+        totals = {measure: Coalesce(Sum(measure), Value(0)) for measure in MEASURES}
+        if not group_by:
+            return [cells.aggregate(**totals)]
+
+        return list(cells.values(*group_by).annotate(**totals).order_by(*group_by))
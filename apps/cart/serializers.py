@@ -6,11 +6,12 @@ from products.models import Product
 
 class CartRequestSerializer(serializers.ModelSerializer):
 
-    product = serializers.PrimaryKeyRelatedField(queryset=Product.objects.all())
+    product = serializers.PrimaryKeyRelatedField(queryset=Product.objects.all(), required=False)
+    products = serializers.PrimaryKeyRelatedField(queryset=Product.objects.all(), many=True, required=False)
 
     class Meta:
         model = models.Cart
-        fields = ['customer', 'product']
+        fields = ['customer', 'product', 'products']
 
 
 class CartSerializer(serializers.ModelSerializer):
@@ -20,6 +21,24 @@ class CartSerializer(serializers.ModelSerializer):
         fields = ['id', 'customer', 'product']
 
 
+class CartItemSerializer(serializers.Serializer):
+
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    current_price = serializers.IntegerField(allow_null=True)
+
+
+class CartContentSerializer(serializers.Serializer):
+    """
+    Cart with the name and current price of its products, serialized from the rows of a single joined query
+    """
+
+    id = serializers.IntegerField()
+    customer = serializers.IntegerField()
+    product = serializers.ListField(child=serializers.IntegerField())
+    items = CartItemSerializer(many=True)
+
+
 class SaleRequestSerializer(serializers.ModelSerializer):
 
     products = serializers.PrimaryKeyRelatedField(queryset=Product.objects.all(), many=True)
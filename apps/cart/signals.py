@@ -0,0 +1,21 @@
+from django.db.models.signals import m2m_changed
+from django.dispatch import receiver
+
+from caching.tags import invalidate_tags, tag
+
+from .models import Cart
+
+
+@receiver(m2m_changed, sender=Cart.product.through)
+def invalidate_changed_cart(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Products added to or removed from carts through the ORM; the cart views bulk insert and delete
+    the cart rows, so they invalidate the carts themselves
+    """
+
+    if not action.startswith('post_'):
+        return
+
+    cart_ids = (pk_set or ()) if reverse else [instance.pk]
+    if cart_ids:
+        invalidate_tags(*(tag(Cart, cart_id) for cart_id in cart_ids))
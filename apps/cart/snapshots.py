@@ -0,0 +1,62 @@
+from django.db import connections, router, transaction
+from django.db.models import Exists, F, Max, OuterRef, Value
+
+from products.prices import PriceResolver
+
+from .models import Sale, SaleItem
+
+SaleProduct = Sale.products.through
+
+
+class SaleItemSnapshot:
+    """
+    Writes the line items of sales made before ``SaleItem`` existed, pricing each product as it was
+    on the day of its sale, or leaving it unpriced if it had no price then. Categories and suppliers are
+    the current ones, the closest to checkout still known. Every chunk of sale ids is copied by a single
+    ``INSERT ... SELECT``, so the database does the whole backfill without rows going through Python.
+    """
+
+    @staticmethod
+    def __copy(start: int, end: int) -> int:
+        unit_price = PriceResolver.price_as_of(OuterRef('product_id'), OuterRef('sale__date'))
+
+        rows = (SaleProduct.objects
+                .filter(sale_id__gt=start, sale_id__lte=end)
+                .exclude(Exists(SaleItem.objects.filter(sale_id=OuterRef('sale_id'), product_id=OuterRef('product_id'))))
+                .annotate(unit_price=unit_price,
+                          quantity=Value(1),
+                          category=F('product__category'),
+                          supplier_id=F('product__supplier_id'))
+                .values_list('sale_id', 'product_id', 'unit_price', 'quantity', 'category', 'supplier_id')
+                # Items are listed by id, so they are written in the order of their products
+                .order_by('sale_id', 'product_id'))
+
+        connection = connections[router.db_for_write(SaleItem)]
+        options = SaleItem._meta
+
+        table = connection.ops.quote_name(options.db_table)
+        columns = ', '.join(
+            connection.ops.quote_name(options.get_field(field).column)
+            for field in ('sale', 'product', 'unit_price', 'quantity', 'category', 'supplier')
+        )
+        select, params = rows.query.sql_with_params()
+
+        with connection.cursor() as cursor:
+            cursor.execute(f'INSERT INTO {table} ({columns}) {select}', params)
+
+            return cursor.rowcount
+
+    @staticmethod
+    def backfill(chunk_size: int = 10_000) -> int:
+        """
+        Creates the missing items of every sale, ``chunk_size`` sale ids per transaction, and returns how many
+        """
+
+        end = Sale.objects.aggregate(last=Max('id')).get('last') or 0
+
+        created = 0
+        for start in range(0, end, chunk_size):
+            with transaction.atomic():
+                created += SaleItemSnapshot.__copy(start, min(start + chunk_size, end))
+
+        return created
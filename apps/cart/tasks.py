@@ -0,0 +1,11 @@
+from celery import shared_task
+
+
+@shared_task(max_retries=3)
+def update_sales_rollup(chunk_size: int = 1000):
+
+    from .rollups import SalesRollup
+
+    run = SalesRollup.update(chunk_size=chunk_size)
+
+    return 0 if run is None else run.sales
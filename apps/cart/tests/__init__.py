@@ -1,2 +1,7 @@
 from .cart_serializer_tests import CartSerializerTests
 from .sale_serializer_tests import SaleSerializerTests
+from .sale_viewset_tests import SaleViewSetTests
+from .cart_viewset_tests import CartViewSetTests
+from .sales_rollup_tests import SalesRollupTests
+from .sale_item_tests import SaleItemTests
+from .query_plan_tests import QueryPlanTests
@@ -0,0 +1,232 @@
+from rest_framework import test
+from rest_framework.test import APIClient
+
+from rest_framework.reverse import reverse
+
+from rest_framework import status
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from authentication.models import Customer
+from authentication.serializers import CustomerSerializer
+from products.models import Product, Supplier, PriceHistory
+
+from ..models import Cart
+
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+class CartViewSetTests(test.APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.client: APIClient = APIClient()
+
+        cls.list_url = reverse('cart-list')
+
+        customers = []
+        for index in range(2):
+            serializer: CustomerSerializer = CustomerSerializer(data={
+                'username': f'testuser{index}',
+                'email': f'test{index}@test.dev',
+                'password': 'testpassword'
+            })
+            serializer.is_valid()
+
+            customers.append(serializer.save())
+
+        cls.customer, cls.other_customer = customers
+
+        supplier: Supplier = Supplier.objects.create(name='TestCia', address='TestStreet', phone='99999999999')
+
+        cls.products = [
+            Product.objects.create(
+                name=f'Test Product {index}',
+                description='Test description',
+                sku=f'T1-TP{index}',
+                category=Product.Category.SCIENCE,
+                supplier=supplier
+            )
+            for index in range(5)
+        ]
+
+    def __authenticate(self, customer: Customer):
+        refresh = RefreshToken.for_user(customer)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+
+    def __retrieve(self, customer: Customer):
+        return self.client.get(reverse('cart-detail', args=[Cart.objects.get(customer=customer).id]))
+
+    def __add(self, **data):
+        return self.client.post(self.list_url, data={'customer': self.customer.id} | data, format='json')
+
+    def __cart_product_ids(self) -> set[int]:
+        return set(Cart.objects.get(customer=self.customer).product.values_list('id', flat=True))
+
+    def test_if_create_adds_a_product_and_returns_the_cart_size(self):
+        """
+        Tests if cart view set create action adds a single product to the cart and returns its size
+        """
+
+        self.__authenticate(self.customer)
+
+        response = self.__add(product=self.products[0].id)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data, {'size': 1})
+        self.assertSetEqual(self.__cart_product_ids(), {self.products[0].id})
+
+    def test_if_create_adds_several_products_once(self):
+        """
+        Tests if cart view set create action adds a list of products and ignores the ones already in the cart
+        """
+
+        self.__authenticate(self.customer)
+
+        self.__add(product=self.products[0].id)
+        response = self.__add(products=[product.id for product in self.products[:3]])
+
+        self.assertEqual(response.data, {'size': 3})
+
+        response = self.__add(products=[product.id for product in self.products[:3]])
+
+        self.assertEqual(response.data, {'size': 3})
+        self.assertSetEqual(self.__cart_product_ids(), {product.id for product in self.products[:3]})
+
+    def test_if_create_refuses_unknown_products(self):
+        """
+        Tests if cart view set create action refuses the request when one of the products does not exist
+        """
+
+        self.__authenticate(self.customer)
+
+        response = self.__add(products=[self.products[0].id, 999])
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertSetEqual(self.__cart_product_ids(), set())
+
+    def test_if_create_refuses_the_cart_of_another_customer(self):
+        """
+        Tests if a customer cannot add products to the cart of another customer
+        """
+
+        self.__authenticate(self.other_customer)
+
+        response = self.__add(product=self.products[0].id)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertSetEqual(self.__cart_product_ids(), set())
+
+    def test_if_create_runs_a_constant_number_of_queries(self):
+        """
+        Tests if cart view set create action runs the same queries for one or many products:
+        the authenticated customer, the products with the cart, the insert and the cart size
+        """
+
+        self.__authenticate(self.customer)
+
+        with CaptureQueriesContext(connection) as single_product_add:
+            self.__add(product=self.products[0].id)
+
+        with CaptureQueriesContext(connection) as many_products_add:
+            self.__add(products=[product.id for product in self.products[1:]])
+
+        self.assertEqual(len(single_product_add), len(many_products_add))
+        self.assertEqual(len(many_products_add), 4)
+
+    def test_if_retrieve_returns_the_products_with_name_and_current_price(self):
+        """
+        Tests if cart view set retrieve action returns the cart products with their name and current price
+        """
+
+        PriceHistory.objects.create(product=self.products[1], price=250)
+
+        self.__authenticate(self.customer)
+        self.__add(products=[self.products[0].id, self.products[1].id])
+
+        response = self.__retrieve(self.customer)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data.get('customer'), self.customer.id)
+        self.assertEqual(response.data.get('product'), [self.products[0].id, self.products[1].id])
+        self.assertEqual(response.data.get('items'), [
+            {'id': self.products[0].id, 'name': 'Test Product 0', 'current_price': None},
+            {'id': self.products[1].id, 'name': 'Test Product 1', 'current_price': 250},
+        ])
+
+    def test_if_retrieve_returns_an_empty_cart(self):
+        """
+        Tests if cart view set retrieve action returns a cart without products
+        """
+
+        self.__authenticate(self.customer)
+
+        response = self.__retrieve(self.customer)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data.get('product'), [])
+        self.assertEqual(response.data.get('items'), [])
+
+    def test_if_retrieve_refuses_the_cart_of_another_customer(self):
+        """
+        Tests if a customer cannot read the cart of another customer, even when its owner has it cached
+        """
+
+        self.__authenticate(self.customer)
+        self.__retrieve(self.customer)
+
+        self.__authenticate(self.other_customer)
+        response = self.__retrieve(self.customer)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        response = self.client.get(reverse('cart-detail', args=[999]))
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_if_cached_cart_is_refreshed_by_cart_and_product_changes(self):
+        """
+        Tests if a cached cart is served again until a product is added to it or one of its products changes
+        """
+
+        self.__authenticate(self.customer)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.__add(product=self.products[0].id)
+
+        self.assertEqual(len(self.__retrieve(self.customer).data.get('items')), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.__add(product=self.products[1].id)
+
+        self.assertEqual(len(self.__retrieve(self.customer).data.get('items')), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            PriceHistory.objects.create(product=self.products[0], price=300)
+
+        self.assertEqual(self.__retrieve(self.customer).data.get('items')[0].get('current_price'), 300)
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}},
+                       CACHE_TAGS_ALIAS='default')
+    def test_if_retrieve_reads_the_cart_in_a_single_query(self):
+        """
+        Tests if cart view set retrieve action reads the cart and its products in one joined query,
+        besides the authenticated customer, whatever the number of products
+        """
+
+        self.__authenticate(self.customer)
+
+        detail_url = reverse('cart-detail', args=[Cart.objects.get(customer=self.customer).id])
+
+        with CaptureQueriesContext(connection) as empty_cart_retrieve:
+            self.client.get(detail_url)
+
+        self.__add(products=[product.id for product in self.products])
+
+        with CaptureQueriesContext(connection) as full_cart_retrieve:
+            self.client.get(detail_url)
+
+        self.assertEqual(len(empty_cart_retrieve), 2)
+        self.assertEqual(len(full_cart_retrieve), 2)
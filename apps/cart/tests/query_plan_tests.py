@@ -0,0 +1,109 @@
+from rest_framework import test
+from rest_framework.test import APIClient
+
+from rest_framework.reverse import reverse
+
+from rest_framework import status
+
+from datetime import date
+
+from authentication.models import Customer
+from core.testing import QueryPlanTestMixin
+from products.models import Product, Supplier, PriceHistory
+
+from ..models import Cart, Sale, SaleItem
+from ..rollups import SalesRollup
+
+from rest_framework_simplejwt.tokens import RefreshToken
+
+SALES = 300
+
+
+class QueryPlanTests(QueryPlanTestMixin, test.APITestCase):
+
+    sequential_scan_threshold = SALES
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.client: APIClient = APIClient()
+
+        cls.customers = [
+            Customer.objects.create(username=f'testuser{index}', email=f'test{index}@test.dev')
+            for index in range(3)
+        ]
+        Cart.objects.bulk_create(Cart(customer=customer) for customer in cls.customers)
+
+        supplier: Supplier = Supplier.objects.create(name='TestCia', address='TestStreet', phone='99999999999')
+        cls.products = Product.objects.bulk_create(
+            Product(name=f'Test Product {index}', description='Test description', sku=f'T-TP{index}',
+                    category=index % 4 + 1, current_price=100, supplier=supplier)
+            for index in range(SALES)
+        )
+        PriceHistory.objects.bulk_create(PriceHistory(product=product, price=100) for product in cls.products)
+
+        # A sale of a product a day for each customer in turn
+        sales = Sale.objects.bulk_create(
+            Sale(customer=cls.customers[index % 3], total=100, delivery_address='Test Street',
+                 payment_method=Sale.Payment.PIX)
+            for index in range(SALES)
+        )
+        Sale.products.through.objects.bulk_create(
+            Sale.products.through(sale_id=sale.id, product_id=product.id)
+            for sale, product in zip(sales, cls.products)
+        )
+        SaleItem.objects.bulk_create(
+            SaleItem(sale=sale, product=product, unit_price=100) for sale, product in zip(sales, cls.products)
+        )
+        for sale in sales:
+            Sale.objects.filter(pk=sale.id).update(date=date.fromordinal(date(2024, 1, 1).toordinal() + sale.id))
+
+    def __authenticate(self, customer: Customer):
+        refresh = RefreshToken.for_user(customer)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+
+    def test_if_sales_of_a_customer_are_listed_from_indexes(self):
+        """
+        Tests if the sales of a customer in a period are read from the customer and date index
+        """
+
+        self.__authenticate(self.customers[0])
+
+        with self.assertNoSequentialScans():
+            response = self.client.get(reverse('sale-list'), data={'since': '2024-03-01', 'until': '2024-06-30'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_if_checkout_reads_the_cart_and_prices_from_indexes(self):
+        """
+        Tests if adding products to the cart and checking them out reads only the rows involved
+        """
+
+        self.__authenticate(self.customers[0])
+
+        with self.assertNoSequentialScans():
+            self.client.post(reverse('cart-list'), data={
+                'customer': self.customers[0].id, 'products': [product.id for product in self.products[:3]]
+            }, format='json')
+            response = self.client.post(reverse('sale-list'), data={
+                'customer': self.customers[0].id,
+                'products': [product.id for product in self.products[:3]],
+                'delivery_address': 'Test Street',
+                'payment_method': Sale.Payment.PIX
+            }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_if_the_sales_rollup_reads_only_the_new_sales(self):
+        """
+        Tests if a rollup run reads the sales made since the previous one by their ids
+        """
+
+        SalesRollup.update()
+        sale: Sale = Sale.objects.create(customer=self.customers[0], total=100, delivery_address='Test Street',
+                                         payment_method=Sale.Payment.PIX)
+        SaleItem.objects.create(sale=sale, product=self.products[0], unit_price=100)
+
+        with self.assertNoSequentialScans():
+            run = SalesRollup.update()
+
+        self.assertEqual(run.sales, 1)
@@ -0,0 +1,117 @@
+from rest_framework import test
+from rest_framework.test import APIClient
+
+from rest_framework.reverse import reverse
+
+from datetime import date
+
+from django.core.management import call_command
+
+from io import StringIO
+
+from authentication.models import Customer
+from products.models import Product, Supplier, PriceHistory
+
+from ..models import Cart, Sale, SaleItem
+from ..snapshots import SaleItemSnapshot
+
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+class SaleItemTests(test.APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.client: APIClient = APIClient()
+
+        cls.list_url = reverse('sale-list')
+
+        cls.customer: Customer = Customer.objects.create(username='testuser', email='test@test.dev')
+        cls.cart: Cart = Cart.objects.create(customer=cls.customer)
+
+        supplier: Supplier = Supplier.objects.create(name='TestCia', address='TestStreet', phone='99999999999')
+
+        cls.products = []
+        for index in range(3):
+            product: Product = Product.objects.create(name=f'Test Product {index}', description='Test description',
+                                                      sku=f'T-TP{index}', category=Product.Category.SCIENCE,
+                                                      supplier=supplier)
+            PriceHistory.objects.create(product=product, price=100 * (index + 1))
+
+            cls.products.append(product)
+
+        PriceHistory.objects.update(start=date(2024, 1, 1))
+
+    def __authenticate(self, customer: Customer):
+        refresh = RefreshToken.for_user(customer)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+
+    def __sell_without_items(self, products, sale_date: date) -> Sale:
+        sale: Sale = Sale.objects.create(customer=self.customer, total=0, delivery_address='Test Street',
+                                         payment_method=Sale.Payment.PIX)
+        sale.products.set(products)
+
+        Sale.objects.filter(pk=sale.id).update(date=sale_date)
+
+        return sale
+
+    def __change_price(self, product: Product, price: int, start: date):
+        PriceHistory.objects.create(product=product, price=price)
+        PriceHistory.objects.filter(product=product, end__isnull=True).update(start=start)
+
+    def test_if_checkout_writes_the_items_with_their_prices(self):
+        """
+        Tests if sale view set create action writes an item of each product with the price, category and supplier
+        it was sold with
+        """
+
+        self.__authenticate(self.customer)
+        self.cart.product.add(*self.products)
+
+        self.client.post(self.list_url, data={
+            'customer': self.customer.id,
+            'products': [product.id for product in self.products[:2]],
+            'delivery_address': 'Test Street',
+            'payment_method': Sale.Payment.PIX
+        }, format='json')
+
+        self.__change_price(self.products[0], 150, date(2024, 3, 1))
+
+        sale: Sale = Sale.objects.get(customer=self.customer)
+
+        self.assertEqual(list(sale.items.values_list('product', 'unit_price', 'quantity')),
+                         [(self.products[0].id, 100, 1), (self.products[1].id, 200, 1)])
+        self.assertEqual(sum(sale.items.values_list('unit_price', flat=True)), sale.total)
+        self.assertEqual(list(sale.items.values_list('category', 'supplier')),
+                         [(product.category, product.supplier_id) for product in self.products[:2]])
+
+    def test_if_backfill_prices_the_items_on_the_day_of_the_sale(self):
+        """
+        Tests if the backfill writes the items of old sales with the price of each product on the day of its sale
+        """
+
+        first_sale = self.__sell_without_items(self.products[:2], date(2024, 2, 1))
+        self.__change_price(self.products[0], 150, date(2024, 3, 1))
+        second_sale = self.__sell_without_items(self.products[:1], date(2024, 3, 1))
+
+        created = SaleItemSnapshot.backfill(chunk_size=1)
+
+        self.assertEqual(created, 3)
+        self.assertEqual(list(first_sale.items.values_list('product', 'unit_price')),
+                         [(self.products[0].id, 100), (self.products[1].id, 200)])
+        self.assertEqual(list(second_sale.items.values_list('product', 'unit_price')), [(self.products[0].id, 150)])
+
+    def test_if_backfill_only_writes_the_missing_items(self):
+        """
+        Tests if the backfill keeps the items already written and can run again without duplicating them
+        """
+
+        sale = self.__sell_without_items(self.products, date(2024, 2, 1))
+        SaleItem.objects.create(sale=sale, product=self.products[0], unit_price=90)
+
+        output = StringIO()
+        call_command('backfill_sale_items', stdout=output)
+
+        self.assertIn('Created 2 sale items', output.getvalue())
+        self.assertEqual(SaleItemSnapshot.backfill(), 0)
+        self.assertEqual(list(sale.items.values_list('unit_price', flat=True)), [90, 200, 300])
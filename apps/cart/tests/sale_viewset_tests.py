@@ -0,0 +1,354 @@
+from rest_framework import test
+from rest_framework.test import APIClient
+
+from rest_framework.reverse import reverse
+
+from rest_framework import status
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from datetime import date
+
+from authentication.models import Customer
+from authentication.serializers import CustomerSerializer
+from products.models import Product, Supplier, PriceHistory
+from products.serializers import ProductSerializer, SupplierSerializer, PriceHistorySerializer
+
+from ..models import Cart, Sale, SaleItem
+
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+class SaleViewSetTests(test.APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.client: APIClient = APIClient()
+
+        cls.list_url = reverse('sale-list')
+
+        customer_data = {
+            'username': 'testuser',
+            'email': 'test@test.dev',
+            'password': 'testpassword'
+        }
+        serializer: CustomerSerializer = CustomerSerializer(data=customer_data)
+        serializer.is_valid()
+
+        cls.customer: Customer = serializer.save()
+
+        supplier_data = {
+            'name': 'TestCia',
+            'address': 'TestStreet',
+            'phone': '99999999999'
+        }
+        serializer: SupplierSerializer = SupplierSerializer(data=supplier_data)
+        serializer.is_valid()
+
+        supplier: Supplier = serializer.save()
+
+        products = []
+        for index in range(5):
+            product_data = {
+                'name': f'Test Product {index}',
+                'description': 'Test description',
+                'category': Product.Category.SCIENCE,
+                'supplier': supplier.id,
+                'price': 100 * (index + 1)
+            }
+            serializer: ProductSerializer = ProductSerializer(data=product_data)
+            serializer.is_valid()
+
+            products.append(serializer.save())
+
+        cls.products = products
+
+        serializer: CustomerSerializer = CustomerSerializer(data={
+            'username': 'otheruser',
+            'email': 'other@test.dev',
+            'password': 'testpassword'
+        })
+        serializer.is_valid()
+
+        cls.other_customer: Customer = serializer.save()
+
+    @staticmethod
+    def __create_authorization_header(token: str):
+        return f'Bearer {token}'
+
+    @staticmethod
+    def __get_jwt_pair(customer: Customer):
+        refresh = RefreshToken.for_user(customer)
+
+        return str(refresh.access_token), str(refresh)
+
+    def __authenticate(self, customer: Customer):
+        access, _ = self.__get_jwt_pair(customer)
+        self.client.credentials(HTTP_AUTHORIZATION=self.__create_authorization_header(access))
+
+    def __fill_cart(self, products):
+        cart: Cart = Cart.objects.get(customer=self.customer)
+        cart.product.add(*products)
+
+    def __checkout(self, products):
+        data = {
+            'customer': self.customer.id,
+            'products': [product.id for product in products],
+            'delivery_address': 'Test Street',
+            'payment_method': Sale.Payment.PIX
+        }
+
+        return self.client.post(self.list_url, data=data, format='json')
+
+    def test_if_create_is_creating_a_sale_with_the_cart_products(self):
+        """
+        Tests if sale view set create action creates a sale with the selected cart products,
+        its total and removes them from the cart
+        """
+
+        self.__authenticate(self.customer)
+        self.__fill_cart(self.products)
+
+        response = self.__checkout(self.products[:2])
+
+        sale: Sale = Sale.objects.get(customer=self.customer)
+        cart: Cart = Cart.objects.get(customer=self.customer)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(sale.total, 300)
+        self.assertEqual(sale.delivery_address, 'Test Street')
+        self.assertSetEqual(set(sale.products.values_list('id', flat=True)),
+                            {product.id for product in self.products[:2]})
+        self.assertSetEqual(set(cart.product.values_list('id', flat=True)),
+                            {product.id for product in self.products[2:]})
+
+    def test_if_create_uses_the_current_price_of_each_product(self):
+        """
+        Tests if sale view set create action sums the latest price history of each product
+        """
+
+        serializer: PriceHistorySerializer = PriceHistorySerializer(data={
+            'product': self.products[0].id,
+            'price': 150
+        })
+        serializer.is_valid()
+        serializer.save()
+
+        self.__authenticate(self.customer)
+        self.__fill_cart(self.products[:1])
+
+        self.__checkout(self.products[:1])
+
+        sale: Sale = Sale.objects.get(customer=self.customer)
+
+        self.assertEqual(sale.total, 150)
+
+    def test_if_create_refuses_products_that_are_not_in_the_cart(self):
+        """
+        Tests if sale view set create action refuses a checkout with products out of the cart
+        and leaves the cart untouched
+        """
+
+        self.__authenticate(self.customer)
+        self.__fill_cart(self.products[:1])
+
+        response = self.__checkout(self.products[:2])
+
+        cart: Cart = Cart.objects.get(customer=self.customer)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(Sale.objects.exists())
+        self.assertEqual(cart.product.count(), 1)
+
+    def test_if_create_refuses_products_without_a_price(self):
+        """
+        Tests if sale view set create action refuses a checkout with unpriced products, naming them,
+        and leaves the cart untouched
+        """
+
+        unpriced: Product = Product.objects.create(name='Unpriced Product', description='Test description',
+                                                   category=Product.Category.SCIENCE,
+                                                   supplier_id=self.products[0].supplier_id)
+
+        self.__authenticate(self.customer)
+        self.__fill_cart([self.products[0], unpriced])
+
+        response = self.__checkout([self.products[0], unpriced])
+
+        cart: Cart = Cart.objects.get(customer=self.customer)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn(str(unpriced.id), response.data.get('products')[0])
+        self.assertFalse(Sale.objects.exists())
+        self.assertFalse(SaleItem.objects.exists())
+        self.assertEqual(cart.product.count(), 2)
+
+    def test_if_create_refuses_a_sale_without_delivery_details(self):
+        """
+        Tests if sale view set create action refuses a checkout without a delivery address or with an unknown
+        payment method, and leaves the cart untouched
+        """
+
+        self.__authenticate(self.customer)
+        self.__fill_cart(self.products[:1])
+
+        response = self.client.post(self.list_url, data={
+            'customer': self.customer.id,
+            'products': [self.products[0].id],
+            'payment_method': 9
+        }, format='json')
+
+        cart: Cart = Cart.objects.get(customer=self.customer)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertSetEqual(set(response.data.keys()), {'delivery_address', 'payment_method'})
+        self.assertFalse(Sale.objects.exists())
+        self.assertEqual(cart.product.count(), 1)
+
+    def test_if_create_runs_a_constant_number_of_queries(self):
+        """
+        Tests if sale view set create action runs the same number of queries regardless of the basket size
+        """
+
+        self.__authenticate(self.customer)
+        self.__fill_cart(self.products)
+
+        with CaptureQueriesContext(connection) as single_product_checkout:
+            self.__checkout(self.products[:1])
+
+        with CaptureQueriesContext(connection) as many_products_checkout:
+            self.__checkout(self.products[1:])
+
+        self.assertEqual(Sale.objects.count(), 2)
+        self.assertEqual(len(single_product_checkout), len(many_products_checkout))
+        self.assertEqual(len(many_products_checkout), 9)
+
+    def test_if_retrieve_runs_a_constant_number_of_queries(self):
+        """
+        Tests if sale view set retrieve action fetches the products of a sale in a single query
+        """
+
+        self.__authenticate(self.customer)
+        self.__fill_cart(self.products)
+
+        self.__checkout(self.products[:1])
+        self.__checkout(self.products[1:])
+
+        single_product_sale, many_products_sale = Sale.objects.all()
+
+        with CaptureQueriesContext(connection) as single_product_retrieve:
+            single_response = self.client.get(reverse('sale-detail', args=[single_product_sale.id]))
+
+        with CaptureQueriesContext(connection) as many_products_retrieve:
+            many_response = self.client.get(reverse('sale-detail', args=[many_products_sale.id]))
+
+        self.assertEqual(len(single_response.data.get('products')), 1)
+        self.assertEqual(len(many_response.data.get('products')), 4)
+        self.assertEqual(len(single_product_retrieve), len(many_products_retrieve))
+
+    def __create_sales(self, customer: Customer, dates: list[date]) -> list[Sale]:
+        sales = []
+        for sale_date in dates:
+            sale: Sale = Sale.objects.create(customer=customer, total=100, delivery_address='Test Street',
+                                             payment_method=Sale.Payment.PIX)
+            sale.products.set(self.products[:2])
+            Sale.objects.filter(pk=sale.id).update(date=sale_date)
+
+            sales.append(sale)
+
+        return sales
+
+    def test_if_list_returns_only_the_sales_of_the_customer(self):
+        """
+        Tests if sale view set list action returns the sales of the authenticated customer, most recent first
+        """
+
+        sales = self.__create_sales(self.customer, [date(2024, 1, 1), date(2024, 3, 1), date(2024, 2, 1)])
+        self.__create_sales(self.other_customer, [date(2024, 1, 1)])
+
+        self.__authenticate(self.customer)
+
+        response = self.client.get(self.list_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([sale.get('id') for sale in response.data.get('results')],
+                         [sales[1].id, sales[2].id, sales[0].id])
+        self.assertEqual(response.data.get('results')[0].get('products'), [product.id for product in self.products[:2]])
+
+    def test_if_list_filters_the_sales_by_date(self):
+        """
+        Tests if sale view set list action returns the sales between the since and until dates, both included,
+        and refuses invalid dates
+        """
+
+        sales = self.__create_sales(self.customer, [date(2024, 1, 1), date(2024, 2, 1), date(2024, 3, 1)])
+
+        self.__authenticate(self.customer)
+
+        response = self.client.get(self.list_url, data={'since': '2024-02-01', 'until': '2024-03-01'})
+
+        self.assertEqual([sale.get('id') for sale in response.data.get('results')], [sales[2].id, sales[1].id])
+
+        response = self.client.get(self.list_url, data={'since': '01/02/2024'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_if_list_only_shows_other_customers_to_admins(self):
+        """
+        Tests if only admins can list the sales of another customer
+        """
+
+        sales = self.__create_sales(self.other_customer, [date(2024, 1, 1)])
+
+        self.__authenticate(self.customer)
+
+        response = self.client.get(self.list_url, data={'customer': self.other_customer.id})
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        Customer.objects.filter(pk=self.customer.id).update(is_staff=True)
+
+        response = self.client.get(self.list_url, data={'customer': self.other_customer.id})
+
+        self.assertEqual([sale.get('id') for sale in response.data.get('results')], [sales[0].id])
+
+    def test_if_list_is_paginated_by_cursor(self):
+        """
+        Tests if sale view set list action walks through every sale of the customer with the next links
+        """
+
+        sales = self.__create_sales(self.customer, [date(2024, 1, 1 + index % 3) for index in range(12)])
+
+        self.__authenticate(self.customer)
+
+        listed = []
+        url = self.list_url
+        while url is not None:
+            response = self.client.get(url)
+            listed.extend(sale.get('id') for sale in response.data.get('results'))
+
+            url = response.data.get('next')
+
+        expected = sorted(sales, key=lambda sale: (Sale.objects.get(pk=sale.id).date, sale.id), reverse=True)
+
+        self.assertEqual(listed, [sale.id for sale in expected])
+
+    def test_if_list_runs_a_constant_number_of_queries(self):
+        """
+        Tests if sale view set list action fetches the products of a page of sales in a single query
+        """
+
+        self.__authenticate(self.customer)
+
+        self.__create_sales(self.customer, [date(2024, 1, 1)])
+
+        with CaptureQueriesContext(connection) as single_sale_list:
+            self.client.get(self.list_url)
+
+        self.__create_sales(self.customer, [date(2024, 1, 1)] * 5)
+
+        with CaptureQueriesContext(connection) as many_sales_list:
+            self.client.get(self.list_url)
+
+        self.assertEqual(len(single_sale_list), len(many_sales_list))
@@ -0,0 +1,259 @@
+from rest_framework import test
+from rest_framework.test import APIClient
+
+from rest_framework.reverse import reverse
+
+from rest_framework import status
+
+from datetime import date
+
+from unittest import mock
+
+from authentication.models import Customer
+from products.models import Product, Supplier, PriceHistory
+
+from ..models import Sale, SaleItem, DailySales, DailyProductSales
+from ..rollups import SalesRollup
+
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+class SalesRollupTests(test.APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.client: APIClient = APIClient()
+
+        cls.report_url = reverse('sales-report-list')
+
+        cls.customer: Customer = Customer.objects.create(username='testuser', email='test@test.dev')
+        cls.admin: Customer = Customer.objects.create(username='testadmin', email='admin@test.dev', is_staff=True)
+
+        cls.suppliers = [
+            Supplier.objects.create(name=f'TestCia {index}', address='TestStreet', phone=f'{index:011d}')
+            for index in range(2)
+        ]
+
+        # A science product of each supplier and a fiction one of the first
+        cls.products = []
+        for index, (category, supplier) in enumerate([(Product.Category.SCIENCE, cls.suppliers[0]),
+                                                       (Product.Category.SCIENCE, cls.suppliers[1]),
+                                                       (Product.Category.FICTION, cls.suppliers[0])]):
+            product: Product = Product.objects.create(name=f'Test Product {index}', description='Test description',
+                                                      sku=f'T-TP{index}', category=category, supplier=supplier)
+            PriceHistory.objects.create(product=product, price=100 * (index + 1))
+
+            cls.products.append(product)
+
+        PriceHistory.objects.update(start=date(2024, 1, 1))
+
+    def __authenticate(self, customer: Customer):
+        refresh = RefreshToken.for_user(customer)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+
+    def __sell(self, products, sale_date: date, payment_method=Sale.Payment.PIX, **fields) -> Sale:
+        sale: Sale = Sale.objects.create(customer=self.customer, total=0, delivery_address='Test Street',
+                                         payment_method=payment_method, **fields)
+        sale.products.set(products)
+
+        prices = dict(PriceHistory.objects.filter(product__in=products, end__isnull=True).values_list('product', 'price'))
+        SaleItem.objects.bulk_create(
+            SaleItem(sale=sale, product=product, unit_price=prices.get(product.id), category=product.category,
+                     supplier_id=product.supplier_id)
+            for product in products
+        )
+        Sale.objects.filter(pk=sale.id).update(date=sale_date, total=sum(prices.values()))
+
+        return sale
+
+    def test_if_update_adds_the_sales_to_the_daily_cells(self):
+        """
+        Tests if a run sums the revenue, units and orders of each day and payment method,
+        and of each category and supplier
+        """
+
+        self.__sell(self.products, date(2024, 2, 1))
+        self.__sell(self.products[:1], date(2024, 2, 1))
+        self.__sell(self.products[1:2], date(2024, 2, 1), Sale.Payment.CREDIT)
+
+        run = SalesRollup.update(chunk_size=2)
+
+        self.assertEqual(run.sales, 3)
+        self.assertEqual(
+            list(DailySales.objects.values_list('payment_method', 'revenue', 'units', 'orders')),
+            [(Sale.Payment.PIX, 700, 4, 2), (Sale.Payment.CREDIT, 200, 1, 1)]
+        )
+
+        science_of_first_supplier: DailyProductSales = DailyProductSales.objects.get(
+            payment_method=Sale.Payment.PIX, category=Product.Category.SCIENCE, supplier=self.suppliers[0]
+        )
+        self.assertEqual(science_of_first_supplier.revenue, 200)
+        self.assertEqual(science_of_first_supplier.units, 2)
+        self.assertEqual(science_of_first_supplier.orders, 2)
+
+    def test_if_items_are_priced_as_they_were_sold(self):
+        """
+        Tests if the revenue of an item uses the price it was sold for, not the current one
+        """
+
+        self.__sell(self.products[:1], date(2024, 2, 1))
+
+        PriceHistory.objects.create(product=self.products[0], price=150)
+        PriceHistory.objects.filter(product=self.products[0], end__isnull=True).update(start=date(2024, 3, 1))
+
+        self.__sell(self.products[:1], date(2024, 3, 1))
+
+        SalesRollup.update()
+
+        self.assertEqual(list(DailyProductSales.objects.values_list('date', 'revenue')),
+                         [(date(2024, 2, 1), 100), (date(2024, 3, 1), 150)])
+
+    def test_if_update_only_adds_the_new_sales(self):
+        """
+        Tests if each run adds only the sales made since the previous one, as a full rebuild would count them
+        """
+
+        self.__sell(self.products, date(2024, 2, 1))
+        SalesRollup.update()
+
+        self.assertIsNone(SalesRollup.update())
+
+        self.__sell(self.products[:2], date(2024, 2, 1))
+        self.__sell(self.products[:1], date(2024, 2, 2))
+        run = SalesRollup.update()
+
+        incremental = list(DailyProductSales.objects.values_list('date', 'category', 'supplier', 'revenue', 'units',
+                                                                'orders'))
+
+        SalesRollup.update(full=True)
+
+        self.assertEqual(run.sales, 2)
+        self.assertEqual(DailySales.objects.get(date=date(2024, 2, 1)).orders, 2)
+        self.assertEqual(list(DailyProductSales.objects.values_list('date', 'category', 'supplier', 'revenue', 'units',
+                                                                   'orders')), incremental)
+
+    def test_if_sales_committed_late_are_added_once(self):
+        """
+        Tests if a sale committed after a run, with an id lower than the sales that run added, is added
+        by the next run, and no sale is added twice
+        """
+
+        self.__sell(self.products[:1], date(2024, 2, 1), id=10)
+        SalesRollup.update()
+
+        self.__sell(self.products[:1], date(2024, 2, 1), id=5)
+        run = SalesRollup.update()
+
+        self.assertEqual(run.sales, 1)
+        self.assertIsNone(SalesRollup.update())
+        self.assertEqual(DailySales.objects.values_list('revenue', 'units', 'orders').get(), (200, 2, 2))
+
+    def test_if_a_failed_update_keeps_the_chunks_it_added(self):
+        """
+        Tests if a run failing on a chunk keeps the chunks committed before it, and the next run adds the rest once
+        """
+
+        self.__sell(self.products[:1], date(2024, 2, 1))
+        self.__sell(self.products[:1], date(2024, 2, 1))
+
+        with mock.patch('cart.rollups.invalidate_tags', side_effect=[None, RuntimeError]):
+            with self.assertRaises(RuntimeError):
+                SalesRollup.update(chunk_size=1)
+
+        self.assertEqual(DailySales.objects.values_list('revenue', 'units', 'orders').get(), (100, 1, 1))
+
+        run = SalesRollup.update(chunk_size=1)
+
+        self.assertEqual(run.sales, 1)
+        self.assertEqual(DailySales.objects.values_list('revenue', 'units', 'orders').get(), (200, 2, 2))
+
+    def test_if_items_keep_the_category_and_supplier_they_were_sold_with(self):
+        """
+        Tests if the product cells use the category and supplier of the items at checkout, not the current ones
+        """
+
+        self.__sell(self.products[:1], date(2024, 2, 1))
+        Product.objects.filter(pk=self.products[0].id).update(category=Product.Category.DIDACTIC,
+                                                              supplier=self.suppliers[1])
+
+        SalesRollup.update()
+
+        self.assertEqual(list(DailyProductSales.objects.values_list('category', 'supplier')),
+                         [(Product.Category.SCIENCE, self.suppliers[0].id)])
+
+    def test_if_items_without_a_category_count_in_the_daily_units_only(self):
+        """
+        Tests if the items of products deleted before their category was snapshotted count in the units of
+        their day, as their sale counts in its revenue and orders, without a product cell of their own
+        """
+
+        sale: Sale = self.__sell(self.products[:2], date(2024, 2, 1))
+        SaleItem.objects.filter(sale=sale, product=self.products[1]).update(product=None, category=None, supplier=None)
+
+        SalesRollup.update()
+
+        self.assertEqual(DailySales.objects.values_list('revenue', 'units', 'orders').get(), (300, 2, 1))
+        self.assertEqual(list(DailyProductSales.objects.values_list('category', 'units')),
+                         [(self.products[0].category, 1)])
+
+    def test_if_report_sums_the_cells_by_the_requested_dimensions(self):
+        """
+        Tests if a report sums the cells between the dates by the requested dimensions, or all of them
+        """
+
+        self.__sell(self.products, date(2024, 2, 1))
+        self.__sell(self.products[:1], date(2024, 2, 2), Sale.Payment.CREDIT)
+        self.__sell(self.products[:1], date(2024, 3, 1))
+        SalesRollup.update()
+
+        self.assertEqual(SalesRollup.report(date(2024, 2, 1), date(2024, 2, 28)), [
+            {'date': date(2024, 2, 1), 'revenue': 600, 'units': 3, 'orders': 1},
+            {'date': date(2024, 2, 2), 'revenue': 100, 'units': 1, 'orders': 1},
+        ])
+        # The first sale has science items of both suppliers, so it counts in both of their cells
+        self.assertEqual(SalesRollup.report(group_by=['category']), [
+            {'category': Product.Category.SCIENCE, 'revenue': 500, 'units': 4, 'orders': 4},
+            {'category': Product.Category.FICTION, 'revenue': 300, 'units': 1, 'orders': 1},
+        ])
+        self.assertEqual(SalesRollup.report(group_by=[]), [{'revenue': 800, 'units': 5, 'orders': 3}])
+
+    def test_if_report_endpoint_is_refreshed_by_each_run(self):
+        """
+        Tests if the cached report is served again until a rollup run adds new sales
+        """
+
+        self.__authenticate(self.admin)
+
+        self.__sell(self.products[:1], date(2024, 2, 1))
+        with self.captureOnCommitCallbacks(execute=True):
+            SalesRollup.update()
+
+        response = self.client.get(self.report_url, data={'group_by': 'payment_method'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, [{'payment_method': Sale.Payment.PIX, 'revenue': 100, 'units': 1, 'orders': 1}])
+
+        self.__sell(self.products[:1], date(2024, 2, 1))
+        with self.captureOnCommitCallbacks(execute=True):
+            SalesRollup.update()
+
+        response = self.client.get(self.report_url, data={'group_by': 'payment_method'})
+
+        self.assertEqual(response.data[0].get('orders'), 2)
+
+    def test_if_report_endpoint_is_refused_to_customers_and_unknown_dimensions(self):
+        """
+        Tests if only admins can read reports, grouped by known dimensions only
+        """
+
+        self.__authenticate(self.customer)
+
+        response = self.client.get(self.report_url)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.__authenticate(self.admin)
+
+        response = self.client.get(self.report_url, data={'group_by': 'customer'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -6,6 +6,7 @@ from rest_framework.routers import DefaultRouter
 router: DefaultRouter = DefaultRouter()
 router.register(r'carts', views.CartViewSet, basename='cart')
 router.register(r'sales', views.SaleViewSet, basename='sale')
+router.register(r'reports/sales', views.SalesReportViewSet, basename='sales-report')
 
 urlpatterns = [
     path('', include(router.urls))
@@ -11,48 +11,144 @@ from rest_framework.response import Response
 from rest_framework.request import Request
 
 from django.db import transaction
+from django.db.models import F, Prefetch, Subquery
 
-from .serializers import CartRequestSerializer, CartSerializer, SaleRequestSerializer, SaleSerializer
-from .models import Cart, Sale
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.fields import empty
 
-from products.models import Product, PriceHistory
+from caching.tags import TaggedCacheMixin, cache_response, invalidate_tags, tag
+from core.pagination import KeysetPagination
+from core.query_params import get_date_query_param
 
+from .serializers import CartRequestSerializer, CartContentSerializer, SaleRequestSerializer, SaleSerializer
+from .models import Cart, Sale, SaleItem, DailySales
+from .rollups import SalesRollup
+from .tasks import update_sales_rollup
 
-class CartViewSet(mixins.RetrieveModelMixin,
+from products.dispatch import TaskDispatcher
+from products.models import Product
+
+CartProduct = Cart.product.through
+SaleProduct = Sale.products.through
+
+# Sales are serialized with their product ids, so these are fetched in one query per page
+PRODUCT_IDS = Product.objects.only('id')
+
+# Cart responses are purged whenever the cart or one of its products changes, so they can live for long
+CART_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Reports are purged by each rollup run
+REPORT_CACHE_TIMEOUT = 60 * 60
+
+
+class CartViewSet(TaggedCacheMixin,
+                  mixins.RetrieveModelMixin,
                   mixins.CreateModelMixin,
                   viewsets.GenericViewSet):
 
     queryset = Cart.objects.all()
     permission_classes = [permissions.IsAuthenticated]
+    lookup_value_regex = r'\d+'
 
-    @method_decorator(cache_page(30))
-    @method_decorator(vary_on_headers('Authorization'))
+    @cache_response(CART_CACHE_TIMEOUT, vary_on_user=True)
     def retrieve(self, request: Request, *args, **kwargs):
-        instance: Cart = self.get_object()
-        if request.user.id != instance.customer.id:
+        # Left join, so an empty cart still comes as a single row without product
+        rows = list(Cart.objects
+                    .filter(pk=kwargs.get('pk'))
+                    .order_by('product__id')
+                    .values('id', 'customer', 'product',
+                            name=F('product__name'),
+                            current_price=F('product__current_price')))
+
+        if not rows:
+            raise NotFound()
+
+        if request.user.id != rows[0].get('customer'):
             return Response(status=status.HTTP_403_FORBIDDEN)
 
-        return self.retrieve(request, *args, **kwargs)
+        items = [
+            {'id': row.get('product'), 'name': row.get('name'), 'current_price': row.get('current_price')}
+            for row in rows
+            if row.get('product') is not None
+        ]
+        serializer = self.get_serializer({
+            'id': rows[0].get('id'),
+            'customer': rows[0].get('customer'),
+            'product': [item.get('id') for item in items],
+            'items': items,
+        })
+
+        return Response(serializer.data)
+
+    def get_response_cache_tags(self, response) -> set[str]:
+        """
+        Carts show the name and current price of their products
+        """
+
+        return {tag(Product, item.get('id')) for item in response.data.get('items')}
+
+    def get_response_cache_models(self):
+        return {Product}
+
+    @staticmethod
+    def __get_requested_product_ids(request: Request):
+        if hasattr(request.data, 'getlist'):
+            product_ids = request.data.getlist('products') or request.data.getlist('product')
+        else:
+            product_ids = request.data.get('products', [])
+            if 'product' in request.data:
+                product_ids = [request.data.get('product')]
+
+        return {int(pk) for pk in product_ids}
 
     def create(self, request: Request, *args, **kwargs):
-        customer_id = request.data.get('customer')
-        product_id = request.data.get('product')
+        """
+        Adds one ``product`` or a list of ``products`` to the customer's cart and returns its new size.
+        Products already in the cart are kept as they are
+        """
 
-        if request.user.id != customer_id:
+        customer_id = request.data.get('customer')
+        if str(request.user.id) != str(customer_id):
             return Response(status=status.HTTP_403_FORBIDDEN)
 
-        cart: Cart = Cart.objects.get(customer__pk=customer_id)
-        product: Product = Product.objects.get(pk=product_id)
+        try:
+            product_ids = self.__get_requested_product_ids(request)
+        except (TypeError, ValueError):
+            return Response(status=status.HTTP_400_BAD_REQUEST)
+
+        if not product_ids:
+            return Response(status=status.HTTP_400_BAD_REQUEST)
+
+        # Checks the products exist and finds the cart in one query, without loading either of them
+        cart_products = list(Product.objects
+                             .filter(pk__in=product_ids)
+                             .annotate(cart_id=Subquery(Cart.objects
+                                                        .filter(customer__pk=request.user.id)
+                                                        .values('id')))
+                             .values_list('id', 'cart_id'))
+
+        if len(cart_products) != len(product_ids):
+            return Response({'products': ['Invalid pk - object does not exist.']}, status=status.HTTP_400_BAD_REQUEST)
+
+        cart_id = cart_products[0][1]
+        if cart_id is None:
+            return Response(status=status.HTTP_404_NOT_FOUND)
+
+        CartProduct.objects.bulk_create(
+            (CartProduct(cart_id=cart_id, product_id=product_id) for product_id, _cart_id in cart_products),
+            ignore_conflicts=True
+        )
+
+        size = CartProduct.objects.filter(cart_id=cart_id).count()
 
-        cart.product.add(product)
-        cart.save()
+        invalidate_tags(tag(Cart, cart_id))
 
-        return Response(status=status.HTTP_201_CREATED)
+        return Response({'size': size}, status=status.HTTP_201_CREATED)
 
     def get_serializer_class(self):
         match self.action:
             case 'retrieve':
-                return CartSerializer
+                return CartContentSerializer
 
             case 'create':
                 return CartRequestSerializer
@@ -63,26 +159,85 @@ class SaleViewSet(mixins.ListModelMixin,
                   mixins.CreateModelMixin,
                   viewsets.GenericViewSet):
 
-    queryset = Sale.objects.all()
+    queryset = Sale.objects.prefetch_related(Prefetch('products', queryset=PRODUCT_IDS))
+    pagination_class = KeysetPagination
+    keyset_ordering = ['-date', '-id']
     permission_classes = [permissions.IsAuthenticated]
 
     @staticmethod
-    def __get_product_price(product_id: int):
-        price_history: PriceHistory = (PriceHistory.objects
-                                       .filter(product__pk=product_id)
-                                       .order_by('-start')
-                                       .first())
+    def __get_requested_product_ids(request: Request):
+        if hasattr(request.data, 'getlist'):
+            product_ids = request.data.getlist('products')
+        else:
+            product_ids = request.data.get('products', [])
 
-        return price_history.price
+        return {int(pk) for pk in product_ids}
 
-    @method_decorator(cache_page(60))
-    def list(self, request: Request, *args, **kwargs):
-        instance: Sale = self.get_object()
-        if request.user.id != instance.customer.id:
-            if not request.user.is_staff:
-                return Response(status=status.HTTP_403_FORBIDDEN)
+    @staticmethod
+    def __get_products(product_ids: set[int]) -> dict[int, dict]:
+        """
+        Price, category and supplier of each product, as snapshotted by the sale items
+        """
 
-            pass
+        products = (Product.objects
+                    .filter(pk__in=product_ids)
+                    .values('id', 'category', 'supplier_id', unit_price=F('current_price')))
+
+        return {product.pop('id'): product for product in products}
+
+    @staticmethod
+    def __get_sale_details(request: Request) -> dict:
+        """
+        Delivery address and payment method, validated by the fields of ``SaleRequestSerializer``.
+        Its products are checked against the cart instead, in a single query
+        """
+
+        fields = SaleRequestSerializer().fields
+
+        details, errors = {}, {}
+        for field_name in ('delivery_address', 'payment_method'):
+            try:
+                details[field_name] = fields[field_name].run_validation(request.data.get(field_name, empty))
+            except ValidationError as error:
+                errors[field_name] = error.detail
+
+        if errors:
+            raise ValidationError(errors)
+
+        return details
+
+    @staticmethod
+    def __get_customer_id(request: Request) -> int:
+        try:
+            return int(request.query_params.get('customer', request.user.id))
+        except (TypeError, ValueError):
+            raise ValidationError({'customer': ['A valid integer is required.']})
+
+    def filter_queryset(self, queryset):
+        """
+        Lists the sales of the requested customer, the authenticated one by default, made between
+        the optional ``since`` and ``until`` dates, most recent first
+        """
+
+        queryset = super().filter_queryset(queryset)
+        if self.action != 'list':
+            return queryset
+
+        queryset = queryset.filter(customer__pk=self.__get_customer_id(self.request))
+
+        since = get_date_query_param(self.request, 'since')
+        if since is not None:
+            queryset = queryset.filter(date__gte=since)
+
+        until = get_date_query_param(self.request, 'until')
+        if until is not None:
+            queryset = queryset.filter(date__lte=until)
+
+        return queryset
+
+    def list(self, request: Request, *args, **kwargs):
+        if self.__get_customer_id(request) != request.user.id and not request.user.is_staff:
+            return Response(status=status.HTTP_403_FORBIDDEN)
 
         return super().list(request, *args, **kwargs)
 
@@ -97,36 +252,54 @@ class SaleViewSet(mixins.ListModelMixin,
 
     @transaction.atomic
     def create(self, request: Request, *args, **kwargs):
-        if request.user.id != request.data.get('customer'):
+        customer_id = request.data.get('customer')
+        if str(request.user.id) != str(customer_id):
             return Response(status=status.HTTP_403_FORBIDDEN)
 
-        customer_id = request.data.get('customer')
-        delivery_address = request.data.get('delivery_address'),
-        payment_method = request.data.get('payment_method')
+        details = self.__get_sale_details(request)
+
+        try:
+            product_ids = self.__get_requested_product_ids(request)
+        except (TypeError, ValueError):
+            return Response(status=status.HTTP_400_BAD_REQUEST)
+
+        if not product_ids:
+            return Response(status=status.HTTP_400_BAD_REQUEST)
 
-        customer_cart: Cart = Cart.objects.get(customer__pk=customer_id)
+        # Locks the selected cart rows so concurrent checkouts cannot sell the same items twice
+        cart_items = list(CartProduct.objects
+                          .select_for_update()
+                          .filter(cart__customer__pk=request.user.id, product__pk__in=product_ids)
+                          .values_list('product_id', 'id', 'cart_id'))
 
-        products = []
-        for pk in request.data.getlist('products'):
-            product: Product = Product.objects.get(pk=pk)
-            if product not in customer_cart.product.all():
-                return Response(status=status.HTTP_403_FORBIDDEN)
+        if {product_id for product_id, _id, _cart_id in cart_items} != product_ids:
+            return Response(status=status.HTTP_403_FORBIDDEN)
 
-            customer_cart.product.remove(product)
-            products.append(product)
+        products = self.__get_products(product_ids)
 
-        customer_cart.save()
+        # A product without a price cannot be sold, rather than being sold for nothing
+        unpriced = sorted(product_id for product_id, product in products.items()
+                          if product.get('unit_price') is None)
+        if unpriced:
+            return Response({'products': [f'Products {", ".join(map(str, unpriced))} have no price.']},
+                            status=status.HTTP_400_BAD_REQUEST)
 
-        total = sum(self.__get_product_price(product.id) for product in products)
+        CartProduct.objects.filter(pk__in=[item_id for _product_id, item_id, _cart_id in cart_items]).delete()
+        invalidate_tags(tag(Cart, cart_items[0][2]))
 
         sale: Sale = Sale.objects.create(
-            customer=customer_cart.customer,
-            total=total,
-            delivery_address=delivery_address,
-            payment_method=payment_method
+            customer_id=request.user.id,
+            total=sum(product.get('unit_price') for product in products.values()),
+            **details
+        )
+        SaleProduct.objects.bulk_create(
+            SaleProduct(sale_id=sale.id, product_id=product_id) for product_id in product_ids
         )
-        for product in products:
-            sale.products.add(product)
+        SaleItem.objects.bulk_create(
+            SaleItem(sale_id=sale.id, product_id=product_id, **product) for product_id, product in products.items()
+        )
+
+        TaskDispatcher.dispatch(update_sales_rollup)
 
         return Response(status=status.HTTP_200_OK)
 
@@ -137,3 +310,24 @@ class SaleViewSet(mixins.ListModelMixin,
 
             case 'create':
                 return SaleRequestSerializer
+
+
+class SalesReportViewSet(TaggedCacheMixin, viewsets.GenericViewSet):
+    queryset = DailySales.objects.all()
+    permission_classes = [permissions.IsAdminUser]
+
+    @cache_response(REPORT_CACHE_TIMEOUT)
+    def list(self, request: Request, *args, **kwargs):
+        """
+        Revenue, units and orders between the optional ``since`` and ``until`` dates, summed by the
+        comma separated ``group_by`` dimensions (date by default)
+        """
+
+        group_by = [dimension for dimension in request.query_params.get('group_by', 'date').split(',') if dimension]
+        if not set(group_by) <= set(SalesRollup.DIMENSIONS):
+            raise ValidationError({'group_by': [f'Choose among {", ".join(SalesRollup.DIMENSIONS)}.']})
+
+        since = get_date_query_param(request, 'since')
+        until = get_date_query_param(request, 'until')
+
+        return Response(SalesRollup.report(since, until, group_by))
@@ -14,11 +14,12 @@ class ProductAdmin(admin.ModelAdmin):
         can_delete = False
 
     fieldsets = (
-        (_('Product Info'), {'fields': ('name', 'description', 'sku', 'category', 'average_review')}),
+        (_('Product Info'), {'fields': ('name', 'description', 'sku', 'category', 'average_review',
+                                        'current_price')}),
         (_('Supplier'), {'fields': ('supplier',)}),
     )
 
-    readonly_fields = ('sku', 'average_review')
+    readonly_fields = ('sku', 'average_review', 'current_price')
 
     inlines = (CustomerInlineAdmin,)
 
@@ -57,3 +58,13 @@ class PriceHistoryAdmin(admin.ModelAdmin):
     )
 
     readonly_fields = ('start', 'end')
+
+
+@admin.register(models.ArchivedPriceHistory)
+class ArchivedPriceHistoryAdmin(admin.ModelAdmin):
+
+    fieldsets = (
+        (_('Price History Info'), {'fields': ('product', 'price', 'start', 'end')}),
+    )
+
+    readonly_fields = ('product', 'price', 'start', 'end')
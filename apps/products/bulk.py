@@ -0,0 +1,252 @@
+import logging
+
+from collections import defaultdict
+from datetime import date
+from itertools import batched
+
+from django.db import DatabaseError, transaction
+from django.utils.translation import gettext as _
+
+from rest_framework.exceptions import ValidationError
+
+from caching.tags import invalidate_tags, tag
+
+from .dispatch import TaskDispatcher
+from .models import Product, Supplier, PriceHistory
+from .serializers import ProductBulkSerializer, PriceHistoryBulkSerializer
+from .tasks import rebuild_product_recommendations, offer_product_recommendation
+from .utils import SkuUtils
+
+logger = logging.getLogger('error')
+
+PRODUCT_REQUIRED_FIELDS = ['name', 'description', 'category', 'supplier', 'price']
+
+
+class CatalogBulkWriter:
+    """
+    Creates and updates batches of products and prices. Rows are validated in passes over the whole batch,
+    with a single query per relation, and the valid ones are saved with bulk queries in a transaction per
+    chunk of ``chunk_size`` rows. Invalid rows are reported by their index and do not stop the others.
+
+    Bulk queries skip the model signals and ``PriceHistory.save``, so cached responses are invalidated,
+    price intervals closed and recommendations refreshed here.
+    """
+
+    @staticmethod
+    def __validate(serializer, rows) -> tuple[list[tuple[int, dict]], dict[int, dict]]:
+        valid, errors = [], {}
+        for index, row in enumerate(rows):
+            try:
+                valid.append((index, serializer.run_validation(row)))
+            except ValidationError as error:
+                errors[index] = error.detail
+
+        return valid, errors
+
+    @staticmethod
+    def __does_not_exist(pk) -> list[str]:
+        return [_(f'Invalid pk "{pk}" - object does not exist.')]
+
+    @staticmethod
+    def __without_errors(valid, errors) -> list[tuple[int, dict]]:
+        return [(index, data) for index, data in valid if index not in errors]
+
+    @staticmethod
+    def __list_errors(errors) -> list[dict]:
+        return [{'index': index, 'errors': errors[index]} for index in sorted(errors)]
+
+    @staticmethod
+    def __save_chunks(valid, errors, chunk_size: int, save) -> list:
+        """
+        Saves each chunk in its own transaction, reporting the rows of a failed chunk as errors
+        """
+
+        saved = []
+        for chunk in batched(valid, chunk_size):
+            try:
+                with transaction.atomic():
+                    saved.extend(save(chunk))
+            except DatabaseError as error:
+                logger.error(f'Could not save a chunk of a bulk catalog write: {error!r}')
+                errors.update({index: {'non_field_errors': [_('Could not be saved.')]} for index, _data in chunk})
+
+        return saved
+
+    @staticmethod
+    def __add_prices(prices: list[tuple[int, int]]) -> list[PriceHistory]:
+        """
+        Closes the open interval of each product and opens one with its last price of the batch,
+        as ``PriceHistory.save`` does one price at a time
+        """
+
+        product_ids = {product_id for product_id, _price in prices}
+        latest = {product_id: index for index, (product_id, _price) in enumerate(prices)}
+
+        # Locked in id order as PriceHistory.save locks them, so single price changes wait for the batch
+        list(Product.objects.select_for_update().filter(pk__in=product_ids).order_by('pk').values_list('id'))
+
+        closed = list(PriceHistory.objects
+                      .filter(product__pk__in=product_ids, end__isnull=True)
+                      .values_list('id', flat=True))
+        PriceHistory.objects.filter(pk__in=closed).update(end=date.today())
+
+        histories = PriceHistory.objects.bulk_create(
+            PriceHistory(product_id=product_id, price=price, end=None if latest[product_id] == index else date.today())
+            for index, (product_id, price) in enumerate(prices)
+        )
+        Product.objects.bulk_update(
+            [Product(pk=product_id, current_price=prices[index][1]) for product_id, index in latest.items()],
+            ['current_price']
+        )
+
+        invalidate_tags(
+            tag(PriceHistory),
+            *(tag(PriceHistory, history_id) for history_id in closed),
+            *(tag(Product, product_id) for product_id in product_ids)
+        )
+
+        return histories
+
+    @staticmethod
+    def __refresh_recommendations(product_ids: list[int]):
+        if product_ids:
+            TaskDispatcher.dispatch(rebuild_product_recommendations, product_ids)
+
+        for product_id in product_ids:
+            TaskDispatcher.dispatch(offer_product_recommendation, product_id)
+
+    @staticmethod
+    def __save_products(chunk, existing: dict[int, Product], supplier_names: dict[int, str],
+                        refresh_recommendations: bool) -> list[tuple[str, int]]:
+        created, updated, recategorized, resku = [], [], [], []
+        updated_fields = defaultdict(set)
+
+        for _index, data in chunk:
+            if 'id' not in data:
+                product = Product(
+                    name=data.get('name'),
+                    description=data.get('description'),
+                    category=data.get('category'),
+                    supplier_id=data.get('supplier')
+                )
+
+                created.append(product)
+                resku.append(product)
+                continue
+
+            product = existing.get(data.get('id'))
+            if 'category' in data and data.get('category') != product.category:
+                recategorized.append(product.id)
+
+            for field in ('name', 'description', 'category', 'supplier'):
+                if field in data:
+                    setattr(product, 'supplier_id' if field == 'supplier' else field, data.get(field))
+                    updated_fields[product.id].add(field)
+
+            if {'name', 'category', 'supplier'} & data.keys() and product.supplier_id is not None:
+                resku.append(product)
+                updated_fields[product.id].add('sku')
+
+            updated.append(product)
+
+        skus = SkuUtils.generate_skus(
+            (supplier_names.get(product.supplier_id), product.name, product.category) for product in resku
+        )
+        for product, sku in zip(resku, skus):
+            product.sku = sku
+
+        Product.objects.bulk_create(created)
+
+        # Each product writes only its own fields, so a row does not revert concurrent writes to the others
+        groups = defaultdict(dict)
+        for product in updated:
+            if updated_fields[product.id]:
+                groups[tuple(sorted(updated_fields[product.id]))][product.id] = product
+        for fields, products in groups.items():
+            Product.objects.bulk_update(products.values(), fields)
+
+        new_products = iter(created)
+        prices = [
+            (data.get('id') if 'id' in data else next(new_products).id, data.get('price'))
+            for _index, data in chunk
+            if 'price' in data or 'id' not in data
+        ]
+        if prices:
+            CatalogBulkWriter.__add_prices(prices)
+
+        tags = [tag(Product, product.id) for product in updated]
+        if created:
+            tags.append(tag(Product))
+        invalidate_tags(*tags)
+
+        if refresh_recommendations:
+            CatalogBulkWriter.__refresh_recommendations([product.id for product in created] + recategorized)
+
+        return [('created', product.id) for product in created] + [('updated', product.id) for product in updated]
+
+    @staticmethod
+    def write_products(rows: list, chunk_size: int = 1000, refresh_recommendations: bool = True) -> dict:
+        """
+        Creates the rows without ``id`` and partially updates the others. New products get their SKU and
+        first price; updates regenerate the SKU when the name, category or supplier changes and open
+        a new price interval when a price is given
+        """
+
+        valid, errors = CatalogBulkWriter.__validate(ProductBulkSerializer(partial=True), rows)
+
+        for index, data in valid:
+            missing = [field for field in PRODUCT_REQUIRED_FIELDS if field not in data]
+            if 'id' not in data and missing:
+                errors[index] = {field: [_('This field is required.')] for field in missing}
+
+        existing = Product.objects.in_bulk(
+            {data.get('id') for index, data in valid if 'id' in data and index not in errors}
+        )
+        supplier_names = dict(Supplier.objects.filter(pk__in={
+            *(data.get('supplier') for index, data in valid if 'supplier' in data and index not in errors),
+            *(product.supplier_id for product in existing.values()),
+        }).values_list('id', 'name'))
+
+        for index, data in valid:
+            if 'id' in data and data.get('id') not in existing:
+                errors.setdefault(index, {})['id'] = CatalogBulkWriter.__does_not_exist(data.get('id'))
+            if 'supplier' in data and data.get('supplier') not in supplier_names:
+                errors.setdefault(index, {})['supplier'] = CatalogBulkWriter.__does_not_exist(data.get('supplier'))
+
+        valid = CatalogBulkWriter.__without_errors(valid, errors)
+        saved = CatalogBulkWriter.__save_chunks(
+            valid, errors, chunk_size,
+            lambda chunk: CatalogBulkWriter.__save_products(chunk, existing, supplier_names, refresh_recommendations)
+        )
+
+        return {
+            'created': [product_id for action, product_id in saved if action == 'created'],
+            'updated': [product_id for action, product_id in saved if action == 'updated'],
+            'errors': CatalogBulkWriter.__list_errors(errors),
+        }
+
+    @staticmethod
+    def write_prices(rows: list, chunk_size: int = 1000) -> dict:
+        """
+        Adds a price to the product of each row. Later rows of the same product close the earlier ones
+        """
+
+        valid, errors = CatalogBulkWriter.__validate(PriceHistoryBulkSerializer(), rows)
+
+        product_ids = set(Product.objects
+                          .filter(pk__in={data.get('product') for _index, data in valid})
+                          .values_list('id', flat=True))
+        for index, data in valid:
+            if data.get('product') not in product_ids:
+                errors[index] = {'product': CatalogBulkWriter.__does_not_exist(data.get('product'))}
+
+        valid = CatalogBulkWriter.__without_errors(valid, errors)
+        saved = CatalogBulkWriter.__save_chunks(
+            valid, errors, chunk_size,
+            lambda chunk: CatalogBulkWriter.__add_prices([(data.get('product'), data.get('price')) for _index, data in chunk])
+        )
+
+        return {
+            'created': [history.id for history in saved],
+            'errors': CatalogBulkWriter.__list_errors(errors),
+        }
@@ -0,0 +1,155 @@
+from collections import Counter
+from itertools import combinations, groupby, batched
+
+from django.db import transaction
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+from caching.tags import invalidate_tags, tag
+
+from .models import CoPurchase, CoPurchaseRun
+
+# Partners kept per product, well above the related products a recommendation list keeps
+PARTNERS_PER_PRODUCT = 100
+
+
+class CoPurchaseMatrix:
+    """
+    Sparse item-item matrix counting how many sales contain each pair of products.
+    Each pair is stored in both directions, so the partners of a product are one indexed read.
+    Only the ``PARTNERS_PER_PRODUCT`` most bought partners of each product are kept, so a pair dropped
+    and bought again later counts from the sales made since.
+    """
+
+    @staticmethod
+    def __count_pairs(sale_products) -> tuple[Counter, int]:
+        pairs = Counter()
+        sales = 0
+
+        for _, rows in groupby(sale_products, key=lambda row: row[0]):
+            basket = sorted({product_id for _, product_id in rows})
+            for product_id, other_id in combinations(basket, 2):
+                pairs[(product_id, other_id)] += 1
+                pairs[(other_id, product_id)] += 1
+
+            sales += 1
+
+        return pairs, sales
+
+    @staticmethod
+    def __merge(pairs: Counter, batch_size: int):
+        # Pairs sorted by product share their products within a batch, whose pairs are then read by product
+        for chunk in batched(sorted(pairs.items()), batch_size):
+            deltas = dict(chunk)
+
+            existing = [
+                co_purchase
+                for co_purchase in CoPurchase.objects.filter(product_id__in={product_id for product_id, _ in deltas},
+                                                             other_id__in={other_id for _, other_id in deltas})
+                if (co_purchase.product_id, co_purchase.other_id) in deltas
+            ]
+            for co_purchase in existing:
+                co_purchase.count += deltas.pop((co_purchase.product_id, co_purchase.other_id))
+
+            CoPurchase.objects.bulk_update(existing, ['count'])
+            CoPurchase.objects.bulk_create(
+                CoPurchase(product_id=product_id, other_id=other_id, count=count)
+                for (product_id, other_id), count in deltas.items()
+            )
+
+    @staticmethod
+    def __trim(product_ids: set[int], batch_size: int):
+        """
+        Drops the partners ranked below ``PARTNERS_PER_PRODUCT`` of each product
+        """
+
+        for chunk in batched(sorted(product_ids), batch_size):
+            overflow = (CoPurchase.objects
+                        .filter(product_id__in=chunk)
+                        .annotate(rank=Window(RowNumber(), partition_by=F('product_id'),
+                                              order_by=[F('count').desc(), F('other_id').asc()]))
+                        .filter(rank__gt=PARTNERS_PER_PRODUCT)
+                        .values_list('id', flat=True))
+
+            CoPurchase.objects.filter(pk__in=list(overflow)).delete()
+
+    @staticmethod
+    def __lock():
+        """
+        Serializes the chunks of every run on the first run, so concurrent runs never count the same sales
+        or create the same pairs
+        """
+
+        if CoPurchaseRun.objects.select_for_update().order_by('id').first() is None:
+            # Only if the runs were deleted, as the migrations create the first one
+            CoPurchaseRun.objects.create(sales=0, pairs=0)
+
+    @staticmethod
+    def update(chunk_size: int = 1000,
+               batch_size: int = 250,
+               full: bool = False) -> tuple[CoPurchaseRun | None, set[int]]:
+        """
+        Counts the sales not counted yet and adds them to the matrix, ``chunk_size`` sales per transaction,
+        then trims the partners of the products the chunk changed. Sales are marked in the transaction that
+        counts them, so memory depends on the chunk size rather than on the sales history, and a failed run
+        keeps the chunks it committed. Sales are marked rather than read past the last id, so a sale committed
+        after one with a greater id is still counted, once.
+
+        Returns the run and the products whose partners changed.
+        """
+
+        from cart.models import Sale
+
+        if full:
+            with transaction.atomic():
+                CoPurchaseMatrix.__lock()
+
+                CoPurchase.objects.all().delete()
+                Sale.objects.filter(co_purchases_counted=True).update(co_purchases_counted=False)
+
+        pending = Sale.objects.filter(co_purchases_counted=False).order_by('id').values_list('id', flat=True)
+
+        total_sales, total_pairs = 0, 0
+        product_ids = set()
+        while True:
+            with transaction.atomic():
+                CoPurchaseMatrix.__lock()
+
+                # Read under the lock, so the sales counted by a concurrent run are never counted again
+                chunk = list(pending[:chunk_size])
+                if not chunk:
+                    break
+
+                rows = (Sale.products.through.objects
+                        .filter(sale_id__in=chunk)
+                        .order_by('sale_id')
+                        .values_list('sale_id', 'product_id'))
+
+                pairs, _ = CoPurchaseMatrix.__count_pairs(rows)
+                CoPurchaseMatrix.__merge(pairs, batch_size)
+                Sale.objects.filter(pk__in=chunk).update(co_purchases_counted=True)
+
+                changed = {product_id for product_id, _ in pairs.keys()}
+                CoPurchaseMatrix.__trim(changed, batch_size)
+
+                if changed:
+                    invalidate_tags(*{tag(CoPurchase, product_id) for product_id in changed})
+
+            product_ids |= changed
+            total_sales += len(chunk)
+            total_pairs += len(pairs)
+
+        if not total_sales:
+            return None, set()
+
+        run: CoPurchaseRun = CoPurchaseRun.objects.create(sales=total_sales, pairs=total_pairs)
+
+        return run, product_ids
+
+    @staticmethod
+    def partners(product_id: int) -> dict[int, int]:
+        """
+        Number of sales each product shares with the given one
+        """
+
+        return dict(CoPurchase.objects.filter(product_id=product_id).values_list('other_id', 'count'))
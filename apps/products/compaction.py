@@ -0,0 +1,135 @@
+from datetime import date, timedelta
+from itertools import batched
+
+from django.db import transaction
+from django.db.models import Count
+
+from caching.tags import invalidate_tags, tag
+
+from .models import Product, PriceHistory, ArchivedPriceHistory
+
+
+class PriceHistoryCompaction:
+    """
+    Keeps ``PriceHistory`` small. Intervals superseded on the day they started are dropped, runs of the same
+    price are merged into their last interval, and closed intervals past the retention window are moved
+    to ``ArchivedPriceHistory``. The price of a product as of any date stays the same.
+    """
+
+    @staticmethod
+    def __compact(histories: list[PriceHistory]) -> tuple[list[PriceHistory], list[int]]:
+        """
+        Histories ordered by product, start and id. Returns the ones whose start moved back and the ids to delete
+        """
+
+        kept, changed, removed = [], {}, []
+        for history in histories:
+            while kept and kept[-1].product_id == history.product_id and (kept[-1].start == history.start or
+                                                                           kept[-1].price == history.price):
+                previous = kept.pop()
+                changed.pop(previous.id, None)
+                removed.append(previous.id)
+
+                if previous.start != history.start:
+                    history.start = previous.start
+                    changed[history.id] = history
+
+            kept.append(history)
+
+        return list(changed.values()), removed
+
+    @staticmethod
+    def __lock_products(product_ids):
+        """
+        Takes the locks of ``PriceHistory.save`` and ``delete``, in the same id order, so the intervals of the
+        products cannot change until the transaction ends
+        """
+
+        list(Product.objects.select_for_update().filter(pk__in=product_ids).order_by('pk').values_list('id'))
+
+    @staticmethod
+    def compact(chunk_size: int = 100, batch_size: int = 1000) -> int:
+        """
+        Compacts the histories of ``chunk_size`` products per transaction, writing ``batch_size`` intervals
+        per query, and returns how many intervals were removed. The intervals are read under the locks
+        of their products, so prices added or changed meanwhile are never merged or deleted
+        """
+
+        product_ids = list(PriceHistory.objects
+                           .values('product')
+                           .annotate(intervals=Count('id'))
+                           .filter(intervals__gt=1)
+                           .values_list('product', flat=True)
+                           .order_by('product'))
+
+        removed = 0
+        for chunk in batched(product_ids, chunk_size):
+            with transaction.atomic():
+                PriceHistoryCompaction.__lock_products(chunk)
+
+                histories = list(PriceHistory.objects
+                                 .filter(product__pk__in=chunk)
+                                 .only('id', 'product_id', 'price', 'start')
+                                 .order_by('product', 'start', 'id'))
+
+                changed, removed_ids = PriceHistoryCompaction.__compact(histories)
+                if not removed_ids:
+                    continue
+
+                # bulk_update skips auto_now, so the merged starts are kept
+                PriceHistory.objects.bulk_update(changed, ['start'], batch_size=batch_size)
+                for batch in batched(removed_ids, batch_size):
+                    PriceHistory.objects.filter(pk__in=batch).delete()
+
+                # Price responses are tagged with their products, which covers the removed intervals too
+                invalidate_tags(*{tag(Product, history.product_id) for history in histories})
+
+            removed += len(removed_ids)
+
+        return removed
+
+    @staticmethod
+    def archive(retention_days: int = 365, chunk_size: int = 1000) -> int:
+        """
+        Moves the intervals closed more than ``retention_days`` ago to the archive, ``chunk_size`` per transaction,
+        and returns how many. Like the compaction, the intervals are read under the locks of their products
+        """
+
+        cutoff = date.today() - timedelta(days=retention_days)
+        expired = PriceHistory.objects.filter(end__lt=cutoff).order_by('end', 'id')
+
+        archived = 0
+        while product_ids := set(expired.values_list('product_id', flat=True)[:chunk_size]):
+            with transaction.atomic():
+                PriceHistoryCompaction.__lock_products(product_ids)
+
+                # An interval reopened meanwhile is left out, and no longer read by the next chunks
+                chunk = list(expired
+                             .filter(product__pk__in=product_ids)
+                             .values('id', 'product_id', 'price', 'start', 'end')[:chunk_size])
+
+                ArchivedPriceHistory.objects.bulk_create(
+                    ArchivedPriceHistory(product_id=history.get('product_id'),
+                                         price=history.get('price'),
+                                         start=history.get('start'),
+                                         end=history.get('end'))
+                    for history in chunk
+                )
+                PriceHistory.objects.filter(pk__in=[history.get('id') for history in chunk]).delete()
+
+                invalidate_tags(*{tag(Product, history.get('product_id')) for history in chunk})
+
+            archived += len(chunk)
+
+        return archived
+
+    @staticmethod
+    def run(retention_days: int = 365) -> dict[str, int]:
+        """
+        Compacts, then archives, so merged intervals are archived as one
+        """
+
+        return {
+            'removed': PriceHistoryCompaction.compact(),
+            'archived': PriceHistoryCompaction.archive(retention_days=retention_days),
+        }
@@ -0,0 +1,69 @@
+import json
+
+from django.conf import settings
+from django.core.cache import cache, caches, DEFAULT_CACHE_ALIAS
+from django.db import transaction
+
+from celery import Task
+
+
+class TaskDispatcher:
+    """
+    Enqueues Celery tasks once the current transaction commits, collapsing the calls with the same
+    task and arguments made within ``TASK_COALESCE_WINDOW`` seconds into a single run.
+
+    The first call of a window enqueues the task with the window as countdown and the next ones are
+    dropped, so the task runs once, after the burst, on the state left by its last call.
+    """
+
+    @staticmethod
+    def __window():
+        return getattr(settings, 'TASK_COALESCE_WINDOW', 5)
+
+    @staticmethod
+    def __key(task: Task, args) -> str:
+        return f'task-dispatch:{task.name}:{json.dumps(args, sort_keys=True)}'
+
+    @staticmethod
+    def __stats_cache():
+        return caches[getattr(settings, 'TASK_STATS_CACHE_ALIAS', DEFAULT_CACHE_ALIAS)]
+
+    @staticmethod
+    def __count(task: Task, metric: str):
+        """
+        Increments a counter in the shared store, where ``incr`` is atomic across processes. The counters are
+        statistics, so a failing store loses the increment instead of failing the dispatch
+        """
+
+        stats_cache = TaskDispatcher.__stats_cache()
+        key = f'task-dispatch-{metric}:{task.name}'
+
+        try:
+            stats_cache.add(key, 0, timeout=None)
+            stats_cache.incr(key)
+        except Exception:
+            pass
+
+    @staticmethod
+    def __enqueue(task: Task, args, window: int):
+        if window > 0 and not cache.add(TaskDispatcher.__key(task, args), True, timeout=window):
+            TaskDispatcher.__count(task, 'collapsed')
+            return
+
+        task.apply_async(args=args, countdown=window)
+        TaskDispatcher.__count(task, 'enqueued')
+
+    @staticmethod
+    def dispatch(task: Task, *args, window: int | None = None):
+        window = TaskDispatcher.__window() if window is None else window
+
+        transaction.on_commit(lambda: TaskDispatcher.__enqueue(task, list(args), window))
+
+    @staticmethod
+    def stats(task: Task) -> dict[str, int]:
+        stats_cache = TaskDispatcher.__stats_cache()
+
+        return {
+            'enqueued': stats_cache.get(f'task-dispatch-enqueued:{task.name}', 0),
+            'collapsed': stats_cache.get(f'task-dispatch-collapsed:{task.name}', 0),
+        }
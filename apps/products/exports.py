@@ -0,0 +1,86 @@
+import csv
+
+from collections import defaultdict
+from itertools import batched
+
+from django.db.models import F
+
+from core.renderers import FastJSONRenderer
+
+from .models import Product, Tag
+
+
+class _Echo:
+    """
+    File-like object for ``csv.writer`` that hands each written line back instead of storing it
+    """
+
+    def write(self, value):
+        return value
+
+
+class CatalogExport:
+    """
+    Streams the whole catalog, one line per product with its supplier, current price and tags.
+    Products are read with a server-side cursor in chunks of ``chunk_size`` and the tags of each chunk
+    are fetched with a single query, so memory depends on the chunk size rather than on the catalog size.
+    """
+
+    FIELDS = ['id', 'name', 'description', 'sku', 'category', 'average_review', 'current_price',
+              'supplier', 'supplier_name', 'tags']
+
+    CONTENT_TYPES = {
+        'ndjson': 'application/x-ndjson',
+        'csv': 'text/csv',
+    }
+
+    @staticmethod
+    def rows(chunk_size: int = 2000):
+        products = (Product.objects
+                    .order_by('id')
+                    .values('id', 'name', 'description', 'sku', 'category', 'average_review', 'current_price',
+                            'supplier', supplier_name=F('supplier__name'))
+                    .iterator(chunk_size=chunk_size))
+
+        for chunk in batched(products, chunk_size):
+            tags = defaultdict(list)
+            for product_id, name in (Tag.objects
+                                     .filter(product__pk__in=[product.get('id') for product in chunk])
+                                     .order_by('name')
+                                     .values_list('product_id', 'name')):
+                tags[product_id].append(name)
+
+            for product in chunk:
+                product['tags'] = tags.get(product.get('id'), [])
+
+                yield product
+
+    @staticmethod
+    def to_ndjson(rows):
+        renderer = FastJSONRenderer()
+
+        for row in rows:
+            yield renderer.render(row) + b'\n'
+
+    @staticmethod
+    def to_csv(rows):
+        writer = csv.writer(_Echo())
+
+        yield writer.writerow(CatalogExport.FIELDS)
+
+        for row in rows:
+            yield writer.writerow([
+                '|'.join(row.get(field)) if field == 'tags' else row.get(field)
+                for field in CatalogExport.FIELDS
+            ])
+
+    @staticmethod
+    def stream(content_type: str, chunk_size: int = 2000):
+        rows = CatalogExport.rows(chunk_size)
+
+        match content_type:
+            case 'csv':
+                return CatalogExport.to_csv(rows)
+
+            case _:
+                return CatalogExport.to_ndjson(rows)
@@ -0,0 +1,176 @@
+import csv
+import json
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import batched, count
+
+import django
+from django.db import transaction
+
+from caching.tags import invalidate_tags, tag
+
+from .models import Product, Supplier, Tag, PriceHistory
+from .utils import SkuUtils
+
+# Skipped rows reported by the import, the others are only counted
+SKIPPED_ROWS_KEPT = 10
+
+
+class CatalogImport:
+    """
+    Loads a catalog file with the columns of ``CatalogExport`` into the database. The file is read as a stream
+    in batches of ``batch_size`` rows, which can be parsed by a pool of processes while the main one saves
+    the previous batches with a ``bulk_create`` per table, so memory depends on the batch size rather than
+    on the file size.
+
+    Bulk queries skip the model signals and ``PriceHistory.save``: new products get their current price
+    directly and the catalog responses are invalidated once at the end.
+    """
+
+    FILE_TYPES = ['csv', 'ndjson']
+
+    @staticmethod
+    def read(file, file_type: str, batch_size: int):
+        """
+        Yields batches of (row number, raw row) from a CSV file with a header or from a NDJSON file
+        """
+
+        match file_type:
+            case 'csv':
+                rows = csv.DictReader(file)
+
+            case _:
+                rows = (line for line in file if line.strip())
+
+        return batched(zip(count(1), rows), batch_size)
+
+    @staticmethod
+    def __parse_row(number: int, row) -> dict:
+        if isinstance(row, str):
+            row = json.loads(row)
+
+        name = (row.get('name') or '').strip()
+        if not name or len(name) > Product._meta.get_field('name').max_length:
+            raise ValueError(f'invalid name {name!r}')
+
+        category = int(row.get('category'))
+        if category not in Product.Category.values:
+            raise ValueError(f'invalid category {category}')
+
+        supplier_name = (row.get('supplier_name') or '').strip()
+        if not supplier_name:
+            raise ValueError('missing supplier_name')
+
+        price = row.get('price', row.get('current_price'))
+
+        tags = row.get('tags') or []
+        tags = tags.split('|') if isinstance(tags, str) else list(tags)
+        if any(len(tag_name) > Tag._meta.get_field('name').max_length for tag_name in tags):
+            raise ValueError('tag name too long')
+
+        return {
+            'number': number,
+            'name': name,
+            'description': row.get('description') or '',
+            'category': category,
+            'supplier_name': supplier_name,
+            'price': int(price),
+            'tags': tags,
+            'sku': SkuUtils.generate_sku(supplier_name, name, category),
+        }
+
+    @staticmethod
+    def parse(batch) -> tuple[list[dict], list[tuple[int, str]]]:
+        """
+        Converts a batch of raw rows into product rows with their SKU, and lists the rows that cannot be imported.
+        Runs no queries, so it can run in a worker process
+        """
+
+        rows, errors = [], []
+        for number, row in batch:
+            try:
+                rows.append(CatalogImport.__parse_row(number, row))
+            except (ValueError, TypeError, AttributeError) as error:
+                errors.append((number, str(error)))
+
+        return rows, errors
+
+    @staticmethod
+    def parse_all(batches, workers: int = 1):
+        """
+        Parses the batches in order, in ``workers`` processes when there is more than one. At most two batches
+        per worker are read ahead, so a large file is never loaded at once
+        """
+
+        if workers <= 1:
+            yield from map(CatalogImport.parse, batches)
+            return
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as executor:
+            pending = deque()
+            for batch in batches:
+                pending.append(executor.submit(CatalogImport.parse, batch))
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().result()
+
+            while pending:
+                yield pending.popleft().result()
+
+    @staticmethod
+    @transaction.atomic
+    def save(rows: list[dict], supplier_ids: dict[str, int]) -> list[int]:
+        """
+        Creates the products of a batch with their open price and tags. Tag names are unique,
+        so a tag that already exists is kept on its product
+        """
+
+        products = Product.objects.bulk_create(
+            Product(
+                name=row.get('name'),
+                description=row.get('description'),
+                sku=row.get('sku'),
+                category=row.get('category'),
+                supplier_id=supplier_ids.get(row.get('supplier_name')),
+                current_price=row.get('price')
+            )
+            for row in rows
+        )
+
+        PriceHistory.objects.bulk_create(
+            PriceHistory(product_id=product.id, price=product.current_price) for product in products
+        )
+        Tag.objects.bulk_create(
+            (Tag(name=name, product_id=product.id)
+             for product, row in zip(products, rows)
+             for name in row.get('tags')),
+            ignore_conflicts=True
+        )
+
+        return [product.id for product in products]
+
+    @staticmethod
+    def load(file, file_type: str, batch_size: int = 5000, workers: int = 1) -> dict:
+        """
+        Imports every row of the file whose supplier exists. Returns the number of created products and of
+        skipped rows, and the (row number, reason) of the first ``SKIPPED_ROWS_KEPT`` skipped ones
+        """
+
+        supplier_ids = dict(Supplier.objects.values_list('name', 'id'))
+
+        created, skipped, errors = 0, 0, []
+        for rows, invalid in CatalogImport.parse_all(CatalogImport.read(file, file_type, batch_size), workers):
+            known = [row for row in rows if row.get('supplier_name') in supplier_ids]
+            invalid.extend((row.get('number'), f'unknown supplier {row.get("supplier_name")!r}')
+                           for row in rows if row.get('supplier_name') not in supplier_ids)
+            invalid.sort()
+
+            skipped += len(invalid)
+            errors.extend(invalid[:SKIPPED_ROWS_KEPT - len(errors)])
+
+            created += len(CatalogImport.save(known, supplier_ids))
+
+        if created:
+            invalidate_tags(tag(Product), tag(PriceHistory), tag(Tag))
+
+        return {'created': created, 'skipped': skipped, 'errors': errors}
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from django.utils.translation import gettext_lazy as _
+
+from itertools import batched
+
+from products.co_purchases import CoPurchaseMatrix
+from products.recommendations import RecommendationEngine
+
+
+class Command(BaseCommand):
+    help = _('Adds the sales not counted yet to the co-purchase matrix')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000)
+        parser.add_argument('--full', action='store_true', help=_('Recount every sale from scratch'))
+        parser.add_argument('--skip-recommendations', action='store_true')
+
+    def handle(self, *args, **options):
+        run, product_ids = CoPurchaseMatrix.update(chunk_size=options['chunk_size'], full=options['full'])
+        if run is None:
+            self.stdout.write(_('No new sales to count'))
+            return
+
+        self.stdout.write(_(f'Counted {run.sales} sales ({run.pairs} pairs updated)'))
+
+        if options['skip_recommendations']:
+            return
+
+        for chunk in batched(sorted(product_ids), options['chunk_size']):
+            RecommendationEngine.rebuild(chunk)
+
+        self.stdout.write(_(f'Rebuilt recommendations of {len(product_ids)} products'))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from django.utils.translation import gettext_lazy as _
+
+from products.compaction import PriceHistoryCompaction
+
+
+class Command(BaseCommand):
+    help = _('Merges redundant price histories and archives the ones closed before the retention window')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--retention-days', type=int, default=365)
+
+    def handle(self, *args, **options):
+        result = PriceHistoryCompaction.run(retention_days=options['retention_days'])
+
+        self.stdout.write(_(f'Removed {result.get("removed")} redundant and archived {result.get("archived")} '
+                            f'old price histories'))
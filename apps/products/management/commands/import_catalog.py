@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.translation import gettext_lazy as _
+
+from pathlib import Path
+from time import perf_counter
+
+from products.imports import CatalogImport
+from products.models import Product
+from products.recommendations import RecommendationEngine
+
+
+class Command(BaseCommand):
+    help = _('Imports products, prices and tags from a CSV or NDJSON catalog file')
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', type=Path)
+        parser.add_argument('--type', choices=CatalogImport.FILE_TYPES,
+                            help=_('File type, guessed from the file extension by default'))
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--workers', type=int, default=1, help=_('Processes that parse the file'))
+        parser.add_argument('--rebuild-recommendations', action='store_true',
+                            help=_('Build the missing recommendation lists, left to the nightly rebuild by default'))
+
+    def handle(self, *args, **options):
+        path: Path = options['path']
+        file_type = options['type'] or path.suffix.lstrip('.').lower()
+        if file_type not in CatalogImport.FILE_TYPES:
+            raise CommandError(_(f'Cannot import a "{file_type}" file, use --type'))
+
+        if not path.is_file():
+            raise CommandError(_(f'File {path} does not exist'))
+
+        start = perf_counter()
+        with path.open(newline='', encoding='utf-8') as file:
+            result = CatalogImport.load(file, file_type, options['batch_size'], options['workers'])
+        elapsed = perf_counter() - start
+
+        created, skipped = result.get('created'), result.get('skipped')
+        for number, reason in result.get('errors'):
+            self.stderr.write(_(f'Skipped row {number}: {reason}'))
+
+        rate = (created + skipped) / elapsed if elapsed else 0
+        self.stdout.write(_(f'Imported {created} products ({skipped} skipped) '
+                            f'in {elapsed:.1f}s, {rate:.0f} rows/s'))
+
+        if not options['rebuild_recommendations']:
+            return
+
+        # Rebuilt lists are marked as built, so each chunk reads the next products
+        pending = Product.objects.filter(recommendations_built=False).order_by('id').values_list('id', flat=True)
+
+        rebuilt = 0
+        while chunk := list(pending[:options['batch_size']]):
+            rebuilt += len(RecommendationEngine.rebuild(chunk))
+
+        self.stdout.write(_(f'Rebuilt recommendations of {rebuilt} products'))
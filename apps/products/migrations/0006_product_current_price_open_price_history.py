@@ -0,0 +1,41 @@
+# Generated by Django 5.0.1 on 2026-10-18 08:58
+
+from django.db import migrations, models
+
+
+def close_stale_price_histories(apps, schema_editor):
+    Product = apps.get_model('products', 'Product')
+    PriceHistory = apps.get_model('products', 'PriceHistory')
+
+    for product in Product.objects.all().iterator():
+        latest = PriceHistory.objects.filter(product=product).order_by('-start', '-id').first()
+        if latest is None:
+            continue
+
+        (PriceHistory.objects
+         .filter(product=product, end__isnull=True)
+         .exclude(pk=latest.pk)
+         .update(end=latest.start))
+        PriceHistory.objects.filter(pk=latest.pk).update(end=None)
+
+        Product.objects.filter(pk=product.pk).update(current_price=latest.price)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0005_alter_pricehistory_options'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='current_price',
+            field=models.IntegerField(editable=False, null=True),
+        ),
+        migrations.RunPython(close_stale_price_histories, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='pricehistory',
+            constraint=models.UniqueConstraint(condition=models.Q(('end__isnull', True)), fields=('product',), name='unique_open_price_history_per_product'),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.0.1 on 2026-10-18 09:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def create_first_run(apps, schema_editor):
+    CoPurchaseRun = apps.get_model('products', 'CoPurchaseRun')
+
+    # Every run locks the first one, so it must exist before the first run
+    if not CoPurchaseRun.objects.exists():
+        CoPurchaseRun.objects.create(sales=0, pairs=0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0007_recommendation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CoPurchaseRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sales', models.PositiveIntegerField()),
+                ('pairs', models.PositiveIntegerField()),
+                ('date', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='CoPurchase',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('other', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='products.product')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='co_purchases', to='products.product')),
+            ],
+            options={
+                'ordering': ['product', '-count', 'other'],
+                'indexes': [models.Index(fields=['product', '-count'], name='co_purchase_ranking_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='copurchase',
+            constraint=models.UniqueConstraint(fields=('product', 'other'), name='unique_co_purchase_pair'),
+        ),
+        migrations.RunPython(create_first_run, migrations.RunPython.noop),
+    ]
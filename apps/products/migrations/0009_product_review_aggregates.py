@@ -0,0 +1,37 @@
+# Generated by Django 5.0.1 on 2026-10-18 09:11
+
+from django.db import migrations, models
+from django.db.models import Avg, Count, Sum
+
+
+def aggregate_existing_reviews(apps, schema_editor):
+    Product = apps.get_model('products', 'Product')
+    Review = apps.get_model('products', 'Review')
+
+    aggregates = (Review.objects
+                  .values('product_id')
+                  .annotate(review_sum=Sum('value'), review_count=Count('id'), average_review=Avg('value')))
+
+    for aggregate in aggregates.iterator():
+        Product.objects.filter(pk=aggregate.pop('product_id')).update(**aggregate)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0008_co_purchase'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='review_sum',
+            field=models.FloatField(default=0.0, editable=False),
+        ),
+        migrations.RunPython(aggregate_existing_reviews, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.1 on 2026-10-18 09:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0010_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='pricehistory',
+            index=models.Index(fields=['product', 'start', 'id'], name='price_history_as_of_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.0.1 on 2026-10-18 09:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0011_price_history_as_of_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedPriceHistory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('price', models.IntegerField()),
+                ('start', models.DateField()),
+                ('end', models.DateField()),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='products.product')),
+            ],
+            options={
+                'verbose_name_plural': 'Archived price histories',
+                'ordering': ['start'],
+                'indexes': [models.Index(fields=['product', 'start', 'id'], name='archived_price_as_of_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.0.1 on 2026-10-18 10:01
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0012_archived_price_history'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='pricehistory',
+            index=models.Index(condition=models.Q(('end__isnull', False)), fields=['end', 'id'], name='price_history_closed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['category', '-average_review', 'id'], name='product_category_ranking_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['product', 'value'], name='review_product_value_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tag',
+            index=models.Index(fields=['product', 'name'], name='tag_product_name_idx'),
+        ),
+        migrations.AlterField(
+            model_name='pricehistory',
+            name='product',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='products.product'),
+        ),
+        migrations.AlterField(
+            model_name='review',
+            name='product',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='products.product'),
+        ),
+        migrations.AlterField(
+            model_name='tag',
+            name='product',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, to='products.product'),
+        ),
+    ]
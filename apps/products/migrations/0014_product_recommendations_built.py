@@ -0,0 +1,29 @@
+# Generated by Django 5.0.1 on 2026-10-18 10:27
+
+from django.db import migrations, models
+from django.db.models import Exists, OuterRef
+
+
+def mark_built_recommendations(apps, schema_editor):
+    Product = apps.get_model('products', 'Product')
+    Recommendation = apps.get_model('products', 'Recommendation')
+
+    Product.objects.filter(Exists(Recommendation.objects.filter(product_id=OuterRef('pk')))).update(
+        recommendations_built=True
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0013_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='recommendations_built',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.RunPython(mark_built_recommendations, migrations.RunPython.noop),
+    ]
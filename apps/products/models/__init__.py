@@ -1,5 +1,7 @@
 from .product import Product
-from .price_history import PriceHistory
+from .price_history import PriceHistory, ArchivedPriceHistory
 from .tag import Tag
 from .supplier import Supplier
 from .review import Review
+from .recommendation import Recommendation
+from .co_purchase import CoPurchase, CoPurchaseRun
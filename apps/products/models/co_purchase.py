@@ -0,0 +1,38 @@
+from django.db import models
+
+from django.utils.translation import gettext as _
+
+
+class CoPurchase(models.Model):
+
+    class Meta:
+        ordering = ['product', '-count', 'other']
+        constraints = [
+            models.UniqueConstraint(fields=['product', 'other'], name='unique_co_purchase_pair'),
+        ]
+        indexes = [
+            models.Index(fields=['product', '-count'], name='co_purchase_ranking_idx'),
+        ]
+
+    product = models.ForeignKey('products.Product', on_delete=models.CASCADE, related_name='co_purchases')
+    other = models.ForeignKey('products.Product', on_delete=models.CASCADE, related_name='+')
+    count = models.PositiveIntegerField(default=0)
+
+    def __str__(self) -> str:
+        return _(f'{self.product_id} bought with {self.other_id} {self.count} times')
+
+
+class CoPurchaseRun(models.Model):
+    """
+    Run of ``CoPurchaseMatrix``. The first one, created by the migrations, is locked by every run
+    """
+
+    class Meta:
+        ordering = ['-id']
+
+    sales = models.PositiveIntegerField()
+    pairs = models.PositiveIntegerField()
+    date = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self) -> str:
+        return _(f'Co-purchases of {self.sales} sales at {self.date}')
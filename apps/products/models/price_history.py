@@ -1,21 +1,160 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Q
 
 from django.utils.translation import gettext as _
 
+from datetime import date
+
+from caching.tags import invalidate_tags, tag
+
 
 class PriceHistory(models.Model):
 
     class Meta:
         ordering = ['start']
         verbose_name_plural = _('Price histories')
+        indexes = [
+            models.Index(fields=['start', 'id'], name='price_history_keyset_idx'),
+            models.Index(fields=['product', 'start', 'id'], name='price_history_as_of_idx'),
+            # Closed intervals by end date, read by the archival of PriceHistoryCompaction
+            models.Index(fields=['end', 'id'], condition=Q(end__isnull=False), name='price_history_closed_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['product'],
+                condition=Q(end__isnull=True),
+                name='unique_open_price_history_per_product'
+            ),
+        ]
 
-    product = models.ForeignKey('products.Product', on_delete=models.CASCADE, blank=False)
+    # Every lookup by product is served by price_history_as_of_idx
+    product = models.ForeignKey('products.Product', on_delete=models.CASCADE, blank=False, db_index=False)
     price = models.IntegerField()
     start = models.DateField(auto_now=True)
     end = models.DateField(null=True)
 
+    @staticmethod
+    def __lock_products(*product_ids: int):
+        """
+        Serializes the price changes of products, including their first price, so concurrent ones
+        never open two intervals at once. Products are locked in id order, so changes touching two never deadlock
+        """
+
+        from .product import Product
+
+        list(Product.objects.select_for_update().filter(pk__in=product_ids).order_by('pk').values_list('id'))
+
+    @staticmethod
+    def __refresh_current_price(product_id: int):
+        """
+        Reopens the latest interval of a product left without an open one, and makes the open interval's
+        price the product's current price
+        """
+
+        from .product import Product
+
+        current: PriceHistory = PriceHistory.objects.filter(product__pk=product_id, end__isnull=True).first()
+        if current is None:
+            current = PriceHistory.objects.filter(product__pk=product_id).order_by('-start', '-id').first()
+
+            if current is not None:
+                PriceHistory.objects.filter(pk=current.id).update(end=None)
+
+        Product.objects.filter(pk=product_id).update(current_price=current.price if current is not None else None)
+
+    def save(self, *args, **kwargs):
+        """
+        A new price closes the product's open interval and becomes its current price, while a new closed
+        interval only records a past price. Changing an interval refreshes the current price of its product,
+        and of the product it was moved from
+        """
+
+        from .product import Product
+
+        with transaction.atomic():
+            if self._state.adding:
+                self.__lock_products(self.product_id)
+
+                if self.end is not None:
+                    super().save(*args, **kwargs)
+
+                    self.__refresh_current_price(self.product_id)
+
+                    return
+
+                (PriceHistory.objects
+                 .filter(product__pk=self.product_id, end__isnull=True)
+                 .update(end=date.today()))
+
+                super().save(*args, **kwargs)
+
+                Product.objects.filter(pk=self.product_id).update(current_price=self.price)
+
+                return
+
+            # Intervals only move under the lock of their product, so the one read once it is locked is final
+            product_ids = PriceHistory.objects.filter(pk=self.pk).values_list('product_id', flat=True)
+            previous_product_id = None
+            while (product_id := product_ids.get()) != previous_product_id:
+                previous_product_id = product_id
+                self.__lock_products(previous_product_id, self.product_id)
+
+            moved = previous_product_id != self.product_id
+
+            # An open interval moved to another product becomes its current price
+            if moved and self.end is None:
+                (PriceHistory.objects
+                 .filter(product__pk=self.product_id, end__isnull=True)
+                 .update(end=date.today()))
+
+            super().save(*args, **kwargs)
+
+            self.__refresh_current_price(self.product_id)
+
+            if moved:
+                self.__refresh_current_price(previous_product_id)
+                invalidate_tags(tag(Product, previous_product_id))
+
+    def delete(self, *args, **kwargs):
+        """
+        Deleting the open interval reopens the latest remaining one
+        """
+
+        if self.end is not None:
+            return super().delete(*args, **kwargs)
+
+        with transaction.atomic():
+            self.__lock_products(self.product_id)
+
+            deleted = super().delete(*args, **kwargs)
+
+            self.__refresh_current_price(self.product_id)
+
+        return deleted
+
     def __str__(self) -> str:
         if self.end is None:
             return _(f'Actual price of {self.product.name}')
 
         return _(f'Old price of {self.product.name}')
+
+
+class ArchivedPriceHistory(models.Model):
+    """
+    Closed price interval moved out of ``PriceHistory`` once past the retention window of ``PriceHistoryCompaction``
+    """
+
+    class Meta:
+        ordering = ['start']
+        verbose_name_plural = _('Archived price histories')
+        indexes = [
+            models.Index(fields=['product', 'start', 'id'], name='archived_price_as_of_idx'),
+        ]
+
+    product = models.ForeignKey('products.Product', on_delete=models.CASCADE, related_name='+')
+    price = models.IntegerField()
+    start = models.DateField()
+    end = models.DateField()
+
+    def __str__(self) -> str:
+        return _(f'Archived price of {self.product.name}')
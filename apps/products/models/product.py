@@ -13,6 +13,10 @@ class Product(models.Model):
 
     class Meta:
         ordering = ['id']
+        indexes = [
+            # Best reviewed products of a category, read by the recommendation engine
+            models.Index(fields=['category', '-average_review', 'id'], name='product_category_ranking_idx'),
+        ]
 
     class Category(models.IntegerChoices):
         SCIENCE = 1, _('Science')
@@ -25,6 +29,11 @@ class Product(models.Model):
     sku = models.CharField(max_length=32)
     category = models.IntegerField(choices=Category)
     average_review = models.FloatField(default=0.0)
+    review_sum = models.FloatField(default=0.0, editable=False)
+    review_count = models.PositiveIntegerField(default=0, editable=False)
+    current_price = models.IntegerField(null=True, editable=False)
+    # Set once the recommendations are built, so a product without any is not rebuilt on every read
+    recommendations_built = models.BooleanField(default=False, editable=False)
 
     customers = models.ManyToManyField(Customer, through='Review')
     supplier = models.ForeignKey(Supplier, on_delete=models.SET_NULL, blank=False, null=True)
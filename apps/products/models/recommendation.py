@@ -0,0 +1,22 @@
+from django.db import models
+
+from django.utils.translation import gettext as _
+
+
+class Recommendation(models.Model):
+
+    class Meta:
+        ordering = ['product', '-score', 'recommended']
+        constraints = [
+            models.UniqueConstraint(fields=['product', 'recommended'], name='unique_recommendation_per_product'),
+        ]
+        indexes = [
+            models.Index(fields=['product', '-score'], name='recommendation_ranking_idx'),
+        ]
+
+    product = models.ForeignKey('products.Product', on_delete=models.CASCADE, related_name='recommendations')
+    recommended = models.ForeignKey('products.Product', on_delete=models.CASCADE, related_name='+')
+    score = models.FloatField()
+
+    def __str__(self) -> str:
+        return _(f'{self.recommended_id} recommended for {self.product_id}')
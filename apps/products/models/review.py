@@ -1,18 +1,80 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F, FloatField, Value
+from django.db.models.functions import Coalesce, NullIf
 
 from django.utils.translation import gettext as _
 
 from authentication.models import Customer
+from caching.tags import invalidate_tags, tag
 
 
 class Review(models.Model):
 
     class Meta:
         ordering = ['product']
+        indexes = [
+            models.Index(fields=['product', 'id'], name='review_keyset_idx'),
+            # The review aggregates of a product are recomputed from the index alone
+            models.Index(fields=['product', 'value'], name='review_product_value_idx'),
+        ]
 
-    product = models.ForeignKey('products.Product', on_delete=models.CASCADE)
+    # Both indexes above start with the product, so its own index would only slow reviews down
+    product = models.ForeignKey('products.Product', on_delete=models.CASCADE, db_index=False)
     customer = models.ForeignKey(Customer, on_delete=models.DO_NOTHING)
     value = models.FloatField()
 
+    @staticmethod
+    def __apply_to_product(product_id: int, value: float, count: int):
+        """
+        Adds a value to the product's running review sum and count in a single UPDATE,
+        so concurrent reviews never overwrite each other's aggregates. The UPDATE skips the product's signals,
+        so its cached responses are invalidated here
+        """
+
+        from .product import Product
+
+        review_sum = F('review_sum') + value
+        review_count = F('review_count') + count
+
+        Product.objects.filter(pk=product_id).update(
+            review_sum=review_sum,
+            review_count=review_count,
+            average_review=Coalesce(review_sum / NullIf(review_count, 0), Value(0.0), output_field=FloatField())
+        )
+        invalidate_tags(tag(Product, product_id))
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            if self._state.adding:
+                super().save(*args, **kwargs)
+                self.__apply_to_product(self.product_id, self.value, 1)
+
+                return
+
+            previous_product_id, previous_value = (Review.objects
+                                                   .select_for_update()
+                                                   .values_list('product_id', 'value')
+                                                   .get(pk=self.pk))
+            super().save(*args, **kwargs)
+
+            if previous_product_id != self.product_id:
+                self.__apply_to_product(previous_product_id, -previous_value, -1)
+                self.__apply_to_product(self.product_id, self.value, 1)
+
+            elif previous_value != self.value:
+                self.__apply_to_product(self.product_id, self.value - previous_value, 0)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            previous_product_id, previous_value = (Review.objects
+                                                   .select_for_update()
+                                                   .values_list('product_id', 'value')
+                                                   .get(pk=self.pk))
+            deleted = super().delete(*args, **kwargs)
+
+            self.__apply_to_product(previous_product_id, -previous_value, -1)
+
+        return deleted
+
     def __str__(self) -> str:
         return _(f'{self.customer.username} to {self.product.name}')
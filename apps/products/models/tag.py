@@ -7,9 +7,13 @@ class Tag(models.Model):
 
     class Meta:
         ordering = ['name']
+        indexes = [
+            # Tags of a chunk of products by name, read by the catalog export
+            models.Index(fields=['product', 'name'], name='tag_product_name_idx'),
+        ]
 
     name = models.CharField(primary_key=True, max_length=16)
-    product = models.ForeignKey('products.Product', on_delete=models.DO_NOTHING, blank=False)
+    product = models.ForeignKey('products.Product', on_delete=models.DO_NOTHING, blank=False, db_index=False)
 
     def __str__(self) -> str:
         return _(f'{self.name} in {self.product}')
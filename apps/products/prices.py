@@ -0,0 +1,85 @@
+from collections.abc import Iterable
+from datetime import date
+from itertools import batched
+
+from django.db import connections, router
+from django.db.models import Subquery
+from django.db.models.functions import Coalesce
+
+from .models import PriceHistory, ArchivedPriceHistory
+
+
+class PriceResolver:
+    """
+    Price of a product as of a date: the last price history started by then, the latest one on ties.
+    Every lookup is a backwards scan of the ``(product, start, id)`` index that stops at its first row.
+    Prices older than every price history of the product are looked up in the archive
+    """
+
+    @staticmethod
+    def as_of(product, at, field: str = 'price', model=PriceHistory) -> Subquery:
+        """
+        Subquery of the ``field`` of the price history in effect; ``product`` and ``at`` are usually outer refs
+        """
+
+        return Subquery(model.objects
+                        .filter(product__pk=product, start__lte=at)
+                        .order_by('-start', '-id')
+                        .values(field)[:1])
+
+    @staticmethod
+    def price_as_of(product, at) -> Coalesce:
+        """
+        Price in effect, from the archive when it is older than the price histories
+        """
+
+        return Coalesce(PriceResolver.as_of(product, at), PriceResolver.as_of(product, at, model=ArchivedPriceHistory))
+
+    @staticmethod
+    def __lookup(connection, model) -> str:
+        """
+        Correlated lookup of the price in effect of a pair in the table of ``model``
+        """
+
+        quote_name = connection.ops.quote_name
+        options = model._meta
+
+        table = quote_name(options.db_table)
+        product, start, price = (quote_name(options.get_field(field).column) for field in ('product', 'start', 'price'))
+        pk = quote_name(options.pk.column)
+
+        return (f'(SELECT history.{price} FROM {table} history '
+                f'WHERE history.{product} = pairs.product_id AND history.{start} <= pairs.at_date '
+                f'ORDER BY history.{start} DESC, history.{pk} DESC LIMIT 1)')
+
+    @staticmethod
+    def resolve(pairs: Iterable[tuple[int, date]], chunk_size: int = 500) -> dict[tuple[int, date], int | None]:
+        """
+        Prices of many ``(product id, date)`` pairs, ``chunk_size`` pairs per query, ``None`` when
+        the product had no price yet. Each pair is looked up in the archive only when no price history matches
+        """
+
+        connection = connections[router.db_for_read(PriceHistory)]
+        price = (f'COALESCE({PriceResolver.__lookup(connection, PriceHistory)}, '
+                 f'{PriceResolver.__lookup(connection, ArchivedPriceHistory)})')
+
+        prices = {}
+        for chunk in batched(dict.fromkeys(pairs), chunk_size):
+            values = ', '.join(['(%s, %s, %s)'] * len(chunk))
+            params = [
+                param
+                for pair_id, (product_id, at) in enumerate(chunk)
+                for param in (pair_id, product_id, connection.ops.adapt_datefield_value(at))
+            ]
+
+            # A correlated lookup per pair, all of them in one round trip
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f'WITH pairs (pair_id, product_id, at_date) AS (VALUES {values}) '
+                    f'SELECT pairs.pair_id, {price} FROM pairs',
+                    params
+                )
+
+                prices.update((chunk[pair_id], value) for pair_id, value in cursor.fetchall())
+
+        return prices
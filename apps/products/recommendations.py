@@ -0,0 +1,185 @@
+import heapq
+
+from itertools import batched, chain
+
+from django.db import transaction
+from django.db.models import Count, Min, Window, F
+from django.db.models.functions import RowNumber
+
+from caching.tags import invalidate_tags, tag
+
+from .co_purchases import CoPurchaseMatrix
+from .models import Product, Recommendation
+
+# Size of each product's recommendation list
+RECOMMENDATIONS_PER_PRODUCT = 20
+
+CATEGORY_WEIGHT = 1.0
+CO_PURCHASE_WEIGHT = 1.5
+REVIEW_WEIGHT = 0.2
+
+MAX_REVIEW = 5.0
+
+
+class RecommendationEngine:
+    """
+    Keeps the top ``RECOMMENDATIONS_PER_PRODUCT`` related products of each product in the
+    ``Recommendation`` table, scored by category, co-purchases (from ``CoPurchaseMatrix``)
+    and the candidate's average review
+    """
+
+    @staticmethod
+    def score(same_category: bool, co_purchases: int, average_review: float) -> float:
+        return (CATEGORY_WEIGHT * same_category
+                + CO_PURCHASE_WEIGHT * co_purchases
+                + REVIEW_WEIGHT * average_review / MAX_REVIEW)
+
+    @staticmethod
+    def __candidates(product: Product) -> list[Recommendation]:
+        co_purchases = CoPurchaseMatrix.partners(product.id)
+
+        # Products of the same category only differ by their reviews, so the best reviewed ones
+        # are the only ones that can beat a co-purchased product
+        peers = (Product.objects
+                 .filter(category=product.category)
+                 .exclude(pk=product.id)
+                 .order_by('-average_review', 'id')
+                 .values_list('id', 'category', 'average_review')[:RECOMMENDATIONS_PER_PRODUCT])
+        partners = (Product.objects
+                    .filter(pk__in=co_purchases.keys())
+                    .values_list('id', 'category', 'average_review'))
+
+        scores = {
+            candidate_id: RecommendationEngine.score(
+                category == product.category,
+                co_purchases.get(candidate_id, 0),
+                average_review
+            )
+            for candidate_id, category, average_review in [*peers, *partners]
+        }
+        best = heapq.nlargest(RECOMMENDATIONS_PER_PRODUCT, scores.items(), key=lambda item: (item[1], -item[0]))
+
+        return [
+            Recommendation(product_id=product.id, recommended_id=candidate_id, score=score)
+            for candidate_id, score in best
+        ]
+
+    @staticmethod
+    def __invalidate(product_ids):
+        if product_ids:
+            invalidate_tags(*{tag(Recommendation, product_id) for product_id in product_ids})
+
+    @staticmethod
+    @transaction.atomic
+    def rebuild(product_ids) -> list[int]:
+        """
+        Recomputes the whole recommendation list of each product
+        """
+
+        rebuilt = []
+        for product in Product.objects.filter(pk__in=product_ids).only('id', 'category'):
+            Recommendation.objects.filter(product=product).delete()
+            Recommendation.objects.bulk_create(RecommendationEngine.__candidates(product))
+
+            rebuilt.append(product.id)
+
+        Product.objects.filter(pk__in=rebuilt).update(recommendations_built=True)
+        RecommendationEngine.__invalidate(rebuilt)
+
+        return rebuilt
+
+    @staticmethod
+    def trim(product_ids):
+        """
+        Drops the entries ranked below ``RECOMMENDATIONS_PER_PRODUCT`` of each list
+        """
+
+        overflow = (Recommendation.objects
+                    .filter(product_id__in=product_ids)
+                    .annotate(rank=Window(RowNumber(), partition_by=F('product_id'),
+                                          order_by=[F('score').desc(), F('recommended_id').asc()]))
+                    .filter(rank__gt=RECOMMENDATIONS_PER_PRODUCT)
+                    .values_list('id', flat=True))
+
+        Recommendation.objects.filter(pk__in=list(overflow)).delete()
+
+    @staticmethod
+    @transaction.atomic
+    def offer(product_id: int, chunk_size: int = 500) -> list[int]:
+        """
+        Moves a created or changed product into the lists it now belongs to without rebuilding them.
+        Its entries are rescored in place, and dropped from the lists it is no longer a candidate of or
+        whose floor it falls below. It is then offered to its co-purchase partners and to the
+        ``RECOMMENDATIONS_PER_PRODUCT`` best reviewed products of its category, read from the ranking index.
+        Lists it leaves are refilled by the next full rebuild.
+        """
+
+        product: Product = Product.objects.only('id', 'category', 'average_review').get(pk=product_id)
+        co_purchases = CoPurchaseMatrix.partners(product_id)
+
+        listed = {
+            target_id: (recommendation_id, category)
+            for recommendation_id, target_id, category in (Recommendation.objects
+                                                           .filter(recommended_id=product_id)
+                                                           .values_list('id', 'product_id', 'product__category'))
+        }
+        peers = (Product.objects
+                 .filter(category=product.category)
+                 .exclude(pk=product_id)
+                 .order_by('-average_review', 'id')
+                 .values_list('id', 'category')[:RECOMMENDATIONS_PER_PRODUCT])
+        partners = (Product.objects
+                    .filter(pk__in=co_purchases.keys())
+                    .values_list('id', 'category'))
+
+        # Partners of the same category may be among the peers too, and both may already list the product
+        targets = dict(chain(
+            ((target_id, category) for target_id, (_, category) in listed.items()),
+            peers,
+            partners
+        ))
+
+        touched = []
+        for chunk in batched(targets.items(), chunk_size):
+            # The product's own entry is left out, so a list holding it is full one entry earlier
+            lists = {
+                target_id: (size, lowest)
+                for target_id, size, lowest in (Recommendation.objects
+                                                .filter(product_id__in=[target_id for target_id, _ in chunk])
+                                                .exclude(recommended_id=product_id)
+                                                .values('product_id')
+                                                .annotate(size=Count('id'), lowest=Min('score'))
+                                                .values_list('product_id', 'size', 'lowest'))
+            }
+
+            rescored, dropped, offered = [], [], []
+            for target_id, category in chunk:
+                same_category = category == product.category
+                score = RecommendationEngine.score(
+                    same_category,
+                    co_purchases.get(target_id, 0),
+                    product.average_review
+                )
+
+                size, lowest = lists.get(target_id, (0, None))
+                if target_id in listed:
+                    recommendation_id, _ = listed[target_id]
+                    candidate = same_category or target_id in co_purchases
+                    if candidate and (size < RECOMMENDATIONS_PER_PRODUCT - 1 or score >= lowest):
+                        rescored.append(Recommendation(pk=recommendation_id, score=score))
+                    else:
+                        dropped.append(recommendation_id)
+                elif size < RECOMMENDATIONS_PER_PRODUCT or score > lowest:
+                    offered.append(Recommendation(product_id=target_id, recommended_id=product_id, score=score))
+
+            Recommendation.objects.bulk_update(rescored, ['score'])
+            Recommendation.objects.filter(pk__in=dropped).delete()
+            Recommendation.objects.bulk_create(offered)
+            RecommendationEngine.trim([recommendation.product_id for recommendation in offered])
+
+            touched.extend(target_id for target_id, _ in chunk if target_id in listed)
+            touched.extend(recommendation.product_id for recommendation in offered)
+
+        RecommendationEngine.__invalidate(touched)
+
+        return touched
@@ -3,3 +3,4 @@ from .supplier_serializer import SupplierSerializer
 from .tag_serializer import TagSerializer
 from .price_history_serializer import PriceHistorySerializer
 from .review_serializer import ReviewSerializer
+from .bulk_serializers import ProductBulkSerializer, PriceHistoryBulkSerializer
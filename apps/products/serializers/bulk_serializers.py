@@ -0,0 +1,30 @@
+from rest_framework import serializers
+
+from ..models import Product, PriceHistory
+
+
+class ProductBulkSerializer(serializers.ModelSerializer):
+    """
+    Validates a row of a bulk product write, a new product without ``id`` or a partial update with it.
+    Suppliers and products are looked up by ``CatalogBulkWriter`` for the whole batch, so it runs no queries
+    """
+
+    id = serializers.IntegerField(required=False)
+    supplier = serializers.IntegerField()
+    price = serializers.IntegerField()
+
+    class Meta:
+        model = Product
+        fields = ['id', 'name', 'description', 'category', 'supplier', 'price']
+
+
+class PriceHistoryBulkSerializer(serializers.ModelSerializer):
+    """
+    Validates a row of a bulk price write. Products are looked up by ``CatalogBulkWriter`` for the whole batch
+    """
+
+    product = serializers.IntegerField()
+
+    class Meta:
+        model = PriceHistory
+        fields = ['product', 'price']
@@ -2,9 +2,10 @@ from rest_framework import serializers
 
 from django.db import transaction, DatabaseError
 
-from ..tasks import update_product_sku
+from ..tasks import update_product_sku, rebuild_product_recommendations, offer_product_recommendation
 
 from ..models import Product
+from ..dispatch import TaskDispatcher
 
 from ..utils import SkuUtils
 
@@ -16,7 +17,8 @@ class ProductSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Product
-        fields = ['id', 'name', 'description', 'sku', 'category', 'average_review', 'customers', 'supplier', 'price']
+        fields = ['id', 'name', 'description', 'sku', 'category', 'average_review', 'current_price', 'customers',
+                  'supplier', 'price']
 
     @staticmethod
     def __create_price_history_for_product(product_id: int, price: int):
@@ -55,10 +57,22 @@ class ProductSerializer(serializers.ModelSerializer):
         if price_history is None:
             raise DatabaseError()
 
+        product.current_price = price_history.price
+
+        self.__refresh_recommendations(product.id)
+
         return product
 
+    @staticmethod
+    def __refresh_recommendations(product_id: int):
+        TaskDispatcher.dispatch(rebuild_product_recommendations, [product_id])
+        TaskDispatcher.dispatch(offer_product_recommendation, product_id)
+
     def update(self, instance, validated_data):
-        if 'name' or 'category' in validated_data:
-            update_product_sku.delay(instance.id)
+        if 'name' in validated_data or 'category' in validated_data:
+            TaskDispatcher.dispatch(update_product_sku, instance.id)
+
+        if 'category' in validated_data and validated_data.get('category') != instance.category:
+            self.__refresh_recommendations(instance.id)
 
         return super().update(instance, validated_data)
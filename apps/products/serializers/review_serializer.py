@@ -1,6 +1,7 @@
 from rest_framework import serializers
 
 from ..models import Review
+from ..dispatch import TaskDispatcher
 
 
 class ReviewSerializer(serializers.ModelSerializer):
@@ -12,15 +13,15 @@ class ReviewSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         instance: Review = super().create(validated_data)
 
-        from ..tasks import update_product_average_review
-        update_product_average_review.delay(instance.product.id)
+        from ..tasks import offer_product_recommendation
+        TaskDispatcher.dispatch(offer_product_recommendation, instance.product_id)
 
         return instance
 
     def update(self, instance: Review, validated_data):
-        from ..tasks import update_product_average_review
+        from ..tasks import offer_product_recommendation
 
         instance: Review = super().update(instance, validated_data)
-        update_product_average_review.delay(instance.product.id)
+        TaskDispatcher.dispatch(offer_product_recommendation, instance.product_id)
 
         return instance
@@ -1,8 +1,9 @@
 from rest_framework import serializers
 
-from ..tasks import update_product_sku
+from ..tasks import update_supplier_product_skus
 
 from ..models import Supplier
+from ..dispatch import TaskDispatcher
 
 
 class SupplierSerializer(serializers.ModelSerializer):
@@ -12,7 +13,7 @@ class SupplierSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'address', 'phone']
 
     def update(self, instance, validated_data):
-        if 'name' in validated_data:
-            update_product_sku.delay(instance.id)
+        if 'name' in validated_data and validated_data.get('name') != instance.name:
+            TaskDispatcher.dispatch(update_supplier_product_skus, instance.id)
 
         return super().update(instance, validated_data)
@@ -0,0 +1,53 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from caching.tags import invalidate_object, invalidate_tags, tag
+
+from .models import Product, Supplier, Tag, PriceHistory, Review
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_save, sender=Supplier)
+@receiver(post_save, sender=Tag)
+def invalidate_saved_catalog_object(sender, instance, created, **kwargs):
+    invalidate_object(instance, membership_changed=created)
+
+
+@receiver(post_delete, sender=Product)
+@receiver(post_delete, sender=Supplier)
+@receiver(post_delete, sender=Tag)
+def invalidate_deleted_catalog_object(sender, instance, **kwargs):
+    invalidate_object(instance, membership_changed=True)
+
+
+@receiver(post_save, sender=PriceHistory)
+def invalidate_saved_price_history(sender, instance: PriceHistory, created, **kwargs):
+    """
+    The product's current price and its previous interval change along with the new price
+    """
+
+    invalidate_object(instance, membership_changed=created)
+    invalidate_tags(tag(Product, instance.product_id))
+
+
+@receiver(post_delete, sender=PriceHistory)
+def invalidate_deleted_price_history(sender, instance: PriceHistory, **kwargs):
+    invalidate_object(instance, membership_changed=True)
+    invalidate_tags(tag(Product, instance.product_id))
+
+
+@receiver(post_save, sender=Review)
+def invalidate_saved_review(sender, instance: Review, created, **kwargs):
+    """
+    A review changes the aggregates and the customers of its product. The product a review was moved from
+    is invalidated along with its aggregates, since only the model knows it
+    """
+
+    invalidate_object(instance, membership_changed=created)
+    invalidate_tags(tag(Product, instance.product_id))
+
+
+@receiver(post_delete, sender=Review)
+def invalidate_deleted_review(sender, instance: Review, **kwargs):
+    invalidate_object(instance, membership_changed=True)
+    invalidate_tags(tag(Product, instance.product_id))
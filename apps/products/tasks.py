@@ -1,23 +1,35 @@
-from django.db.models import Avg
+from django.db.models import Avg, Count, Sum
+from django.db.models.functions import Coalesce
 
 from celery import shared_task
+from celery.utils.log import get_task_logger
+
+from caching.tags import invalidate_tags, tag
 
 from .utils import SkuUtils
-from . import serializers
+
+logger = get_task_logger(__name__)
 
 
 @shared_task(max_retries=3)
 def update_product_average_review(product_id: int):
+    """
+    Recomputes the review aggregates of a product from scratch. Reviews keep them up to date
+    incrementally, so this is only needed to repair them
+    """
 
     from .models import Product, Review
 
-    product: Product = Product.objects.get(pk=product_id)
-    reviews = Review.objects.filter(product__pk=product_id)
+    aggregates = (Review.objects
+                  .filter(product__pk=product_id)
+                  .aggregate(review_sum=Coalesce(Sum('value'), 0.0),
+                             review_count=Count('id'),
+                             average_review=Coalesce(Avg('value'), 0.0)))
 
-    average_review = reviews.aggregate(Avg('value')).get('value__avg')
+    Product.objects.filter(pk=product_id).update(**aggregates)
 
-    serializer: serializers.ProductSerializer = serializers.ProductSerializer()
-    serializer.update(product, {'average_review': average_review})
+    # The UPDATE skips the product's signals
+    invalidate_tags(tag(Product, product_id))
 
     return True
 
@@ -25,21 +37,111 @@ def update_product_average_review(product_id: int):
 @shared_task(max_retries=3)
 def update_product_sku(product_id=None, supplier_id=None):
 
-    from .models import Product, Supplier
+    from .models import Product
 
     if product_id is not None:
-        product: Product = Product.objects.get(pk=product_id)
-        sku = SkuUtils.generate_sku(product.supplier.name, product.name, product.category)
-
-        product.sku = sku
-        product.save()
+        product: Product = Product.objects.select_related('supplier').get(pk=product_id)
+        if product.supplier is not None:
+            product.sku = SkuUtils.generate_sku(product.supplier.name, product.name, product.category)
+            product.save(update_fields=['sku'])
 
     if supplier_id is not None:
-        supplier: Supplier = Supplier.objects.get(pk=supplier_id)
-        product: Product = Product.objects.get(supplier=supplier)
-        sku = SkuUtils.generate_sku(product.supplier.name, product.name, product.category)
+        update_supplier_product_skus(supplier_id)
+
+    return True
+
+
+@shared_task(max_retries=3)
+def update_supplier_product_skus(supplier_id: int, chunk_size: int = 1000):
+    """
+    Regenerates the SKUs of every product of a supplier. Products are read by id ranges of
+    ``chunk_size`` rows and only the changed SKUs are written back, so memory does not grow
+    with the number of products
+    """
+
+    from .models import Product, Supplier
+
+    supplier_name = Supplier.objects.values_list('name', flat=True).get(pk=supplier_id)
+    products = Product.objects.filter(supplier__pk=supplier_id).only('id', 'name', 'category', 'sku').order_by('id')
 
-        product.sku = sku
-        product.save()
+    total = products.count()
+    checked, updated, last_id = 0, 0, 0
+
+    while chunk := list(products.filter(pk__gt=last_id)[:chunk_size]):
+        skus = SkuUtils.generate_skus((supplier_name, product.name, product.category) for product in chunk)
+
+        changed = []
+        for product, sku in zip(chunk, skus):
+            if sku != product.sku:
+                product.sku = sku
+                changed.append(product)
+
+        if changed:
+            Product.objects.bulk_update(changed, ['sku'])
+            invalidate_tags(*(tag(Product, product.id) for product in changed))
+
+        checked += len(chunk)
+        updated += len(changed)
+        last_id = chunk[-1].id
+
+        logger.info(f'SKUs of supplier {supplier_id}: {checked}/{total} products checked, {updated} updated')
+
+    return {'checked': checked, 'updated': updated}
+
+
+@shared_task(max_retries=3)
+def rebuild_product_recommendations(product_ids: list[int]):
+
+    from .recommendations import RecommendationEngine
+
+    RecommendationEngine.rebuild(product_ids)
 
     return True
+
+
+@shared_task(max_retries=3)
+def offer_product_recommendation(product_id: int):
+
+    from .recommendations import RecommendationEngine
+
+    RecommendationEngine.offer(product_id)
+
+    return True
+
+
+@shared_task
+def rebuild_all_recommendations(chunk_size: int = 500):
+
+    from itertools import batched
+
+    from .models import Product
+    from .recommendations import RecommendationEngine
+
+    product_ids = Product.objects.values_list('id', flat=True).iterator(chunk_size=chunk_size)
+    for chunk in batched(product_ids, chunk_size):
+        RecommendationEngine.rebuild(chunk)
+
+    return True
+
+
+@shared_task
+def update_co_purchases(chunk_size: int = 1000):
+
+    from itertools import batched
+
+    from .co_purchases import CoPurchaseMatrix
+    from .recommendations import RecommendationEngine
+
+    _, product_ids = CoPurchaseMatrix.update(chunk_size=chunk_size)
+    for chunk in batched(sorted(product_ids), chunk_size):
+        RecommendationEngine.rebuild(chunk)
+
+    return len(product_ids)
+
+
+@shared_task
+def compact_price_history(retention_days: int = 365):
+
+    from .compaction import PriceHistoryCompaction
+
+    return PriceHistoryCompaction.run(retention_days=retention_days)
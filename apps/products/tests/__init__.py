@@ -9,3 +9,17 @@ from .tag_viewset_tests import TagViewSetTests
 from .review_viewset_tests import ReviewViewSetTests
 from .price_history_viewset_tests import PriceHistoryViewSetTests
 from .recommendation_algorithm_viewset_tests import RecommendationAlgorithmViewSetTests
+from .catalog_cache_invalidation_tests import CatalogCacheInvalidationTests
+from .recommendation_engine_tests import RecommendationEngineTests
+from .co_purchase_matrix_tests import CoPurchaseMatrixTests
+from .task_dispatcher_tests import TaskDispatcherTests
+from .sku_utils_tests import SkuUtilsTests
+from .query_count_tests import QueryCountTests
+from .values_serializer_tests import ValuesSerializerTests
+from .fast_json_tests import FastJSONTests
+from .catalog_export_tests import CatalogExportTests
+from .catalog_bulk_writer_tests import CatalogBulkWriterTests
+from .import_catalog_tests import ImportCatalogTests
+from .price_resolver_tests import PriceResolverTests
+from .price_history_compaction_tests import PriceHistoryCompactionTests
+from .query_plan_tests import QueryPlanTests
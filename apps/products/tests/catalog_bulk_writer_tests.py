@@ -0,0 +1,216 @@
+from unittest.mock import patch
+
+from rest_framework import test
+from rest_framework.test import APIClient
+
+from rest_framework.reverse import reverse
+
+from rest_framework import status
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from authentication.models import Customer
+from ..models import Product, Supplier, PriceHistory
+from ..bulk import CatalogBulkWriter
+from ..utils import SkuUtils
+
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+class CatalogBulkWriterTests(test.APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.client: APIClient = APIClient()
+
+        cls.products_bulk_url = reverse('product-bulk')
+        cls.prices_bulk_url = reverse('price-bulk')
+
+        cls.customer: Customer = Customer.objects.create(username='testuser', email='test@test.dev')
+        cls.admin: Customer = Customer.objects.create(username='testadmin', email='admin@test.dev', is_staff=True)
+
+        cls.suppliers = [
+            Supplier.objects.create(name=f'TestCia {index}', address='TestStreet', phone=f'{index:011d}')
+            for index in range(2)
+        ]
+
+        cls.product: Product = Product.objects.create(
+            name='Test Product',
+            description='Test description',
+            sku=SkuUtils.generate_sku(cls.suppliers[0].name, 'Test Product', Product.Category.SCIENCE),
+            category=Product.Category.SCIENCE,
+            supplier=cls.suppliers[0]
+        )
+        PriceHistory.objects.create(product=cls.product, price=100)
+
+    def __authenticate(self, customer: Customer):
+        refresh = RefreshToken.for_user(customer)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+
+    def __new_product(self, index: int, **data) -> dict:
+        return {
+            'name': f'New Product {index}',
+            'description': 'New description',
+            'category': Product.Category.FICTION,
+            'supplier': self.suppliers[index % 2].id,
+            'price': 100 * (index + 1),
+        } | data
+
+    def test_if_products_are_created_with_sku_and_price(self):
+        """
+        Tests if rows without id create products with the same SKU as a single creation and an open price
+        """
+
+        rows = [self.__new_product(index) for index in range(3)]
+
+        summary = CatalogBulkWriter.write_products(rows, chunk_size=2)
+
+        self.assertEqual(len(summary.get('created')), 3)
+        self.assertEqual(summary.get('updated'), [])
+        self.assertEqual(summary.get('errors'), [])
+
+        for row, product_id in zip(rows, summary.get('created')):
+            product = Product.objects.get(pk=product_id)
+            supplier = Supplier.objects.get(pk=row.get('supplier'))
+
+            self.assertEqual(product.sku, SkuUtils.generate_sku(supplier.name, row.get('name'), row.get('category')))
+            self.assertEqual(product.current_price, row.get('price'))
+            self.assertEqual(PriceHistory.objects.get(product=product, end__isnull=True).price, row.get('price'))
+
+    def test_if_products_are_partially_updated(self):
+        """
+        Tests if rows with id update only the given fields, regenerate the SKU and close the previous price
+        """
+
+        summary = CatalogBulkWriter.write_products([
+            {'id': self.product.id, 'name': 'Renamed Product', 'price': 150},
+        ])
+
+        self.product.refresh_from_db()
+
+        self.assertEqual(summary.get('updated'), [self.product.id])
+        self.assertEqual(self.product.name, 'Renamed Product')
+        self.assertEqual(self.product.description, 'Test description')
+        self.assertEqual(self.product.sku,
+                         SkuUtils.generate_sku(self.suppliers[0].name, 'Renamed Product', Product.Category.SCIENCE))
+        self.assertEqual(self.product.current_price, 150)
+        self.assertEqual(PriceHistory.objects.get(product=self.product, end__isnull=True).price, 150)
+        self.assertIsNotNone(PriceHistory.objects.get(product=self.product, price=100).end)
+
+    def test_if_updates_do_not_revert_concurrent_writes_to_other_fields(self):
+        """
+        Tests if each updated product writes only its own fields, keeping the fields written
+        by others while the batch was validated
+        """
+
+        other: Product = Product.objects.create(name='Other Product', description='Test description',
+                                                category=Product.Category.SCIENCE, supplier=self.suppliers[1])
+        generate_skus = SkuUtils.generate_skus
+
+        def write_concurrently(*args, **kwargs):
+            Product.objects.filter(pk=self.product.id).update(description='Concurrent description')
+            return generate_skus(*args, **kwargs)
+
+        with patch('products.bulk.SkuUtils.generate_skus', side_effect=write_concurrently):
+            CatalogBulkWriter.write_products([
+                {'id': self.product.id, 'name': 'Renamed Product'},
+                {'id': other.id, 'description': 'Updated description'},
+            ])
+
+        self.product.refresh_from_db()
+        other.refresh_from_db()
+
+        self.assertEqual(self.product.name, 'Renamed Product')
+        self.assertEqual(self.product.description, 'Concurrent description')
+        self.assertEqual(other.description, 'Updated description')
+
+    def test_if_invalid_rows_are_reported_by_index(self):
+        """
+        Tests if missing fields, unknown suppliers or products and invalid values are reported
+        for their row while the valid rows are saved
+        """
+
+        summary = CatalogBulkWriter.write_products([
+            self.__new_product(0),
+            {'name': 'Incomplete Product'},
+            self.__new_product(2, supplier=999),
+            {'id': 999, 'name': 'Missing Product'},
+            self.__new_product(4, category=99),
+        ])
+
+        errors = {error.get('index'): error.get('errors') for error in summary.get('errors')}
+
+        self.assertEqual(len(summary.get('created')), 1)
+        self.assertEqual(sorted(errors), [1, 2, 3, 4])
+        self.assertIn('supplier', errors.get(1))
+        self.assertIn('supplier', errors.get(2))
+        self.assertIn('id', errors.get(3))
+        self.assertIn('category', errors.get(4))
+
+    def test_if_only_the_last_price_of_a_product_stays_open(self):
+        """
+        Tests if several prices of a product in one batch leave a single open interval with the last one
+        """
+
+        summary = CatalogBulkWriter.write_prices([
+            {'product': self.product.id, 'price': 200},
+            {'product': self.product.id, 'price': 300},
+            {'product': 999, 'price': 400},
+        ])
+
+        self.product.refresh_from_db()
+
+        self.assertEqual(len(summary.get('created')), 2)
+        self.assertEqual(summary.get('errors')[0].get('index'), 2)
+        self.assertEqual(self.product.current_price, 300)
+        self.assertEqual(
+            list(PriceHistory.objects.filter(product=self.product, end__isnull=True).values_list('price', flat=True)),
+            [300]
+        )
+
+    def test_if_queries_do_not_grow_with_the_batch(self):
+        """
+        Tests if a bulk product write runs the same number of queries for a few or many rows
+        """
+
+        def count_queries(size: int) -> int:
+            with CaptureQueriesContext(connection) as context:
+                CatalogBulkWriter.write_products([self.__new_product(index) for index in range(size)],
+                                                 refresh_recommendations=False)
+
+            return len(context)
+
+        self.assertEqual(count_queries(2), count_queries(20))
+
+    def test_if_bulk_endpoints_require_an_admin(self):
+        """
+        Tests if only admins can write products or prices in bulk
+        """
+
+        self.__authenticate(self.customer)
+
+        response = self.client.post(self.products_bulk_url, [self.__new_product(0)], format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        response = self.client.post(self.prices_bulk_url, [{'product': self.product.id, 'price': 1}], format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_if_bulk_endpoints_return_the_summary(self):
+        """
+        Tests if the bulk endpoints return the created ids and errors, and refuse bodies that are not lists
+        """
+
+        self.__authenticate(self.admin)
+
+        response = self.client.post(self.products_bulk_url, [self.__new_product(0), {}], format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data.get('created')), 1)
+        self.assertEqual(response.data.get('errors')[0].get('index'), 1)
+
+        response = self.client.post(self.prices_bulk_url, [{'product': self.product.id, 'price': 1}], format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data.get('created')), 1)
+
+        response = self.client.post(self.products_bulk_url, self.__new_product(0), format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,198 @@
+from unittest.mock import patch
+
+from rest_framework import test
+from rest_framework.test import APIClient
+
+from rest_framework.reverse import reverse
+
+from authentication.models import Customer
+from caching.tags import TagStore, tag
+from ..models import Product, Supplier, PriceHistory, Review
+from ..serializers import ProductSerializer, PriceHistorySerializer
+from ..tasks import update_product_average_review
+from ..views import ProductViewSet
+
+
+class CatalogCacheInvalidationTests(test.APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.client: APIClient = APIClient()
+
+        test_supplier_data = {
+            'name': 'TestCia',
+            'address': 'TestStreet',
+            'phone': '99999999999'
+        }
+        cls.supplier: Supplier = Supplier.objects.create(**test_supplier_data)
+
+        cls.customer: Customer = Customer.objects.create(username='testuser', email='test@test.dev')
+
+        cls.product_data = {
+            'name': 'Test Product',
+            'description': 'Test description',
+            'category': Product.Category.SCIENCE,
+            'supplier': cls.supplier.id,
+            'price': 100
+        }
+
+    def __create_product(self, product_data):
+        serializer: ProductSerializer = ProductSerializer(data=product_data)
+        serializer.is_valid()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            product: Product = serializer.save()
+
+        return product
+
+    def test_if_cached_responses_are_served_until_an_object_changes(self):
+        """
+        Tests if a cached product is served while nothing is saved through the ORM and purged when it is saved
+        """
+
+        product: Product = self.__create_product(self.product_data)
+        url = reverse('product-detail', args=[product.id])
+
+        self.client.get(url)
+        Product.objects.filter(pk=product.id).update(name='Bypassed Name')
+
+        self.assertEqual(self.client.get(url).data.get('name'), self.product_data.get('name'))
+
+        product.name = 'Updated Name'
+        with self.captureOnCommitCallbacks(execute=True):
+            product.save()
+
+        self.assertEqual(self.client.get(url).data.get('name'), 'Updated Name')
+
+    def test_if_only_the_affected_entries_are_purged(self):
+        """
+        Tests if saving a product does not purge cached responses of other products
+        """
+
+        product: Product = self.__create_product(self.product_data)
+        other: Product = self.__create_product({**self.product_data, 'name': 'Other Product'})
+
+        other_url = reverse('product-detail', args=[other.id])
+        self.client.get(other_url)
+        Product.objects.filter(pk=other.id).update(name='Bypassed Name')
+
+        product.name = 'Updated Name'
+        with self.captureOnCommitCallbacks(execute=True):
+            product.save()
+
+        self.assertEqual(self.client.get(other_url).data.get('name'), 'Other Product')
+
+    def test_if_creating_a_product_purges_the_product_listings(self):
+        """
+        Tests if a new product is shown by a previously cached product list
+        """
+
+        self.__create_product(self.product_data)
+        url = reverse('product-list')
+
+        self.assertEqual(len(self.client.get(url).data.get('results')), 1)
+
+        self.__create_product({**self.product_data, 'name': 'Other Product'})
+
+        self.assertEqual(len(self.client.get(url).data.get('results')), 2)
+
+    def test_if_a_listing_built_while_a_listed_product_changes_is_not_cached(self):
+        """
+        Tests if a product list is not cached when one of its products is invalidated after being read,
+        so the next request shows the change
+        """
+
+        product: Product = self.__create_product(self.product_data)
+        url = reverse('product-list')
+
+        get_response_cache_tags = ProductViewSet.get_response_cache_tags
+
+        def change_after_reading(view, response):
+            Product.objects.filter(pk=product.id).update(name='Updated Name')
+            TagStore().bump([tag(Product, product.id)])
+
+            return get_response_cache_tags(view, response)
+
+        with patch.object(ProductViewSet, 'get_response_cache_tags', change_after_reading):
+            self.assertEqual(self.client.get(url).data.get('results')[0].get('name'), self.product_data.get('name'))
+
+        self.assertEqual(self.client.get(url).data.get('results')[0].get('name'), 'Updated Name')
+
+    def test_if_a_new_price_purges_the_product_and_its_previous_price(self):
+        """
+        Tests if a new price refreshes the product's current price and the interval it closed
+        """
+
+        product: Product = self.__create_product(self.product_data)
+        previous: PriceHistory = PriceHistory.objects.get(product=product)
+
+        product_url = reverse('product-detail', args=[product.id])
+        price_url = reverse('price-detail', args=[previous.id])
+        self.client.get(product_url)
+        self.client.get(price_url)
+
+        serializer: PriceHistorySerializer = PriceHistorySerializer(data={'product': product.id, 'price': 150})
+        serializer.is_valid()
+        with self.captureOnCommitCallbacks(execute=True):
+            serializer.save()
+
+        self.assertEqual(self.client.get(product_url).data.get('current_price'), 150)
+        self.assertIsNotNone(self.client.get(price_url).data.get('end'))
+
+    def test_if_updating_a_review_purges_its_product(self):
+        """
+        Tests if a cached product shows the new average review once one of its reviews changes value
+        """
+
+        product: Product = self.__create_product(self.product_data)
+        with self.captureOnCommitCallbacks(execute=True):
+            review: Review = Review.objects.create(product=product, customer=self.customer, value=4.0)
+
+        url = reverse('product-detail', args=[product.id])
+        self.assertEqual(self.client.get(url).data.get('average_review'), 4.0)
+
+        review.value = 2.0
+        with self.captureOnCommitCallbacks(execute=True):
+            review.save()
+
+        self.assertEqual(self.client.get(url).data.get('average_review'), 2.0)
+
+    def test_if_moving_a_review_purges_both_products(self):
+        """
+        Tests if the product a review is moved from and the one it is moved to are both refreshed
+        """
+
+        product: Product = self.__create_product(self.product_data)
+        other: Product = self.__create_product({**self.product_data, 'name': 'Other Product'})
+        with self.captureOnCommitCallbacks(execute=True):
+            review: Review = Review.objects.create(product=product, customer=self.customer, value=4.0)
+
+        product_url = reverse('product-detail', args=[product.id])
+        other_url = reverse('product-detail', args=[other.id])
+        self.client.get(product_url)
+        self.client.get(other_url)
+
+        review.product = other
+        with self.captureOnCommitCallbacks(execute=True):
+            review.save()
+
+        self.assertEqual(self.client.get(product_url).data.get('average_review'), 0)
+        self.assertEqual(self.client.get(other_url).data.get('average_review'), 4.0)
+
+    def test_if_repairing_the_review_aggregates_purges_the_product(self):
+        """
+        Tests if a cached product shows the review aggregates recomputed by the repair task
+        """
+
+        product: Product = self.__create_product(self.product_data)
+        with self.captureOnCommitCallbacks(execute=True):
+            Review.objects.create(product=product, customer=self.customer, value=4.0)
+
+        Product.objects.filter(pk=product.id).update(average_review=0.0, review_sum=0.0, review_count=0)
+        url = reverse('product-detail', args=[product.id])
+        self.assertEqual(self.client.get(url).data.get('average_review'), 0.0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            update_product_average_review(product.id)
+
+        self.assertEqual(self.client.get(url).data.get('average_review'), 4.0)
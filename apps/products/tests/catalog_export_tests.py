@@ -0,0 +1,126 @@
+from rest_framework import test
+from rest_framework.test import APIClient
+
+from rest_framework.reverse import reverse
+
+from rest_framework import status
+
+from django.db import connection
+from django.http import StreamingHttpResponse
+from django.test.utils import CaptureQueriesContext
+
+import csv
+import io
+import json
+
+from authentication.models import Customer
+from ..models import Product, Supplier, Tag, PriceHistory
+from ..exports import CatalogExport
+
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+class CatalogExportTests(test.APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.client: APIClient = APIClient()
+
+        cls.export_url = reverse('product-export')
+
+        cls.customer: Customer = Customer.objects.create(username='testuser', email='test@test.dev')
+        supplier: Supplier = Supplier.objects.create(name='TestCia', address='TestStreet', phone='99999999999')
+
+        cls.products = []
+        for index in range(5):
+            product: Product = Product.objects.create(
+                name=f'Test Product {index}',
+                description='Descrição, com "aspas"',
+                sku=f'T1-TP{index}',
+                category=Product.Category.SCIENCE,
+                supplier=supplier if index else None
+            )
+            PriceHistory.objects.create(product=product, price=100 * (index + 1))
+
+            cls.products.append(product)
+
+        Tag.objects.create(name='science', product=cls.products[1])
+        Tag.objects.create(name='bestseller', product=cls.products[1])
+        Tag.objects.create(name='new', product=cls.products[3])
+
+    def __authenticate(self):
+        refresh = RefreshToken.for_user(self.customer)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+
+    def __export(self, **params):
+        response = self.client.get(self.export_url, data=params)
+        self.assertIsInstance(response, StreamingHttpResponse)
+
+        return response, b''.join(response.streaming_content).decode()
+
+    def test_if_export_streams_every_product_as_ndjson(self):
+        """
+        Tests if the catalog export streams one JSON line per product with its supplier, current price and tags
+        """
+
+        self.__authenticate()
+
+        response, content = self.__export()
+        rows = [json.loads(line) for line in content.splitlines()]
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertEqual([row.get('id') for row in rows], [product.id for product in self.products])
+
+        self.assertEqual(rows[0].get('supplier_name'), None)
+        self.assertEqual(rows[1].get('supplier_name'), 'TestCia')
+        self.assertEqual(rows[1].get('current_price'), 200)
+        self.assertEqual(rows[1].get('tags'), ['bestseller', 'science'])
+        self.assertEqual(rows[2].get('tags'), [])
+
+    def test_if_export_streams_every_product_as_csv(self):
+        """
+        Tests if the catalog export streams a CSV with a header and one row per product, tags joined by |
+        """
+
+        self.__authenticate()
+
+        response, content = self.__export(type='csv')
+        rows = list(csv.DictReader(io.StringIO(content)))
+
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertEqual(len(rows), len(self.products))
+        self.assertEqual(rows[1].get('tags'), 'bestseller|science')
+        self.assertEqual(rows[1].get('description'), 'Descrição, com "aspas"')
+        self.assertEqual(rows[3].get('current_price'), '400')
+
+    def test_if_export_reads_the_tags_once_per_chunk(self):
+        """
+        Tests if the catalog export runs one query for the products and one per chunk for their tags
+        """
+
+        with CaptureQueriesContext(connection) as context:
+            rows = list(CatalogExport.rows(chunk_size=2))
+
+        self.assertEqual(len(rows), len(self.products))
+        self.assertEqual(len(context), 1 + 3)
+
+    def test_if_export_refuses_unknown_types(self):
+        """
+        Tests if the catalog export returns bad request for an unknown file type
+        """
+
+        self.__authenticate()
+
+        response = self.client.get(self.export_url, data={'type': 'xml'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_if_export_requires_authentication(self):
+        """
+        Tests if anonymous users cannot export the catalog
+        """
+
+        response = self.client.get(self.export_url)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,173 @@
+from django.core.management import call_command
+from rest_framework import test
+from rest_framework.reverse import reverse
+
+from io import StringIO
+from unittest import mock
+
+from ..models import Product, Supplier, CoPurchase, CoPurchaseRun
+from ..co_purchases import CoPurchaseMatrix
+
+from authentication.models import Customer
+from cart.models import Sale
+
+
+class CoPurchaseMatrixTests(test.APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        test_supplier_data = {
+            'name': 'TestCia',
+            'address': 'TestStreet',
+            'phone': '99999999999'
+        }
+        supplier: Supplier = Supplier.objects.create(**test_supplier_data)
+
+        cls.customer: Customer = Customer.objects.create_user(username='John', password='john')
+
+        cls.first, cls.second, cls.third = [
+            Product.objects.create(
+                name=f'Test Product {index}',
+                description='Test description',
+                category=Product.Category.SCIENCE,
+                supplier=supplier
+            )
+            for index in range(3)
+        ]
+
+    def __sell(self, *products, **fields):
+        sale: Sale = Sale.objects.create(
+            customer=self.customer,
+            total=0,
+            delivery_address='Test Street',
+            payment_method=Sale.Payment.PIX,
+            **fields
+        )
+        sale.products.add(*products)
+
+    def test_if_update_counts_every_pair_of_each_sale_in_both_directions(self):
+        """
+        Tests if update counts how many sales contain each pair of products, from both products' side
+        """
+
+        self.__sell(self.first, self.second, self.third)
+        self.__sell(self.first, self.second)
+
+        run, product_ids = CoPurchaseMatrix.update(chunk_size=2)
+
+        self.assertEqual(run.sales, 2)
+        self.assertSetEqual(product_ids, {self.first.id, self.second.id, self.third.id})
+        self.assertDictEqual(CoPurchaseMatrix.partners(self.first.id), {self.second.id: 2, self.third.id: 1})
+        self.assertDictEqual(CoPurchaseMatrix.partners(self.third.id), {self.first.id: 1, self.second.id: 1})
+
+    def test_if_update_only_counts_the_sales_made_since_the_last_run(self):
+        """
+        Tests if a second update adds the new sales to the existing counts without recounting the old ones
+        """
+
+        self.__sell(self.first, self.second)
+        CoPurchaseMatrix.update()
+        runs = CoPurchaseRun.objects.count()
+
+        self.__sell(self.first, self.second)
+        run, product_ids = CoPurchaseMatrix.update()
+
+        self.assertEqual(run.sales, 1)
+        self.assertEqual(CoPurchaseRun.objects.count(), runs + 1)
+        self.assertDictEqual(CoPurchaseMatrix.partners(self.first.id), {self.second.id: 2})
+
+        run, product_ids = CoPurchaseMatrix.update()
+
+        self.assertIsNone(run)
+        self.assertSetEqual(product_ids, set())
+
+    def test_if_sales_committed_late_are_counted_once(self):
+        """
+        Tests if a sale committed after a run, with an id lower than the sales that run counted, is counted
+        by the next run, and no sale is counted twice
+        """
+
+        self.__sell(self.first, self.second, id=10)
+        CoPurchaseMatrix.update()
+
+        self.__sell(self.first, self.second, id=5)
+        run, _ = CoPurchaseMatrix.update()
+
+        self.assertEqual(run.sales, 1)
+        self.assertIsNone(CoPurchaseMatrix.update()[0])
+        self.assertDictEqual(CoPurchaseMatrix.partners(self.first.id), {self.second.id: 2})
+
+    def test_if_a_failed_update_keeps_the_chunks_it_counted(self):
+        """
+        Tests if a run failing on a chunk keeps the chunks committed before it, and the next run counts the rest once
+        """
+
+        self.__sell(self.first, self.second)
+        self.__sell(self.first, self.third)
+
+        trim = mock.Mock(side_effect=[None, RuntimeError])
+        with mock.patch.object(CoPurchaseMatrix, '_CoPurchaseMatrix__trim', trim):
+            with self.assertRaises(RuntimeError):
+                CoPurchaseMatrix.update(chunk_size=1)
+
+        self.assertDictEqual(CoPurchaseMatrix.partners(self.first.id), {self.second.id: 1})
+
+        run, _ = CoPurchaseMatrix.update(chunk_size=1)
+
+        self.assertEqual(run.sales, 1)
+        self.assertDictEqual(CoPurchaseMatrix.partners(self.first.id), {self.second.id: 1, self.third.id: 1})
+
+    @mock.patch('products.co_purchases.PARTNERS_PER_PRODUCT', 1)
+    def test_if_update_keeps_the_most_bought_partners_of_each_product(self):
+        """
+        Tests if only the partners bought most often with each product are kept
+        """
+
+        self.__sell(self.first, self.second, self.third)
+        self.__sell(self.first, self.third)
+
+        CoPurchaseMatrix.update()
+
+        self.assertDictEqual(CoPurchaseMatrix.partners(self.first.id), {self.third.id: 2})
+        self.assertDictEqual(CoPurchaseMatrix.partners(self.second.id), {self.first.id: 1})
+        self.assertDictEqual(CoPurchaseMatrix.partners(self.third.id), {self.first.id: 2})
+
+    def test_if_full_update_recounts_every_sale(self):
+        """
+        Tests if a full update rebuilds the matrix from scratch instead of adding to it
+        """
+
+        self.__sell(self.first, self.second)
+        CoPurchaseMatrix.update()
+        CoPurchaseMatrix.update(full=True)
+
+        self.assertEqual(CoPurchase.objects.get(product=self.first, other=self.second).count, 1)
+
+    def test_if_command_builds_the_matrix(self):
+        """
+        Tests if build_co_purchases command updates the matrix and reports it
+        """
+
+        self.__sell(self.first, self.second)
+        out = StringIO()
+
+        call_command('build_co_purchases', stdout=out)
+
+        self.assertIn('Counted 1 sales', out.getvalue())
+        self.assertTrue(CoPurchase.objects.filter(product=self.first, other=self.second).exists())
+
+    def test_if_also_bought_lists_the_most_co_purchased_products_first(self):
+        """
+        Tests if also bought endpoint lists the products most often bought with a product first
+        """
+
+        self.__sell(self.first, self.second, self.third)
+        self.__sell(self.first, self.third)
+        CoPurchaseMatrix.update()
+
+        response = self.client.get(reverse('also_bought_products', args=[self.first.id]))
+
+        self.assertListEqual(
+            [product.get('id') for product in response.data.get('products')],
+            [self.third.id, self.second.id]
+        )
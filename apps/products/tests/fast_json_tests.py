@@ -0,0 +1,106 @@
+import io
+
+from rest_framework import test
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from unittest import skipIf
+from unittest.mock import patch
+
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from uuid import UUID
+
+from core import parsers, renderers
+from core.parsers import FastJSONParser
+from core.renderers import FastJSONRenderer
+from ..models import Product
+
+
+class FastJSONTests(test.APITestCase):
+
+    payload = {
+        'start': date(2024, 1, 31),
+        'updated': datetime(2024, 1, 31, 12, 30, 15, 123456, tzinfo=timezone.utc),
+        'total': Decimal('10.50'),
+        'category': Product.Category.FICTION.label,
+        'choice': Product.Category.FICTION,
+        'id': UUID('12345678-1234-5678-1234-567812345678'),
+        'name': 'Café Gourmet',
+        'counts': {1: 2},
+        'tags': ('science', 'fiction'),
+        'empty': None,
+    }
+
+    def test_if_rendered_json_is_the_same_as_the_standard_renderer(self):
+        """
+        Tests if dates, decimals, lazy translations, unicode and separators are rendered byte by byte
+        as the standard renderer does
+        """
+
+        self.assertEqual(FastJSONRenderer().render(self.payload), JSONRenderer().render(self.payload))
+
+    @skipIf(renderers.orjson is None, 'orjson is not installed')
+    def test_if_orjson_encodes_the_payload(self):
+        """
+        Tests if the renderer encodes with orjson when it is installed
+        """
+
+        with patch('core.renderers.orjson.dumps', wraps=renderers.orjson.dumps) as dumps:
+            FastJSONRenderer().render(self.payload)
+
+        dumps.assert_called_once()
+
+    def test_if_renderer_falls_back_without_orjson(self):
+        """
+        Tests if the renderer uses the standard library encoder when orjson is not installed
+        """
+
+        with patch('core.renderers.orjson', None):
+            content = FastJSONRenderer().render(self.payload)
+
+        self.assertEqual(content, JSONRenderer().render(self.payload))
+
+    def test_if_indented_json_is_rendered_by_the_standard_renderer(self):
+        """
+        Tests if a request for indented JSON is rendered as the standard renderer does
+        """
+
+        media_type = 'application/json; indent=4'
+
+        self.assertEqual(FastJSONRenderer().render(self.payload, media_type),
+                         JSONRenderer().render(self.payload, media_type))
+
+    def test_if_parsed_json_is_the_same_as_the_standard_parser(self):
+        """
+        Tests if request bodies are parsed as the standard parser does, with or without orjson
+        """
+
+        content = '{"name": "Café", "products": [1, 2], "price": 10.5, "big": 123456789012345678901234567890}'
+
+        expected = JSONParser().parse(io.BytesIO(content.encode()))
+
+        self.assertEqual(FastJSONParser().parse(io.BytesIO(content.encode())), expected)
+
+        with patch('core.parsers.orjson', None):
+            self.assertEqual(FastJSONParser().parse(io.BytesIO(content.encode())), expected)
+
+    def test_if_invalid_json_raises_a_parse_error(self):
+        """
+        Tests if invalid bodies and NaN constants are refused as by the standard parser
+        """
+
+        for content in (b'{"name": ', b'{"price": NaN}'):
+            with self.assertRaises(ParseError):
+                FastJSONParser().parse(io.BytesIO(content))
+
+    def test_if_api_responses_are_rendered_with_the_fast_renderer(self):
+        """
+        Tests if the API renders JSON responses with the configured fast renderer
+        """
+
+        response = self.client.get('/api/products/')
+
+        self.assertIsInstance(response.accepted_renderer, FastJSONRenderer)
+        self.assertIs(parsers.orjson, renderers.orjson)
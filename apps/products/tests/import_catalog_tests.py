@@ -0,0 +1,175 @@
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+import json
+import tempfile
+
+from io import StringIO
+from pathlib import Path
+
+from unittest import mock
+
+from ..models import Product, Supplier, Tag, PriceHistory, Recommendation
+from ..exports import CatalogExport
+from ..imports import CatalogImport
+from ..utils import SkuUtils
+
+
+class ImportCatalogTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.supplier: Supplier = Supplier.objects.create(name='TestCia', address='TestStreet', phone='99999999999')
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+
+        self.directory = Path(directory.name)
+
+    def __write(self, name: str, content: str) -> Path:
+        path = self.directory / name
+        path.write_text(content, encoding='utf-8')
+
+        return path
+
+    def __import(self, path: Path, **options) -> tuple[str, str]:
+        out, err = StringIO(), StringIO()
+        call_command('import_catalog', str(path), stdout=out, stderr=err, **options)
+
+        return out.getvalue(), err.getvalue()
+
+    def test_if_ndjson_rows_are_imported_with_price_and_tags(self):
+        """
+        Tests if each NDJSON row creates a product with its SKU, current price, open price history and tags
+        """
+
+        rows = [
+            {'name': f'Test Product {index}', 'description': 'Test description', 'category': 1,
+             'supplier_name': 'TestCia', 'price': 100 * (index + 1), 'tags': [f'tag{index}']}
+            for index in range(3)
+        ]
+        path = self.__write('catalog.ndjson', ''.join(json.dumps(row) + '\n' for row in rows))
+
+        out, _err = self.__import(path, batch_size=2)
+
+        self.assertIn('Imported 3 products (0 skipped)', out)
+        self.assertIn('rows/s', out)
+
+        product: Product = Product.objects.get(name='Test Product 1')
+        self.assertEqual(product.supplier, self.supplier)
+        self.assertEqual(product.sku, SkuUtils.generate_sku('TestCia', 'Test Product 1', 1))
+        self.assertEqual(product.current_price, 200)
+        self.assertEqual(PriceHistory.objects.get(product=product, end__isnull=True).price, 200)
+        self.assertEqual(list(Tag.objects.filter(product=product).values_list('name', flat=True)), ['tag1'])
+
+    def test_if_invalid_rows_are_skipped(self):
+        """
+        Tests if rows with an unknown supplier, invalid category or missing price are reported and skipped
+        """
+
+        path = self.__write('catalog.csv', '\n'.join([
+            'name,description,category,supplier_name,price,tags',
+            'Valid Product,Desc,2,TestCia,100,a|b',
+            'Unknown Supplier,Desc,2,OtherCia,100,',
+            'Invalid Category,Desc,9,TestCia,100,',
+            'Missing Price,Desc,2,TestCia,,',
+        ]))
+
+        out, err = self.__import(path)
+
+        self.assertIn('Imported 1 products (3 skipped)', out)
+        self.assertIn('Skipped row 2', err)
+        self.assertIn('Skipped row 3', err)
+        self.assertIn('Skipped row 4', err)
+        self.assertEqual(list(Product.objects.values_list('name', flat=True)), ['Valid Product'])
+        self.assertEqual(Tag.objects.count(), 2)
+
+    @mock.patch('products.imports.SKIPPED_ROWS_KEPT', 1)
+    def test_if_only_the_first_skipped_rows_are_reported(self):
+        """
+        Tests if every skipped row is counted while only the first ones are kept for the report
+        """
+
+        path = self.__write('catalog.csv', '\n'.join([
+            'name,description,category,supplier_name,price,tags',
+            'Unknown Supplier,Desc,2,OtherCia,100,',
+            'Invalid Category,Desc,9,TestCia,100,',
+        ]))
+
+        out, err = self.__import(path)
+
+        self.assertIn('Imported 0 products (2 skipped)', out)
+        self.assertIn('Skipped row 1', err)
+        self.assertNotIn('Skipped row 2', err)
+
+    def test_if_recommendations_are_only_rebuilt_on_request(self):
+        """
+        Tests if the imported products get their recommendation lists only with --rebuild-recommendations
+        """
+
+        path = self.__write('catalog.csv', '\n'.join([
+            'name,description,category,supplier_name,price,tags',
+            'First Product,Desc,2,TestCia,100,',
+            'Second Product,Desc,2,TestCia,100,',
+        ]))
+
+        self.__import(path)
+
+        self.assertFalse(Recommendation.objects.exists())
+
+        out, _err = self.__import(path, rebuild_recommendations=True, batch_size=1)
+
+        self.assertIn('Rebuilt recommendations of 4 products', out)
+        self.assertFalse(Product.objects.filter(recommendations_built=False).exists())
+        self.assertTrue(Recommendation.objects.exists())
+
+    def test_if_an_exported_catalog_can_be_imported(self):
+        """
+        Tests if a CSV file written by the catalog export is imported back
+        """
+
+        product: Product = Product.objects.create(
+            name='Exported Product',
+            description='Descrição, com "aspas"',
+            sku='T1-EP',
+            category=Product.Category.SCIENCE,
+            supplier=self.supplier
+        )
+        PriceHistory.objects.create(product=product, price=300)
+        Tag.objects.create(name='exported', product=product)
+
+        path = self.__write('catalog.csv', ''.join(CatalogExport.stream('csv')))
+        Tag.objects.all().delete()
+        Product.objects.all().delete()
+
+        self.__import(path)
+
+        imported: Product = Product.objects.get()
+        self.assertEqual(imported.description, 'Descrição, com "aspas"')
+        self.assertEqual(imported.current_price, 300)
+        self.assertEqual(list(Tag.objects.values_list('name', flat=True)), ['exported'])
+
+    def test_if_parallel_parsing_keeps_the_batch_order(self):
+        """
+        Tests if batches parsed by several processes come back in the order they were read
+        """
+
+        lines = [json.dumps({'name': f'Product {index}', 'category': 1, 'supplier_name': 'TestCia', 'price': index})
+                 for index in range(20)]
+        batches = CatalogImport.read(iter(lines), 'ndjson', batch_size=3)
+
+        parsed = [row.get('name') for rows, _errors in CatalogImport.parse_all(batches, workers=2) for row in rows]
+
+        self.assertEqual(parsed, [f'Product {index}' for index in range(20)])
+
+    def test_if_unknown_file_types_are_refused(self):
+        """
+        Tests if a file whose type cannot be guessed is refused
+        """
+
+        path = self.__write('catalog.xml', '<catalog/>')
+
+        with self.assertRaises(CommandError):
+            self.__import(path)
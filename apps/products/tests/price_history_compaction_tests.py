@@ -0,0 +1,135 @@
+from django.core.management import call_command
+from unittest import mock
+from rest_framework import test
+
+from datetime import date, timedelta
+from io import StringIO
+
+from ..models import Product, Supplier, PriceHistory, ArchivedPriceHistory
+from ..compaction import PriceHistoryCompaction
+from ..prices import PriceResolver
+
+
+class PriceHistoryCompactionTests(test.APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        supplier: Supplier = Supplier.objects.create(name='TestCia', address='TestStreet', phone='99999999999')
+
+        cls.first, cls.second = [
+            Product.objects.create(
+                name=f'Test Product {index}',
+                description='Test description',
+                sku=f'T-TP{index}',
+                category=Product.Category.SCIENCE,
+                supplier=supplier
+            )
+            for index in range(2)
+        ]
+
+    @staticmethod
+    def __set_history(product: Product, prices: list[tuple[date, int]]):
+        """
+        Creates the intervals of the product, each one closed when the next starts and the last one open
+        """
+
+        histories = PriceHistory.objects.bulk_create(
+            PriceHistory(product=product, price=price, end=next_start)
+            for (_, price), (next_start, _) in zip(prices, prices[1:] + [(None, None)])
+        )
+        for history, (start, _) in zip(histories, prices):
+            PriceHistory.objects.filter(pk=history.id).update(start=start)
+
+    def __prices(self, since: date, days: int) -> dict:
+        return PriceResolver.resolve((product.id, since + timedelta(days=day))
+                                     for product in (self.first, self.second)
+                                     for day in range(days))
+
+    def test_if_compact_merges_redundant_intervals_keeping_every_price(self):
+        """
+        Tests if compaction drops the intervals superseded on their first day and merges runs of the same price,
+        while the price of each product on every day stays the same
+        """
+
+        self.__set_history(self.first, [(date(2024, 1, 1), 100),
+                                        (date(2024, 1, 10), 100),
+                                        (date(2024, 1, 20), 120),
+                                        (date(2024, 1, 20), 90),
+                                        (date(2024, 1, 20), 100),
+                                        (date(2024, 2, 1), 110)])
+        self.__set_history(self.second, [(date(2024, 1, 5), 50), (date(2024, 1, 15), 60)])
+
+        prices = self.__prices(date(2023, 12, 31), 40)
+
+        removed = PriceHistoryCompaction.compact(chunk_size=1, batch_size=2)
+
+        self.assertEqual(removed, 4)
+        self.assertEqual(list(PriceHistory.objects.filter(product=self.first).values_list('start', 'price', 'end')),
+                         [(date(2024, 1, 1), 100, date(2024, 2, 1)), (date(2024, 2, 1), 110, None)])
+        self.assertEqual(PriceHistory.objects.filter(product=self.second).count(), 2)
+        self.assertEqual(self.__prices(date(2023, 12, 31), 40), prices)
+
+        self.assertEqual(PriceHistoryCompaction.compact(), 0)
+
+    def test_if_compact_reads_the_intervals_once_their_products_are_locked(self):
+        """
+        Tests if an interval deleted while the compaction waits for the lock of its product is not merged,
+        so the interval it reopened is kept
+        """
+
+        self.__set_history(self.first, [(date(2024, 1, 1), 100), (date(2024, 1, 10), 100)])
+        reopened, deleted = PriceHistory.objects.filter(product=self.first).order_by('start')
+
+        lock_products = PriceHistoryCompaction._PriceHistoryCompaction__lock_products
+
+        def delete_then_lock(product_ids):
+            deleted.delete()
+            lock_products(product_ids)
+
+        with mock.patch.object(PriceHistoryCompaction, '_PriceHistoryCompaction__lock_products', delete_then_lock):
+            self.assertEqual(PriceHistoryCompaction.compact(), 0)
+
+        self.assertEqual(list(PriceHistory.objects.filter(product=self.first).values_list('id', 'end')),
+                         [(reopened.id, None)])
+        self.assertEqual(Product.objects.get(pk=self.first.id).current_price, 100)
+
+    def test_if_archive_moves_old_closed_intervals_out_of_the_price_history(self):
+        """
+        Tests if intervals closed before the retention window are moved to the archive, the open ones never,
+        and prices as of their dates are still resolved
+        """
+
+        today = date.today()
+        self.__set_history(self.first, [(today - timedelta(days=100), 100),
+                                        (today - timedelta(days=50), 120),
+                                        (today - timedelta(days=10), 130)])
+        self.__set_history(self.second, [(today - timedelta(days=100), 50)])
+
+        prices = self.__prices(today - timedelta(days=101), 102)
+
+        archived = PriceHistoryCompaction.archive(retention_days=30, chunk_size=1)
+
+        self.assertEqual(archived, 1)
+        self.assertEqual(list(ArchivedPriceHistory.objects.values_list('product', 'price')), [(self.first.id, 100)])
+        self.assertEqual(list(PriceHistory.objects.order_by('product', 'start').values_list('product', 'price')),
+                         [(self.first.id, 120), (self.first.id, 130), (self.second.id, 50)])
+        self.assertEqual(self.__prices(today - timedelta(days=101), 102), prices)
+
+    def test_if_command_compacts_then_archives(self):
+        """
+        Tests if the command reports the removed and archived intervals
+        """
+
+        today = date.today()
+        self.__set_history(self.first, [(today - timedelta(days=400), 100),
+                                        (today - timedelta(days=390), 100),
+                                        (today - timedelta(days=380), 110),
+                                        (today - timedelta(days=5), 120)])
+
+        output = StringIO()
+        call_command('compact_price_history', '--retention-days', '30', stdout=output)
+
+        self.assertIn('Removed 1 redundant and archived 1 old price histories', output.getvalue())
+        self.assertEqual(list(ArchivedPriceHistory.objects.values_list('start', 'end')),
+                         [(today - timedelta(days=400), today - timedelta(days=380))])
+        self.assertEqual(PriceHistory.objects.count(), 2)
@@ -103,3 +103,87 @@ class PriceHistorySerializerTests(test.APITestCase):
         }
 
         self.assertDictEqual(expected_json, serializer.data)
+
+    def test_if_a_new_price_history_becomes_the_product_current_price(self):
+        """
+        Tests if a new price history updates the product's current price and keeps a single open interval
+        """
+
+        self.__create_price_history_instance(self.test_data)
+        instance: PriceHistory = self.__create_price_history_instance(self.new_history_test_data)
+
+        product: Product = Product.objects.get(pk=instance.product.id)
+        open_histories = PriceHistory.objects.filter(product=product, end__isnull=True)
+
+        self.assertEqual(product.current_price, self.new_history_test_data.get('price'))
+        self.assertEqual(open_histories.count(), 1)
+        self.assertEqual(open_histories.first().id, instance.id)
+
+    def test_if_deleting_the_current_price_history_reopens_the_previous_one(self):
+        """
+        Tests if deleting the open price history reopens the previous one as the product's current price
+        """
+
+        previous: PriceHistory = self.__create_price_history_instance(self.test_data)
+        instance: PriceHistory = self.__create_price_history_instance(self.new_history_test_data)
+
+        instance.delete()
+
+        previous.refresh_from_db()
+        product: Product = Product.objects.get(pk=previous.product.id)
+
+        self.assertIsNone(previous.end)
+        self.assertEqual(product.current_price, self.test_data.get('price'))
+
+    def test_if_changing_the_current_price_history_updates_the_product_current_price(self):
+        """
+        Tests if editing the price of the open price history updates the product's current price
+        """
+
+        instance: PriceHistory = self.__create_price_history_instance(self.test_data)
+
+        instance.price = 20
+        instance.save()
+
+        product: Product = Product.objects.get(pk=instance.product.id)
+
+        self.assertEqual(product.current_price, 20)
+
+    def test_if_moving_the_current_price_history_refreshes_both_products(self):
+        """
+        Tests if moving the open price history to another product makes it that product's only open interval,
+        and reopens the previous interval of the product it was moved from
+        """
+
+        previous: PriceHistory = self.__create_price_history_instance(self.test_data)
+        instance: PriceHistory = self.__create_price_history_instance(self.new_history_test_data)
+
+        other: Product = Product.objects.create(name='Other Product', description='Test Description', category=2,
+                                                supplier=instance.product.supplier)
+        replaced: PriceHistory = self.__create_price_history_instance({'product': other.id, 'price': 30})
+
+        instance.product = other
+        instance.save()
+
+        previous.refresh_from_db()
+        replaced.refresh_from_db()
+
+        self.assertIsNone(previous.end)
+        self.assertIsNotNone(replaced.end)
+        self.assertEqual(list(PriceHistory.objects.filter(product=other, end__isnull=True)), [instance])
+        self.assertEqual(Product.objects.get(pk=previous.product.id).current_price, self.test_data.get('price'))
+        self.assertEqual(Product.objects.get(pk=other.id).current_price, self.new_history_test_data.get('price'))
+
+    def test_if_a_new_closed_price_history_keeps_the_product_current_price(self):
+        """
+        Tests if creating an already closed price history leaves the open interval and the current price as they are
+        """
+
+        current: PriceHistory = self.__create_price_history_instance(self.test_data)
+        self.__create_price_history_instance({**self.new_history_test_data, 'end': '2020-01-01'})
+
+        current.refresh_from_db()
+        product: Product = Product.objects.get(pk=current.product.id)
+
+        self.assertIsNone(current.end)
+        self.assertEqual(product.current_price, self.test_data.get('price'))
@@ -7,11 +7,14 @@ from rest_framework import status
 
 from django.utils import timezone
 
+from datetime import date, timedelta
+
 from authentication.models import Customer
 from authentication.serializers import CustomerSerializer
-from ..models import Supplier, Product, PriceHistory
+from ..models import Supplier, Product, PriceHistory, ArchivedPriceHistory
 
 from ..serializers import SupplierSerializer, ProductSerializer, PriceHistorySerializer
+from ..compaction import PriceHistoryCompaction
 
 from oauth2_provider.models import Application, AccessToken
 from rest_framework_simplejwt.tokens import RefreshToken
@@ -225,3 +228,149 @@ class PriceHistoryViewSetTests(test.APITestCase):
 
         self.assertEqual(delete_response.status_code, status.HTTP_204_NO_CONTENT)
         self.assertFalse(price_history.exists())
+
+    def __create_closed_price_histories(self, amount: int):
+        product: Product = Product.objects.get(pk=self.price_history_data.get('product'))
+
+        PriceHistory.objects.bulk_create(
+            PriceHistory(product=product, price=index, end=date.today()) for index in range(amount)
+        )
+        PriceHistory.objects.filter(price__lt=amount // 2).update(start=date.today() - timedelta(days=1))
+
+        return list(PriceHistory.objects.order_by('start', 'id').values_list('id', flat=True))
+
+    def __walk_pages(self, url: str, link: str):
+        pages = []
+        while url is not None:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+            pages.append([price_history.get('id') for price_history in response.data.get('results')])
+            url = response.data.get(link)
+
+        return pages
+
+    def test_if_list_pages_through_every_price_history_once(self):
+        """
+        Tests if following the next and previous cursors goes through every price history once,
+        in order, even though many of them share the same start date
+        """
+
+        ids = self.__create_closed_price_histories(25)
+
+        pages = self.__walk_pages(self.list_url, 'next')
+
+        self.assertEqual([len(page) for page in pages], [10, 10, 6])
+        self.assertEqual(sum(pages, []), ids)
+
+        last_page_url = self.client.get(self.list_url).data.get('next')
+        last_page_url = self.client.get(last_page_url).data.get('next')
+
+        backward_pages = self.__walk_pages(last_page_url, 'previous')
+
+        self.assertEqual(sum(reversed(backward_pages), []), ids)
+
+    def test_if_list_only_counts_on_request(self):
+        """
+        Tests if price history view set list action only counts the price histories when asked to
+        """
+
+        ids = self.__create_closed_price_histories(15)
+
+        response = self.client.get(self.list_url)
+        exact_response = self.client.get(self.list_url, data={'count': 'exact'})
+        approximate_response = self.client.get(self.list_url, data={'count': 'approximate'})
+
+        self.assertIsNone(response.data.get('count'))
+        self.assertEqual(exact_response.data.get('count'), len(ids))
+        self.assertEqual(approximate_response.data.get('count'), len(ids))
+
+    def test_if_list_rejects_an_invalid_cursor(self):
+        """
+        Tests if price history view set list action returns not found for a tampered cursor
+        """
+
+        response = self.client.get(self.list_url, data={'cursor': 'not-a-cursor'})
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def __set_prices(self, product: Product, prices: dict[date, int]):
+        for start, price in prices.items():
+            PriceHistory.objects.create(product=product, price=price)
+            PriceHistory.objects.filter(product=product, end__isnull=True).update(start=start)
+
+    def test_if_list_returns_the_price_in_effect_at_a_date(self):
+        """
+        Tests if price history view set list action filtered by product and date returns the price
+        started last by then, and nothing before the first one
+        """
+
+        product: Product = Product.objects.get(pk=self.price_history_data.get('product'))
+        PriceHistory.objects.filter(product=product).update(start=date(2024, 1, 1))
+        self.__set_prices(product, {date(2024, 3, 1): 150, date(2024, 5, 1): 200})
+
+        def price_at(at: str):
+            response = self.client.get(self.list_url, data={'product': product.id, 'at': at})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+            return [price_history.get('price') for price_history in response.data.get('results')]
+
+        self.assertEqual(price_at('2023-12-31'), [])
+        self.assertEqual(price_at('2024-01-01'), [100])
+        self.assertEqual(price_at('2024-04-30'), [150])
+        self.assertEqual(price_at('2024-05-01'), [200])
+
+    def test_if_list_returns_the_price_of_every_product_at_a_date(self):
+        """
+        Tests if price history view set list action filtered by date only returns a price of each product
+        """
+
+        product: Product = Product.objects.get(pk=self.price_history_data.get('product'))
+        other_product: Product = Product.objects.create(name='Other Product', description='Test description',
+                                                        sku='T-OP', category=Product.Category.SCIENCE,
+                                                        supplier=product.supplier)
+        PriceHistory.objects.filter(product=product).update(start=date(2024, 1, 1))
+        self.__set_prices(other_product, {date(2024, 1, 1): 50, date(2024, 2, 1): 60})
+
+        response = self.client.get(self.list_url, data={'at': '2024-01-15'})
+
+        self.assertEqual([(price_history.get('product'), price_history.get('price'))
+                          for price_history in response.data.get('results')],
+                         [(product.id, 100), (other_product.id, 50)])
+
+    def test_if_list_returns_archived_prices_at_a_date(self):
+        """
+        Tests if price history view set list action filtered by date reads the prices moved to the archive,
+        without an id, and the price histories after them
+        """
+
+        product: Product = Product.objects.get(pk=self.price_history_data.get('product'))
+        PriceHistory.objects.filter(product=product).update(start=date(2020, 1, 1))
+        self.__set_prices(product, {date(2020, 6, 1): 150})
+        PriceHistory.objects.filter(product=product, end__isnull=False).update(end=date(2020, 6, 1))
+
+        PriceHistoryCompaction.archive()
+        self.assertEqual(ArchivedPriceHistory.objects.filter(product=product).count(), 1)
+
+        def prices_at(at: str, **filters):
+            response = self.client.get(self.list_url, data={'at': at, **filters})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+            return [(price_history.get('product'), price_history.get('price'), price_history.get('id') is None)
+                    for price_history in response.data.get('results')]
+
+        self.assertEqual(prices_at('2019-12-31', product=product.id), [])
+        self.assertEqual(prices_at('2020-03-01', product=product.id), [(product.id, 100, True)])
+        self.assertEqual(prices_at('2020-07-01', product=product.id), [(product.id, 150, False)])
+        self.assertEqual(prices_at('2020-03-01'), [(product.id, 100, True)])
+
+    def test_if_list_rejects_invalid_product_and_date_filters(self):
+        """
+        Tests if price history view set list action returns bad request for a malformed product or date
+        """
+
+        product_response = self.client.get(self.list_url, data={'product': 'one'})
+        date_response = self.client.get(self.list_url, data={'at': '15/01/2024'})
+
+        self.assertEqual(product_response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(date_response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,72 @@
+from rest_framework import test
+
+from datetime import date
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from ..models import Product, Supplier, PriceHistory
+from ..prices import PriceResolver
+
+
+class PriceResolverTests(test.APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        supplier: Supplier = Supplier.objects.create(name='TestCia', address='TestStreet', phone='99999999999')
+
+        cls.first, cls.second = [
+            Product.objects.create(
+                name=f'Test Product {index}',
+                description='Test description',
+                sku=f'T-TP{index}',
+                category=Product.Category.SCIENCE,
+                supplier=supplier
+            )
+            for index in range(2)
+        ]
+
+        # The first product changed price twice on the same day, the latest change wins
+        for product, start, price in [(cls.first, date(2024, 1, 1), 100),
+                                      (cls.first, date(2024, 3, 1), 150),
+                                      (cls.first, date(2024, 3, 1), 140),
+                                      (cls.second, date(2024, 2, 1), 70)]:
+            PriceHistory.objects.create(product=product, price=price)
+            PriceHistory.objects.filter(product=product, end__isnull=True).update(start=start)
+
+    @staticmethod
+    def __naive_price(product_id: int, at: date) -> int | None:
+        return (PriceHistory.objects
+                .filter(product__pk=product_id, start__lte=at)
+                .order_by('-start', '-id')
+                .values_list('price', flat=True)
+                .first())
+
+    def test_if_resolve_returns_the_price_in_effect_of_each_pair(self):
+        """
+        Tests if the resolver prices every pair as the per pair lookup does, with none before the first price
+        """
+
+        pairs = [(product.id, at)
+                 for product in (self.first, self.second)
+                 for at in (date(2023, 12, 31), date(2024, 1, 1), date(2024, 2, 15), date(2024, 3, 1))]
+
+        prices = PriceResolver.resolve(pairs)
+
+        self.assertEqual(prices, {pair: self.__naive_price(*pair) for pair in pairs})
+        self.assertEqual(prices[(self.first.id, date(2024, 3, 1))], 140)
+        self.assertIsNone(prices[(self.second.id, date(2024, 1, 1))])
+
+    def test_if_resolve_runs_a_query_per_chunk_of_distinct_pairs(self):
+        """
+        Tests if the resolver looks up repeated pairs once and runs one query per chunk of pairs
+        """
+
+        pairs = [(self.first.id, date(2024, 2, day)) for day in range(1, 6)] * 2
+
+        with CaptureQueriesContext(connection) as queries:
+            prices = PriceResolver.resolve(pairs, chunk_size=2)
+
+        self.assertEqual(len(queries), 3)
+        self.assertEqual(set(prices.values()), {100})
+        self.assertEqual(len(prices), 5)
@@ -7,8 +7,6 @@ from authentication.models import Customer
 from authentication.serializers import CustomerSerializer
 from ..serializers import ProductSerializer, ReviewSerializer
 
-from ..tasks import update_product_average_review
-
 
 class ProductSerializerTests(test.APITestCase):
 
@@ -27,6 +25,7 @@ class ProductSerializerTests(test.APITestCase):
             'sku',
             'category',
             'average_review',
+            'current_price',
             'customers',
             'supplier',
             'price'
@@ -55,7 +54,7 @@ class ProductSerializerTests(test.APITestCase):
     def test_if_product_serializer_have_all_fields(self):
         """
         Tests if product serializer have all fields: (
-            id, name, description, sku, category, average review, customers and supplier
+            id, name, description, sku, category, average review, current price, customers and supplier
         )
         """
 
@@ -129,6 +128,7 @@ class ProductSerializerTests(test.APITestCase):
         json = self.test_data.copy()
         json['sku'] = self.expected_sku
         json['average_review'] = 0.0
+        json['current_price'] = self.test_data.get('price')
         json['customers'] = []
         json['id'] = 1
         del json['price']
@@ -139,10 +139,9 @@ class ProductSerializerTests(test.APITestCase):
 
         self.assertDictEqual(json, serializer.data)
 
-    @patch('products.tasks.serializers.ProductSerializer.update')
-    def test_if_product_serializer_is_updating_average_review(self, serializer_update):
+    def test_if_product_serializer_is_updating_average_review(self):
         """
-        Tests if product serializer is updating the product's average review automatically
+        Tests if the product's average review is updated automatically when a review is created
         """
         product_serializer: ProductSerializer = ProductSerializer(data=self.test_data)
         customer_serializer: CustomerSerializer = CustomerSerializer(data={
@@ -165,17 +164,17 @@ class ProductSerializerTests(test.APITestCase):
         review_serializer.is_valid()
         review_serializer.save()
 
-        update_product_average_review(product.id)
-        serializer_update.assert_called_with(product, {'average_review': 4.0})
+        product.refresh_from_db()
+        self.assertEqual(product.average_review, 4.0)
 
-    @patch('products.tasks.serializers.ProductSerializer.update')
+    @patch('products.serializers.product_serializer.update_product_sku.delay')
     def test_if_product_serializer_is_updating_average_review_when_a_review_value_is_updated(
             self,
-            serializer_update
+            update_product_sku
     ):
         """
-        Tests if product serializer is updating the product's average review automatically
-        when a review value is updated
+        Tests if the product's average review is updated automatically when a review value is updated,
+        without regenerating the product's SKU
         """
 
         product_serializer: ProductSerializer = ProductSerializer(data=self.test_data)
@@ -199,10 +198,11 @@ class ProductSerializerTests(test.APITestCase):
         review_serializer.is_valid()
         review: Review = review_serializer.save()
 
-        update_product_average_review(product.id)
-        serializer_update.assert_called_with(product, {'average_review': 4.0})
+        product.refresh_from_db()
+        self.assertEqual(product.average_review, 4.0)
 
         review_serializer.update(review, {'value': 3.0})
 
-        update_product_average_review(product.id)
-        serializer_update.assert_called_with(product, {'average_review': 3.0})
+        product.refresh_from_db()
+        self.assertEqual(product.average_review, 3.0)
+        update_product_sku.assert_not_called()
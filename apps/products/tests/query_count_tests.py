@@ -0,0 +1,130 @@
+from rest_framework import test
+from rest_framework.test import APIClient
+
+from rest_framework.reverse import reverse
+
+from rest_framework import status
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from authentication.models import Customer
+from ..models import Product, Supplier, Tag, PriceHistory, Review, Recommendation, CoPurchase
+
+DUMMY_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+}
+
+
+@override_settings(CACHES=DUMMY_CACHES, CACHE_TAGS_ALIAS='default')
+class QueryCountTests(test.APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.client: APIClient = APIClient()
+
+        cls.customers = [
+            Customer.objects.create(username=f'testuser{index}', email=f'test{index}@test.dev')
+            for index in range(3)
+        ]
+
+        cls.supplier: Supplier = Supplier.objects.create(name='TestCia', address='TestStreet', phone='99999999999')
+        cls.main_product: Product = cls.__create_product(cls.supplier)
+
+    @staticmethod
+    def __create_product(supplier: Supplier):
+        product: Product = Product.objects.create(
+            name='Test Product',
+            description='Test description',
+            sku='T1-TP',
+            category=Product.Category.SCIENCE,
+            supplier=supplier
+        )
+        PriceHistory.objects.create(product=product, price=100)
+
+        return product
+
+    def __add_products(self, amount: int):
+        """
+        Adds products with a price, a tag, reviews and a ranking entry of the main product each
+        """
+
+        for _ in range(amount):
+            index = Supplier.objects.count()
+            supplier: Supplier = Supplier.objects.create(name=f'Cia {index}', address='Street', phone=f'{index:011d}')
+            product: Product = self.__create_product(supplier)
+
+            Tag.objects.create(name=f'tag{product.id}', product=product)
+            for customer in self.customers:
+                Review.objects.create(product=product, customer=customer, value=5)
+
+            Recommendation.objects.create(product=self.main_product, recommended=product, score=product.id)
+            CoPurchase.objects.create(product=self.main_product, other=product, count=product.id)
+
+    def __get_page(self, url: str, results: str):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        return len(context.captured_queries), len(response.data.get(results))
+
+    def __assert_constant_queries(self, url: str, results: str = 'results'):
+        self.__add_products(1)
+        queries, size = self.__get_page(url, results)
+
+        self.__add_products(5)
+        more_queries, more_size = self.__get_page(url, results)
+
+        self.assertGreater(more_size, size)
+        self.assertEqual(more_queries, queries)
+
+    def test_if_product_list_queries_do_not_grow_with_the_page(self):
+        """
+        Tests if product view set list action fetches the reviewing customers of the whole page at once
+        """
+
+        self.__assert_constant_queries(reverse('product-list'))
+
+    def test_if_supplier_list_queries_do_not_grow_with_the_page(self):
+        """
+        Tests if supplier view set list action runs the same queries for any page size
+        """
+
+        self.__assert_constant_queries(reverse('supplier-list'))
+
+    def test_if_tag_list_queries_do_not_grow_with_the_page(self):
+        """
+        Tests if tag view set list action runs the same queries for any page size
+        """
+
+        self.__assert_constant_queries(reverse('tag-list'))
+
+    def test_if_price_list_queries_do_not_grow_with_the_page(self):
+        """
+        Tests if price history view set list action runs the same queries for any page size
+        """
+
+        self.__assert_constant_queries(reverse('price-list'))
+
+    def test_if_review_list_queries_do_not_grow_with_the_page(self):
+        """
+        Tests if review view set list action runs the same queries for any page size
+        """
+
+        self.__assert_constant_queries(reverse('review-list'))
+
+    def test_if_related_products_queries_do_not_grow_with_the_page(self):
+        """
+        Tests if the related products of a product are listed with the same queries for any page size
+        """
+
+        self.__assert_constant_queries(reverse('related_products', args=[self.main_product.id]), 'products')
+
+    def test_if_also_bought_products_queries_do_not_grow_with_the_page(self):
+        """
+        Tests if the products bought along with a product are listed with the same queries for any page size
+        """
+
+        self.__assert_constant_queries(reverse('also_bought_products', args=[self.main_product.id]), 'products')
@@ -0,0 +1,98 @@
+from rest_framework import test
+
+from datetime import date, timedelta
+
+from authentication.models import Customer
+from core.testing import QueryPlanTestMixin
+
+from ..models import Product, Supplier, Tag, PriceHistory, Review
+from ..compaction import PriceHistoryCompaction
+from ..exports import CatalogExport
+from ..prices import PriceResolver
+from ..recommendations import RecommendationEngine
+from ..tasks import update_product_average_review
+
+PRODUCTS = 300
+
+
+class QueryPlanTests(QueryPlanTestMixin, test.APITestCase):
+
+    sequential_scan_threshold = PRODUCTS
+
+    @classmethod
+    def setUpTestData(cls):
+        supplier: Supplier = Supplier.objects.create(name='TestCia', address='TestStreet', phone='99999999999')
+        customers = [
+            Customer.objects.create(username=f'testuser{index}', email=f'test{index}@test.dev')
+            for index in range(2)
+        ]
+
+        cls.products = Product.objects.bulk_create(
+            Product(name=f'Test Product {index}', description='Test description', sku=f'T-TP{index}',
+                    category=index % 4 + 1, average_review=index % 5, supplier=supplier)
+            for index in range(PRODUCTS)
+        )
+
+        Tag.objects.bulk_create(Tag(name=f'tag{product.id}', product=product) for product in cls.products)
+        Review.objects.bulk_create(
+            Review(product=product, customer=customer, value=index % 5)
+            for index, product in enumerate(cls.products)
+            for customer in customers
+        )
+
+        # An old price and the current one of each product
+        PriceHistory.objects.bulk_create(
+            PriceHistory(product=product, price=price, end=end)
+            for product in cls.products
+            for price, end in [(100, date(2024, 2, 1)), (120, None)]
+        )
+        PriceHistory.objects.filter(price=100).update(start=date(2024, 1, 1))
+        PriceHistory.objects.filter(price=120).update(start=date(2024, 2, 1))
+
+    def test_if_recommendations_are_built_from_indexes(self):
+        """
+        Tests if rebuilding and offering recommendations reads the best reviewed products of a category by index
+        """
+
+        with self.assertNoSequentialScans():
+            RecommendationEngine.rebuild([self.products[0].id])
+            RecommendationEngine.offer(self.products[1].id)
+
+    def test_if_review_aggregates_are_recomputed_from_indexes(self):
+        """
+        Tests if the review aggregates of a product are recomputed from its reviews only
+        """
+
+        with self.assertNoSequentialScans():
+            update_product_average_review(self.products[0].id)
+
+    def test_if_prices_are_looked_up_from_indexes(self):
+        """
+        Tests if a new price, the price as of a date and the archival read only the intervals they need
+        """
+
+        with self.assertNoSequentialScans():
+            PriceHistory.objects.create(product=self.products[0], price=130)
+            PriceResolver.resolve((product.id, date(2024, 1, 15)) for product in self.products[:10])
+            PriceHistoryCompaction.archive(retention_days=(date.today() - date(2024, 1, 1)).days)
+
+    def test_if_catalog_export_reads_the_tags_of_each_chunk_from_indexes(self):
+        """
+        Tests if the catalog export scans the products only, reading the tags of each chunk by index
+        """
+
+        with self.assertNoSequentialScans(full_scans=[Product]):
+            list(CatalogExport.rows(chunk_size=100))
+
+    def test_if_a_sequential_scan_fails_the_test(self):
+        """
+        Tests if the mixin fails a test scanning a table above the threshold, and allows it on smaller tables
+        """
+
+        # No index covers the description, nor the order of the rows, so no backend can avoid the scan
+        with self.assertRaises(self.failureException):
+            with self.assertNoSequentialScans():
+                list(Product.objects.order_by().filter(description__contains='Test'))
+
+        with self.assertNoSequentialScans():
+            list(Supplier.objects.filter(phone='99999999999'))
@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 from rest_framework import test
 from rest_framework.test import APIClient
 
@@ -5,6 +7,7 @@ from rest_framework.reverse import reverse
 
 from ..models import Product, Supplier
 from ..serializers import ProductSerializer
+from ..tasks import rebuild_product_recommendations
 
 
 class RecommendationAlgorithmViewSetTests(test.APITestCase):
@@ -59,6 +62,19 @@ class RecommendationAlgorithmViewSetTests(test.APITestCase):
 
         return instance
 
+    @patch('products.tasks.rebuild_product_recommendations.apply_async')
+    def __get_built(self, url, apply_async):
+        """
+        Requests the recommendations once to dispatch their build, runs it, and requests them again
+        """
+
+        apply_async.side_effect = lambda args, countdown: rebuild_product_recommendations(*args)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.get(url)
+
+        return self.client.get(url)
+
     def test_if_recommendation_algorithm_recommends_the_second_science_product_except_the_first(self):
         """
         Tests if recommendation algorithm recommends the second science product except the first (the main product)
@@ -68,7 +84,7 @@ class RecommendationAlgorithmViewSetTests(test.APITestCase):
         second: Product = self.__generate_product(self.second_product)
         url = reverse('related_products', args=[main_product.id])
 
-        response = self.client.get(url)
+        response = self.__get_built(url)
 
         self.assertIn('products', response.data)
         self.assertEqual(len(response.data.get('products')), 1)
@@ -88,3 +104,52 @@ class RecommendationAlgorithmViewSetTests(test.APITestCase):
 
         self.assertIn('products', response.data)
         self.assertEqual(len(response.data.get('products')), 0)
+
+    def test_if_recommendation_algorithm_is_paginated(self):
+        """
+        Tests if recommendation algorithm returns a paginated list of products
+        """
+
+        main_product: Product = self.__generate_product(self.first_product)
+        self.__generate_product(self.second_product)
+        url = reverse('related_products', args=[main_product.id])
+
+        response = self.__get_built(url)
+
+        self.assertIn('count', response.data)
+        self.assertIn('next', response.data)
+        self.assertIn('previous', response.data)
+        self.assertEqual(response.data.get('count'), 1)
+
+    @patch('products.tasks.rebuild_product_recommendations.apply_async')
+    def test_if_unbuilt_recommendations_are_built_in_the_background(self, apply_async):
+        """
+        Tests if requesting recommendations never built dispatches their build and lists them empty meanwhile
+        """
+
+        main_product: Product = self.__generate_product(self.first_product)
+        self.__generate_product(self.second_product)
+        url = reverse('related_products', args=[main_product.id])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.get(url)
+
+        self.assertEqual(len(response.data.get('products')), 0)
+        apply_async.assert_called_once()
+        self.assertListEqual(apply_async.call_args.kwargs.get('args'), [[main_product.id]])
+
+    @patch('products.tasks.rebuild_product_recommendations.apply_async')
+    def test_if_built_recommendations_without_neighbours_are_not_rebuilt(self, apply_async):
+        """
+        Tests if a product whose recommendations were built empty does not dispatch their build again
+        """
+
+        main_product: Product = self.__generate_product(self.third_product)
+        rebuild_product_recommendations([main_product.id])
+        url = reverse('related_products', args=[main_product.id])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.get(url)
+
+        self.assertEqual(len(response.data.get('products')), 0)
+        apply_async.assert_not_called()
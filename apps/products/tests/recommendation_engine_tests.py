@@ -0,0 +1,168 @@
+from rest_framework import test
+
+from unittest.mock import patch
+
+from ..models import Product, Supplier, Recommendation
+from ..recommendations import RecommendationEngine
+from ..co_purchases import CoPurchaseMatrix
+
+from authentication.models import Customer
+from cart.models import Sale
+
+
+class RecommendationEngineTests(test.APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        test_supplier_data = {
+            'name': 'TestCia',
+            'address': 'TestStreet',
+            'phone': '99999999999'
+        }
+        supplier: Supplier = Supplier.objects.create(**test_supplier_data)
+
+        cls.customer: Customer = Customer.objects.create_user(username='John', password='john')
+
+        cls.main_product = cls.__create_product(supplier, 'Main Product', Product.Category.SCIENCE)
+        cls.science_products = [
+            cls.__create_product(supplier, f'Science Product {index}', Product.Category.SCIENCE, index)
+            for index in range(4)
+        ]
+        cls.fiction_product = cls.__create_product(supplier, 'Fiction Product', Product.Category.FICTION)
+
+    @staticmethod
+    def __create_product(supplier: Supplier, name: str, category: int, average_review: float = 0.0):
+        return Product.objects.create(
+            name=name,
+            description='Test description',
+            category=category,
+            supplier=supplier,
+            average_review=average_review
+        )
+
+    def __sell(self, *products):
+        sale: Sale = Sale.objects.create(
+            customer=self.customer,
+            total=0,
+            delivery_address='Test Street',
+            payment_method=Sale.Payment.PIX
+        )
+        sale.products.add(*products)
+
+    @staticmethod
+    def __recommended_ids(product: Product):
+        return list(Recommendation.objects.filter(product=product).values_list('recommended_id', flat=True))
+
+    def test_if_rebuild_ranks_co_purchased_products_first(self):
+        """
+        Tests if rebuild ranks co-purchased products above same category products, and these by review
+        """
+
+        self.__sell(self.main_product, self.fiction_product)
+        CoPurchaseMatrix.update()
+
+        RecommendationEngine.rebuild([self.main_product.id])
+
+        expected = [self.fiction_product.id] + [product.id for product in reversed(self.science_products)]
+        self.assertListEqual(self.__recommended_ids(self.main_product), expected)
+
+    @patch('products.recommendations.RECOMMENDATIONS_PER_PRODUCT', 2)
+    def test_if_lists_are_bounded(self):
+        """
+        Tests if recommendation lists never hold more products than the configured bound
+        """
+
+        RecommendationEngine.rebuild([self.main_product.id])
+
+        self.assertEqual(len(self.__recommended_ids(self.main_product)), 2)
+
+    @patch('products.recommendations.RECOMMENDATIONS_PER_PRODUCT', 2)
+    def test_if_offer_inserts_a_better_product_into_existing_lists(self):
+        """
+        Tests if offering a better reviewed product inserts it into the lists of its best reviewed peers
+        and drops their worst entry
+        """
+
+        RecommendationEngine.rebuild([self.main_product.id])
+        Product.objects.filter(pk=self.main_product.id).update(average_review=4.0)
+
+        Product.objects.filter(pk=self.science_products[0].id).update(average_review=5.0)
+        RecommendationEngine.offer(self.science_products[0].id)
+
+        self.assertListEqual(
+            self.__recommended_ids(self.main_product),
+            [self.science_products[0].id, self.science_products[3].id]
+        )
+
+    @patch('products.recommendations.RECOMMENDATIONS_PER_PRODUCT', 2)
+    def test_if_offer_skips_peers_outside_the_best_reviewed(self):
+        """
+        Tests if offering a product leaves the lists of peers below the best reviewed ones to the next rebuild
+        """
+
+        RecommendationEngine.rebuild([self.main_product.id])
+
+        Product.objects.filter(pk=self.science_products[0].id).update(average_review=5.0)
+        RecommendationEngine.offer(self.science_products[0].id)
+
+        self.assertNotIn(self.science_products[0].id, self.__recommended_ids(self.main_product))
+
+    @patch('products.recommendations.RECOMMENDATIONS_PER_PRODUCT', 2)
+    def test_if_offer_reaches_co_purchase_partners_of_the_same_category(self):
+        """
+        Tests if a product is offered to a co-purchase partner of its category outside its best reviewed peers
+        """
+
+        RecommendationEngine.rebuild([self.main_product.id])
+
+        self.__sell(self.main_product, self.science_products[0])
+        CoPurchaseMatrix.update()
+        RecommendationEngine.offer(self.science_products[0].id)
+
+        self.assertEqual(self.__recommended_ids(self.main_product)[0], self.science_products[0].id)
+        self.assertEqual(Recommendation.objects.filter(product=self.main_product,
+                                                       recommended=self.science_products[0]).count(), 1)
+
+    def test_if_offer_removes_a_product_from_the_lists_of_its_old_category(self):
+        """
+        Tests if a product moved to another category leaves the lists of its old category
+        """
+
+        RecommendationEngine.rebuild([self.main_product.id])
+
+        Product.objects.filter(pk=self.science_products[0].id).update(category=Product.Category.DIDACTIC)
+        RecommendationEngine.offer(self.science_products[0].id)
+
+        self.assertNotIn(self.science_products[0].id, self.__recommended_ids(self.main_product))
+
+    @patch('products.recommendations.RECOMMENDATIONS_PER_PRODUCT', 2)
+    def test_if_offer_rescores_a_listed_product_in_place(self):
+        """
+        Tests if offering a listed product updates its score and keeps it in the lists it still belongs to
+        """
+
+        RecommendationEngine.rebuild([self.main_product.id])
+
+        Product.objects.filter(pk=self.science_products[3].id).update(average_review=2.5)
+        RecommendationEngine.offer(self.science_products[3].id)
+
+        recommendation = Recommendation.objects.get(product=self.main_product, recommended=self.science_products[3])
+        self.assertEqual(recommendation.score, RecommendationEngine.score(True, 0, 2.5))
+        self.assertListEqual(
+            self.__recommended_ids(self.main_product),
+            [self.science_products[3].id, self.science_products[2].id]
+        )
+
+    @patch('products.recommendations.RECOMMENDATIONS_PER_PRODUCT', 2)
+    def test_if_offer_drops_a_listed_product_below_the_floor_of_a_full_list(self):
+        """
+        Tests if offering a listed product drops it only from the full lists whose other entries all beat it
+        """
+
+        RecommendationEngine.rebuild([self.main_product.id, self.science_products[2].id])
+
+        Product.objects.filter(pk=self.science_products[3].id).update(average_review=1.0)
+        RecommendationEngine.offer(self.science_products[3].id)
+
+        self.assertListEqual(self.__recommended_ids(self.main_product), [self.science_products[2].id])
+        self.assertIn(self.science_products[3].id, self.__recommended_ids(self.science_products[2]))
@@ -3,8 +3,6 @@ from rest_framework import test
 from ..models import Review, Supplier, Product
 from authentication.models import Customer
 
-from unittest.mock import patch
-
 from ..serializers import ReviewSerializer
 from ..tasks import update_product_average_review
 
@@ -120,11 +118,7 @@ class ReviewSerializerTests(test.APITestCase):
 
         self.assertDictEqual(expected_json, serializer.data)
 
-    @patch('products.tasks.serializers.ProductSerializer.update')
-    def test_if_the_average_review_changes_automatically_when_another_review_instance_is_created(
-            self,
-            serializer_update
-    ):
+    def test_if_the_average_review_changes_automatically_when_another_review_instance_is_created(self):
         """
         Tests if the average review of a product changes automatically when another review instance is created
         """
@@ -132,14 +126,48 @@ class ReviewSerializerTests(test.APITestCase):
         first_review: Review = self.__create_review_instance(self.test_data)
         product: Product = Product.objects.get(pk=first_review.product.id)
 
-        update_product_average_review(product.id)
-
-        serializer_update.assert_called_with(product, {'average_review': self.test_data.get('value')})
+        self.assertEqual(product.average_review, self.test_data.get('value'))
 
         self.__create_review_instance(self.new_review_test_data)
-        Product.objects.get(pk=first_review.product.id)
+        product: Product = Product.objects.get(pk=first_review.product.id)
 
         average = (self.test_data.get('value') + self.new_review_test_data.get('value')) / 2
 
-        update_product_average_review(first_review.product.id)
-        serializer_update.assert_called_with(product, {'average_review': average})
+        self.assertEqual(product.average_review, average)
+        self.assertEqual(product.review_count, 2)
+
+    def test_if_the_average_review_changes_automatically_when_a_review_instance_is_deleted(self):
+        """
+        Tests if the average review of a product goes back to the remaining reviews, or to zero, when they are deleted
+        """
+
+        first_review: Review = self.__create_review_instance(self.test_data)
+        second_review: Review = self.__create_review_instance(self.new_review_test_data)
+
+        first_review.delete()
+        product: Product = Product.objects.get(pk=first_review.product_id)
+
+        self.assertEqual(product.average_review, self.new_review_test_data.get('value'))
+
+        second_review.delete()
+        product: Product = Product.objects.get(pk=first_review.product_id)
+
+        self.assertEqual(product.average_review, 0.0)
+        self.assertEqual(product.review_count, 0)
+
+    def test_if_repairing_the_average_review_matches_the_incremental_one(self):
+        """
+        Tests if recomputing the review aggregates from scratch gives the incrementally maintained values
+        """
+
+        first_review: Review = self.__create_review_instance(self.test_data)
+        self.__create_review_instance(self.new_review_test_data)
+        expected: Product = Product.objects.get(pk=first_review.product_id)
+
+        Product.objects.filter(pk=first_review.product_id).update(average_review=0.0, review_sum=0.0, review_count=0)
+        update_product_average_review(first_review.product_id)
+        product: Product = Product.objects.get(pk=first_review.product_id)
+
+        self.assertEqual(product.average_review, expected.average_review)
+        self.assertEqual(product.review_sum, expected.review_sum)
+        self.assertEqual(product.review_count, expected.review_count)
@@ -222,3 +222,24 @@ class ReviewViewSetTests(test.APITestCase):
 
         self.assertEqual(delete_response.status_code, status.HTTP_204_NO_CONTENT)
         self.assertFalse(review.exists())
+
+    def test_if_updating_a_review_refreshes_the_cached_product(self):
+        """
+        Tests if the cached product detail shows the new average review once one of its reviews is updated
+        """
+
+        self.__authenticate(self.customer)
+        product_url = reverse('product-detail', args=[self.review_data.get('product')])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(self.list_url, data=self.review_data)
+
+        review: Review = Review.objects.get(customer=self.customer)
+
+        self.assertEqual(self.client.get(product_url).data.get('average_review'), self.review_data.get('value'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(reverse('review-detail', args=[review.id]), data=self.update_review_data)
+
+        self.assertEqual(self.client.get(product_url).data.get('average_review'),
+                         self.update_review_data.get('value'))
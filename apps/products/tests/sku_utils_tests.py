@@ -0,0 +1,41 @@
+import re
+
+from django.test import SimpleTestCase
+
+from ..utils import SkuUtils
+
+
+class SkuUtilsTests(SimpleTestCase):
+
+    @staticmethod
+    def __get_legacy_letters(text: str):
+        separated_text = re.sub(r'([A-Za-z])([A-Z])', r'\1 \2', text).title()
+
+        return ''.join(re.findall(r'\b(\w)', separated_text))
+
+    def test_if_generated_skus_match_the_uncompiled_implementation(self):
+        """
+        Tests if the SKUs generated with the compiled patterns and cached supplier initials
+        are the same as the ones generated by the original implementation
+        """
+
+        names = ['NewTech Company', 'another supplier', 'ACME', 'iPhone 15 Pro', 'Coffee-Maker', 'Çafé Élite', '']
+
+        for supplier_name in names:
+            for product_name in names:
+                expected_sku = (
+                    f'{self.__get_legacy_letters(supplier_name)}3-{self.__get_legacy_letters(product_name)}'
+                )
+
+                self.assertEqual(SkuUtils.generate_sku(supplier_name, product_name, 3), expected_sku)
+
+    def test_if_generate_skus_keeps_the_order_of_the_products(self):
+        """
+        Tests if the batch generation returns one SKU per product in the given order
+        """
+
+        products = [('NewTech Company', 'Tech Product', 1), ('Other Supplier', 'Some Product', 2)]
+
+        skus = SkuUtils.generate_skus(iter(products))
+
+        self.assertEqual(skus, ['NTC1-TP', 'OS2-SP'])
@@ -1,7 +1,10 @@
 from rest_framework import test
 
-from ..models import Supplier
+from unittest.mock import patch
+
+from ..models import Supplier, Product
 from ..serializers import SupplierSerializer
+from ..tasks import update_supplier_product_skus
 
 
 class SupplierSerializerTests(test.APITestCase):
@@ -85,3 +88,40 @@ class SupplierSerializerTests(test.APITestCase):
         serializer: SupplierSerializer = SupplierSerializer(instance=created)
 
         self.assertDictEqual(json, serializer.data)
+
+    @patch('products.tasks.update_supplier_product_skus.apply_async')
+    def test_if_renaming_a_supplier_dispatches_the_sku_update_of_its_products(self, apply_async):
+        """
+        Tests if renaming a supplier dispatches the SKU update with the supplier id, and other updates do not
+        """
+
+        instance: Supplier = self.__create_a_supplier(self.test_data)
+        serializer: SupplierSerializer = SupplierSerializer()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            serializer.update(instance, {'address': 'Other Street'})
+
+        apply_async.assert_not_called()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            serializer.update(instance, {'name': self.update_test_data.get('name')})
+
+        apply_async.assert_called_once()
+        self.assertListEqual(apply_async.call_args.kwargs.get('args'), [instance.id])
+
+    def test_if_sku_update_regenerates_the_sku_of_every_product_of_the_supplier(self):
+        """
+        Tests if the supplier SKU update regenerates the SKU of all its products across chunks
+        """
+
+        instance: Supplier = self.__create_a_supplier(self.update_test_data)
+        Product.objects.bulk_create(
+            Product(name='Test Product', description='Test description', sku='TC1-TP',
+                    category=Product.Category.SCIENCE, supplier=instance)
+            for _ in range(5)
+        )
+
+        result = update_supplier_product_skus(instance.id, chunk_size=2)
+
+        self.assertDictEqual(result, {'checked': 5, 'updated': 5})
+        self.assertSetEqual(set(Product.objects.values_list('sku', flat=True)), {'NTC1-TP'})
@@ -0,0 +1,102 @@
+from rest_framework import test
+
+from unittest.mock import patch
+
+from django.core.cache import cache, caches
+from django.test import override_settings
+
+from ..dispatch import TaskDispatcher
+from ..tasks import offer_product_recommendation, rebuild_product_recommendations
+
+
+class TaskDispatcherTests(test.APITestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    @patch('products.tasks.offer_product_recommendation.apply_async')
+    def test_if_dispatch_only_enqueues_after_commit(self, apply_async):
+        """
+        Tests if a dispatched task is only enqueued once the transaction commits
+        """
+
+        with self.captureOnCommitCallbacks(execute=True):
+            TaskDispatcher.dispatch(offer_product_recommendation, 1)
+
+            apply_async.assert_not_called()
+
+        apply_async.assert_called_once_with(args=[1], countdown=5)
+
+    @patch('products.tasks.offer_product_recommendation.apply_async')
+    def test_if_a_burst_of_duplicate_dispatches_is_collapsed(self, apply_async):
+        """
+        Tests if a burst of dispatches of the same task and arguments enqueues a single task
+        and counts the collapsed ones
+        """
+
+        with self.captureOnCommitCallbacks(execute=True):
+            for _ in range(1000):
+                TaskDispatcher.dispatch(offer_product_recommendation, 1)
+
+        apply_async.assert_called_once()
+        self.assertDictEqual(TaskDispatcher.stats(offer_product_recommendation), {'enqueued': 1, 'collapsed': 999})
+
+    @patch('products.tasks.rebuild_product_recommendations.apply_async')
+    @patch('products.tasks.offer_product_recommendation.apply_async')
+    def test_if_different_tasks_or_arguments_are_not_collapsed(self, offer_apply_async, rebuild_apply_async):
+        """
+        Tests if dispatches of other tasks or other arguments are enqueued separately
+        """
+
+        with self.captureOnCommitCallbacks(execute=True):
+            TaskDispatcher.dispatch(offer_product_recommendation, 1)
+            TaskDispatcher.dispatch(offer_product_recommendation, 2)
+            TaskDispatcher.dispatch(rebuild_product_recommendations, [1])
+
+        self.assertEqual(offer_apply_async.call_count, 2)
+        self.assertEqual(rebuild_apply_async.call_count, 1)
+
+    @patch('products.tasks.offer_product_recommendation.apply_async')
+    def test_if_dispatch_without_window_never_collapses(self, apply_async):
+        """
+        Tests if dispatching with a zero window enqueues every call right away
+        """
+
+        with self.captureOnCommitCallbacks(execute=True):
+            TaskDispatcher.dispatch(offer_product_recommendation, 1, window=0)
+            TaskDispatcher.dispatch(offer_product_recommendation, 1, window=0)
+
+        self.assertEqual(apply_async.call_count, 2)
+
+    @staticmethod
+    def __process_caches(location: str):
+        """
+        Caches of a process, with its own local tier in front of the store shared by every process
+        """
+
+        return override_settings(CACHES={
+            'default': {
+                'BACKEND': 'caching.backends.TieredCache',
+                'LOCATION': location,
+                'OPTIONS': {'SHARED_CACHE': 'shared'},
+            },
+            'shared': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'task-dispatcher-tests'},
+        }, TASK_STATS_CACHE_ALIAS='shared')
+
+    @patch('products.tasks.offer_product_recommendation.apply_async')
+    def test_if_dispatches_are_counted_across_processes(self, apply_async):
+        """
+        Tests if the dispatches of processes with their own local cache tier add up to a single count
+        """
+
+        for location in ('first-process', 'second-process'):
+            with self.__process_caches(location):
+                caches['default'].clear()
+
+        for location, product_id in [('first-process', 1), ('second-process', 2), ('first-process', 3)]:
+            with self.__process_caches(location), self.captureOnCommitCallbacks(execute=True):
+                TaskDispatcher.dispatch(offer_product_recommendation, product_id)
+
+        for location in ('first-process', 'second-process'):
+            with self.__process_caches(location):
+                self.assertEqual(TaskDispatcher.stats(offer_product_recommendation).get('enqueued'), 3)
@@ -0,0 +1,106 @@
+from rest_framework import test
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+
+from django.core.exceptions import ImproperlyConfigured
+
+from datetime import date
+
+from authentication.models import Customer
+from core.serializers import ValuesSerializer
+from ..models import Product, Supplier, PriceHistory, Review
+
+from ..serializers import ProductSerializer, SupplierSerializer, PriceHistorySerializer
+
+
+class ValuesSerializerTests(test.APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        customers = [
+            Customer.objects.create(username=f'testuser{index}', email=f'test{index}@test.dev')
+            for index in range(3)
+        ]
+
+        suppliers = [
+            Supplier.objects.create(name=f'TestCia {index}', address='TestStreet', phone=f'{index:011d}')
+            for index in range(2)
+        ]
+
+        for index in range(6):
+            product: Product = Product.objects.create(
+                name=f'Test Product {index}',
+                description='Test description',
+                sku=f'TC{index}-TP',
+                category=Product.Category.SCIENCE,
+                supplier=suppliers[index % 2] if index else None
+            )
+
+            PriceHistory.objects.create(product=product, price=100 * index)
+            PriceHistory.objects.create(product=product, price=100 * index + 50)
+
+            # Reviews in descending customer order, with a repeated customer
+            for customer in reversed(customers[:index % 4]):
+                Review.objects.create(product=product, customer=customer, value=index)
+            if index == 5:
+                Review.objects.create(product=product, customer=customers[0], value=1)
+
+        PriceHistory.objects.filter(end__isnull=False).update(start=date(2024, 1, 1))
+
+    def __assert_same_json(self, serializer_class, queryset):
+        values_serializer = ValuesSerializer(serializer_class)
+
+        expected = JSONRenderer().render(serializer_class(queryset, many=True).data)
+        rendered = JSONRenderer().render(values_serializer.serialize(values_serializer.get_queryset(queryset)))
+
+        self.assertEqual(rendered, expected)
+
+    def test_if_products_are_serialized_as_by_the_product_serializer(self):
+        """
+        Tests if product rows, with their reviewing customers and without supplier,
+        render the same JSON as the product serializer
+        """
+
+        self.__assert_same_json(ProductSerializer, Product.objects.all())
+
+    def test_if_suppliers_are_serialized_as_by_the_supplier_serializer(self):
+        """
+        Tests if supplier rows render the same JSON as the supplier serializer
+        """
+
+        self.__assert_same_json(SupplierSerializer, Supplier.objects.all())
+
+    def test_if_price_histories_are_serialized_as_by_the_price_history_serializer(self):
+        """
+        Tests if price history rows, open and closed, render the same JSON as the price history serializer
+        """
+
+        self.__assert_same_json(PriceHistorySerializer, PriceHistory.objects.all())
+
+    def test_if_product_list_response_is_unchanged(self):
+        """
+        Tests if product view set list action renders the same JSON as the product serializer
+        """
+
+        response = self.client.get('/api/products/')
+
+        products = Product.objects.order_by('id')[:10]
+        expected = JSONRenderer().render(ProductSerializer(products, many=True).data)
+
+        self.assertEqual(JSONRenderer().render(response.data.get('results')), expected)
+
+    def test_if_fields_that_are_not_columns_are_refused(self):
+        """
+        Tests if a serializer with a computed field cannot be used to serialize values rows
+        """
+
+        class ComputedFieldSerializer(serializers.ModelSerializer):
+
+            label = serializers.SerializerMethodField()
+
+            class Meta:
+                model = Supplier
+                fields = ['id', 'label']
+
+        with self.assertRaises(ImproperlyConfigured):
+            ValuesSerializer(ComputedFieldSerializer)
@@ -18,4 +18,9 @@ urlpatterns = [
         views.RecommendationAlgorithmViewSet.as_view({'get': 'list_related_products'}),
         name='related_products'
     ),
+    path(
+        'products/<int:pk>/also-bought/',
+        views.RecommendationAlgorithmViewSet.as_view({'get': 'list_also_bought_products'}),
+        name='also_bought_products'
+    ),
 ]
@@ -1,10 +1,16 @@
 import re
 
+from functools import lru_cache
+
 
 class SkuUtils:
+
+    __CAMEL_CASE_PATTERN = re.compile(r'([A-Za-z])([A-Z])')
+    __WORD_START_PATTERN = re.compile(r'\b(\w)')
+
     @staticmethod
     def __separate_words(text: str):
-        separated_word = re.sub(r'([A-Za-z])([A-Z])', r'\1 \2', text)
+        separated_word = SkuUtils.__CAMEL_CASE_PATTERN.sub(r'\1 \2', text)
 
         return separated_word
 
@@ -13,14 +19,34 @@ class SkuUtils:
         separated_text = SkuUtils.__separate_words(text)
         capitalized_text = separated_text.title()
 
-        groups = re.findall(r'\b(\w)', capitalized_text)
+        groups = SkuUtils.__WORD_START_PATTERN.findall(capitalized_text)
         letters = ''.join(groups)
 
         return letters
 
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def __get_supplier_letters(supplier_name: str):
+        """
+        Supplier initials only change when the supplier is renamed, so they are shared by all its products
+        """
+
+        return SkuUtils.__get_capitalized_letters(supplier_name)
+
     @staticmethod
     def generate_sku(supplier_name: str, product_name: str, category: int):
-        supplier_name_letters = SkuUtils.__get_capitalized_letters(supplier_name)
+        supplier_name_letters = SkuUtils.__get_supplier_letters(supplier_name)
         product_name_letters = SkuUtils.__get_capitalized_letters(product_name)
 
         return f'{supplier_name_letters}{category}-{product_name_letters}'
+
+    @staticmethod
+    def generate_skus(products):
+        """
+        Generates the SKU of each (supplier name, product name, category) of an iterable
+        """
+
+        return [
+            SkuUtils.generate_sku(supplier_name, product_name, category)
+            for supplier_name, product_name, category in products
+        ]
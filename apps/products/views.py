@@ -2,56 +2,109 @@ from rest_framework import viewsets
 from rest_framework import permissions
 from rest_framework import mixins
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import get_object_or_404
 
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
+from django.db.models import Case, OuterRef, Prefetch, Q, When, prefetch_related_objects
+from django.http import StreamingHttpResponse
+
+from caching.tags import TaggedCacheMixin, cache_response, tag
+from core.mixins import ValuesReadModelMixin
+from core.pagination import KeysetPagination
+from core.query_params import get_date_query_param
 
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework import status
 
-from .models import Product, Supplier, Tag, PriceHistory, Review
+from authentication.models import Customer
+
+from .models import Product, Supplier, Tag, PriceHistory, ArchivedPriceHistory, Review, Recommendation, CoPurchase
 from .serializers import (ProductSerializer,
                           SupplierSerializer,
                           TagSerializer,
                           PriceHistorySerializer,
                           ReviewSerializer)
+from .dispatch import TaskDispatcher
+from .tasks import rebuild_product_recommendations
+from .exports import CatalogExport
+from .bulk import CatalogBulkWriter
+from .prices import PriceResolver
+
+# Catalog responses are purged by the model signals in products.signals, so they can live for long
+CATALOG_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+
+# ProductSerializer lists the ids of the reviewing customers, which would otherwise cost a query per product
+PRODUCT_CUSTOMERS = Prefetch('customers', queryset=Customer.objects.only('id'))
 
 
-class ProductViewSet(viewsets.ModelViewSet):
-    queryset = Product.objects.all()
+class ProductViewSet(TaggedCacheMixin, ValuesReadModelMixin, viewsets.ModelViewSet):
+    queryset = Product.objects.prefetch_related(PRODUCT_CUSTOMERS)
     serializer_class = ProductSerializer
+    pagination_class = KeysetPagination
     permission_classes = [permissions.IsAuthenticated]
 
-    @method_decorator(cache_page(60 * 5))
+    @cache_response(CATALOG_CACHE_TIMEOUT)
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
-    @method_decorator(cache_page(60 * 60 * 12))
+    @cache_response(CATALOG_CACHE_TIMEOUT)
     def retrieve(self, request, *args, **kwargs):
         return super().retrieve(request, *args, **kwargs)
 
+    @action(detail=False, url_path='export')
+    def export(self, request: Request):
+        """
+        Stream the whole catalog as NDJSON, or as CSV with ``?type=csv``
+        """
+
+        content_type = request.query_params.get('type', 'ndjson')
+        if content_type not in CatalogExport.CONTENT_TYPES:
+            return Response(status=status.HTTP_400_BAD_REQUEST)
+
+        response = StreamingHttpResponse(
+            CatalogExport.stream(content_type),
+            content_type=CatalogExport.CONTENT_TYPES.get(content_type)
+        )
+        response['Content-Disposition'] = f'attachment; filename="catalog.{content_type}"'
+
+        return response
+
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk(self, request: Request):
+        """
+        Create the products without ``id`` and partially update the others, reporting invalid rows by index
+        """
+
+        if not isinstance(request.data, list):
+            return Response({'detail': 'Expected a list of products.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(CatalogBulkWriter.write_products(request.data), status=status.HTTP_200_OK)
+
     def get_permissions(self):
         match self.action:
             case 'list' | 'retrieve':
                 permission_classes = [permissions.AllowAny]
 
+            case 'export':
+                permission_classes = [permissions.IsAuthenticated]
+
             case _:
                 permission_classes = [permissions.IsAdminUser]
 
         return [permission() for permission in permission_classes]
 
 
-class SupplierViewSet(viewsets.ModelViewSet):
+class SupplierViewSet(TaggedCacheMixin, ValuesReadModelMixin, viewsets.ModelViewSet):
     queryset = Supplier.objects.all()
     serializer_class = SupplierSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-    @method_decorator(cache_page(60 * 5))
+    @cache_response(CATALOG_CACHE_TIMEOUT)
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
-    @method_decorator(cache_page(60 * 60 * 12))
+    @cache_response(CATALOG_CACHE_TIMEOUT)
     def retrieve(self, request, *args, **kwargs):
         return super().retrieve(request, *args, **kwargs)
 
@@ -66,7 +119,8 @@ class SupplierViewSet(viewsets.ModelViewSet):
         return [permission() for permission in permission_classes]
 
 
-class TagViewSet(mixins.ListModelMixin,
+class TagViewSet(TaggedCacheMixin,
+                 mixins.ListModelMixin,
                  mixins.CreateModelMixin,
                  mixins.DestroyModelMixin,
                  viewsets.GenericViewSet):
@@ -75,7 +129,7 @@ class TagViewSet(mixins.ListModelMixin,
     serializer_class = TagSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-    @method_decorator(cache_page(60))
+    @cache_response(CATALOG_CACHE_TIMEOUT)
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
@@ -93,7 +147,9 @@ class TagViewSet(mixins.ListModelMixin,
         return [permission() for permission in permission_classes]
 
 
-class PriceHistoryViewSet(mixins.ListModelMixin,
+class PriceHistoryViewSet(TaggedCacheMixin,
+                          ValuesReadModelMixin,
+                          mixins.ListModelMixin,
                           mixins.CreateModelMixin,
                           mixins.RetrieveModelMixin,
                           mixins.DestroyModelMixin,
@@ -101,16 +157,109 @@ class PriceHistoryViewSet(mixins.ListModelMixin,
 
     queryset = PriceHistory.objects.all()
     serializer_class = PriceHistorySerializer
+    pagination_class = KeysetPagination
     permission_classes = [permissions.IsAuthenticated]
     
-    @method_decorator(cache_page(60 * 60 * 2))
+    @cache_response(CATALOG_CACHE_TIMEOUT)
     def list(self, request, *args, **kwargs):
+        at = get_date_query_param(request, 'at')
+        if at is not None:
+            return self.__list_prices_at(at)
+
         return super().list(request, *args, **kwargs)
 
-    @method_decorator(cache_page(60 * 60 * 24))
+    @cache_response(CATALOG_CACHE_TIMEOUT)
     def retrieve(self, request, *args, **kwargs):
         return super().retrieve(request, *args, **kwargs)
 
+    def __get_product_id(self) -> int | None:
+        product = self.request.query_params.get('product')
+        if product is None:
+            return None
+
+        try:
+            return int(product)
+        except ValueError:
+            raise ValidationError({'product': ['A valid integer is required.']})
+
+    def __list_prices_at(self, at):
+        """
+        The price in effect at a date of each product, or of the ``product``, paginated by product.
+        Prices older than every price history of their product are read from the archive, and have no id
+        since they cannot be retrieved
+        """
+
+        history_id = PriceResolver.as_of(OuterRef('pk'), at, field='id')
+        archived_id = PriceResolver.as_of(OuterRef('pk'), at, field='id', model=ArchivedPriceHistory)
+
+        products = Product.objects.all()
+
+        product_id = self.__get_product_id()
+        if product_id is not None:
+            products = products.filter(pk=product_id)
+
+        products = (products
+                    .annotate(history_id=history_id,
+                              archived_id=Case(When(history_id__isnull=True, then=archived_id)))
+                    .filter(Q(history_id__isnull=False) | Q(archived_id__isnull=False))
+                    .values('id', 'history_id', 'archived_id'))
+
+        page = self.paginate_queryset(products)
+
+        values_serializer = self.get_values_serializer()
+        histories = values_serializer.get_queryset(
+            PriceHistory.objects.filter(pk__in=[row.get('history_id') for row in page if row.get('history_id')])
+        )
+        archived = (ArchivedPriceHistory.objects
+                    .filter(pk__in=[row.get('archived_id') for row in page if row.get('archived_id')])
+                    .values('product', 'price', 'start', 'end'))
+
+        prices = {history.get('product'): history for history in histories}
+        prices.update({history.get('product'): {**history, 'id': None} for history in archived})
+
+        return self.get_paginated_response(values_serializer.serialize(prices[row.get('id')] for row in page))
+
+    def filter_queryset(self, queryset):
+        """
+        Lists the prices of the ``product``, when given
+        """
+
+        queryset = super().filter_queryset(queryset)
+        if self.action != 'list':
+            return queryset
+
+        product_id = self.__get_product_id()
+        if product_id is not None:
+            queryset = queryset.filter(product__pk=product_id)
+
+        return queryset
+
+    def get_response_cache_tags(self, response):
+        """
+        A new price closes the previous interval with a bulk update, so price responses
+        are also tagged with the products they belong to
+        """
+
+        histories = response.data.get('results', [response.data])
+
+        return {tag(Product, history.get('product')) for history in histories} | {
+            tag(PriceHistory, history.get('id')) for history in histories if history.get('id') is not None
+        }
+
+    def get_response_cache_models(self):
+        return {Product, PriceHistory}
+
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk(self, request: Request):
+        """
+        Add a price to the product of each row, reporting invalid rows by index
+        """
+
+        if not isinstance(request.data, list):
+            return Response({'detail': 'Expected a list of prices.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(CatalogBulkWriter.write_prices(request.data), status=status.HTTP_200_OK)
+
     def get_permissions(self):
         match self.action:
             case 'list' | 'retrieve':
@@ -122,7 +271,8 @@ class PriceHistoryViewSet(mixins.ListModelMixin,
         return [permission() for permission in permission_classes]
 
 
-class ReviewViewSet(mixins.ListModelMixin,
+class ReviewViewSet(TaggedCacheMixin,
+                    mixins.ListModelMixin,
                     mixins.CreateModelMixin,
                     mixins.UpdateModelMixin,
                     mixins.DestroyModelMixin,
@@ -130,9 +280,10 @@ class ReviewViewSet(mixins.ListModelMixin,
 
     queryset = Review.objects.all()
     serializer_class = ReviewSerializer
+    pagination_class = KeysetPagination
     permission_classes = [permissions.IsAuthenticated]
     
-    @method_decorator(cache_page(60))
+    @cache_response(CATALOG_CACHE_TIMEOUT)
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
@@ -147,22 +298,60 @@ class ReviewViewSet(mixins.ListModelMixin,
         return [permission() for permission in permission_classes]
 
 
-class RecommendationAlgorithmViewSet(viewsets.GenericViewSet):
+class RecommendationAlgorithmViewSet(TaggedCacheMixin, viewsets.GenericViewSet):
     permission_classes = [permissions.AllowAny]
     serializer_class = ProductSerializer
 
-    @method_decorator(cache_page(60 * 5))
+    def get_cache_tags(self, request, *args, **kwargs):
+        ranking = CoPurchase if self.action == 'list_also_bought_products' else Recommendation
+
+        return {tag(Product, kwargs.get('pk')), tag(ranking, kwargs.get('pk'))}
+
+    def get_response_cache_tags(self, response):
+        return {tag(Product, product.get('id')) for product in response.data.get('products')}
+
+    def get_response_cache_models(self):
+        return {Product}
+
+    def __get_paginated_products(self, products):
+        prefetch_related_objects(products, PRODUCT_CUSTOMERS)
+
+        serializer: ProductSerializer = ProductSerializer(products, many=True)
+
+        response: Response = self.get_paginated_response(serializer.data)
+        response.data['products'] = response.data.pop('results')
+
+        return response
+
+    @cache_response(CATALOG_CACHE_TIMEOUT)
     @action(detail=True, url_path='')
     def list_related_products(self, request: Request, pk=None):
         """
-        List all products that have the same category
+        List the precomputed recommendations of a product, best ranked first. Lists never built are built
+        in the background, and listed empty until then
         """
 
-        main_product: Product = Product.objects.get(pk=pk)
-        related_products = Product.objects.filter(category=main_product.category).exclude(pk=main_product.id)
+        main_product: Product = get_object_or_404(Product.objects.only('id', 'recommendations_built'), pk=pk)
+        if not main_product.recommendations_built:
+            TaskDispatcher.dispatch(rebuild_product_recommendations, [main_product.id])
+
+        recommendations = Recommendation.objects.filter(product=main_product)
+
+        return self.__get_paginated_products([
+            recommendation.recommended
+            for recommendation in self.paginate_queryset(recommendations.select_related('recommended'))
+        ])
+
+    @cache_response(CATALOG_CACHE_TIMEOUT)
+    @action(detail=True, url_path='also-bought')
+    def list_also_bought_products(self, request: Request, pk=None):
+        """
+        List the products most often bought along with a product
+        """
 
-        serializer: ProductSerializer = ProductSerializer(related_products, many=True)
+        main_product: Product = get_object_or_404(Product, pk=pk)
+        co_purchases = CoPurchase.objects.filter(product=main_product).select_related('other')
 
-        return Response({
-            'products': serializer.data,
-        }, status=status.HTTP_200_OK)
+        return self.__get_paginated_products([
+            co_purchase.other for co_purchase in self.paginate_queryset(co_purchases)
+        ])
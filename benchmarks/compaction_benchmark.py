@@ -0,0 +1,110 @@
+"""
+Measures the size of the price history and the latency of its list before and after
+a compaction, over a history grown by frequent price changes like the load tests make.
+
+Run from the project root, with the same environment as ``manage.py``,
+with ``python -m benchmarks.compaction_benchmark``.
+"""
+
+import random
+import timeit
+
+from datetime import date, timedelta
+
+from .utils import test_database
+
+PRODUCTS = 200
+DAYS = 730
+CHANGES_PER_DAY = 3
+RETENTION_DAYS = 365
+DUMMY_CACHES = {
+    alias: {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'} for alias in ('default', 'shared')
+}
+
+
+def table_size(model) -> str:
+    """
+    Rows of the model's table and, where the database reports it, its size on disk
+    """
+
+    from django.db import connection
+
+    rows = model.objects.count()
+
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        try:
+            if connection.vendor == 'postgresql':
+                cursor.execute('SELECT pg_total_relation_size(%s)', [table])
+            else:
+                cursor.execute('SELECT SUM(pgsize) FROM dbstat WHERE name = %s', [table])
+            size = cursor.fetchone()[0] or 0
+        except Exception:
+            return f'{rows:,} rows'
+
+    return f'{rows:,} rows, {size / 1024 / 1024:.1f} MiB'
+
+
+def measure(view, request) -> float:
+    """
+    Best latency out of five requests, in milliseconds
+    """
+
+    return min(timeit.repeat(lambda: view(request), number=1, repeat=5)) * 1000
+
+
+def main():
+    from django.test import override_settings
+
+    from rest_framework.test import APIRequestFactory
+
+    from products.compaction import PriceHistoryCompaction
+    from products.models import ArchivedPriceHistory, PriceHistory, Product, Supplier
+    from products.views import PriceHistoryViewSet
+
+    supplier = Supplier.objects.create(name='Benchmark Supplier', address='Street', phone='99999999999')
+    products = Product.objects.bulk_create(
+        Product(name=f'Benchmark Product {index}', description='-', sku=f'B-BP{index}', category=1, supplier=supplier)
+        for index in range(PRODUCTS)
+    )
+
+    # A few changes a day, mostly back and forth between two prices, each one closing the previous
+    random.seed(0)
+    first_day = date.today() - timedelta(days=DAYS)
+    for product in products:
+        starts = [first_day + timedelta(days=day) for day in range(DAYS) for _ in range(CHANGES_PER_DAY)]
+        histories = PriceHistory.objects.bulk_create(
+            PriceHistory(product=product, price=random.choice((100, 100, 110)), end=end)
+            for end in starts[1:] + [None]
+        )
+        PriceHistory.objects.bulk_update(
+            [PriceHistory(id=history.id, start=start) for history, start in zip(histories, starts)], ['start'],
+            batch_size=1000
+        )
+
+    factory = APIRequestFactory()
+    view = PriceHistoryViewSet.as_view({'get': 'list'})
+    requests = {
+        'first page, exact count': factory.get('/api/prices/', data={'count': 'exact'}),
+        'product history': factory.get('/api/prices/', data={'product': products[0].id, 'count': 'exact'}),
+        'prices as of a date': factory.get('/api/prices/', data={'at': (first_day + timedelta(days=400)).isoformat()}),
+    }
+
+    with override_settings(CACHES=DUMMY_CACHES, CACHE_TAGS_ALIAS='default'):
+        before = {name: measure(view, request) for name, request in requests.items()}
+        print(f'before: {table_size(PriceHistory)}')
+
+        result = PriceHistoryCompaction.run(retention_days=RETENTION_DAYS)
+
+        after = {name: measure(view, request) for name, request in requests.items()}
+        print(f' after: {table_size(PriceHistory)} ({result.get("removed"):,} removed, '
+              f'{result.get("archived"):,} archived)')
+        print(f'archive: {table_size(ArchivedPriceHistory)}')
+
+    for name in requests:
+        print(f'{name:>24}: {before[name]:8.2f} ms -> {after[name]:8.2f} ms')
+
+
+if __name__ == '__main__':
+    with test_database():
+        main()
@@ -0,0 +1,57 @@
+"""
+Measures the throughput of the catalog import of a generated NDJSON file,
+with parsing in the main process and in a pool of processes.
+
+Run from the project root, with the same environment as ``manage.py``,
+with ``python -m benchmarks.import_benchmark``.
+"""
+
+import json
+import tempfile
+
+from time import perf_counter
+
+from .utils import test_database
+
+ROWS = 100_000
+SUPPLIERS = 50
+
+
+def main():
+    from products.imports import CatalogImport
+    from products.models import Product, Supplier, Tag, PriceHistory
+
+    Supplier.objects.bulk_create(
+        Supplier(name=f'Benchmark Supplier {index}', address='Street', phone=f'{index:011d}')
+        for index in range(SUPPLIERS)
+    )
+
+    with tempfile.NamedTemporaryFile('w+', suffix='.ndjson', encoding='utf-8') as file:
+        for index in range(ROWS):
+            file.write(json.dumps({
+                'name': f'BenchmarkProduct {index}',
+                'description': 'Generated by the import benchmark',
+                'category': index % 4 + 1,
+                'supplier_name': f'Benchmark Supplier {index % SUPPLIERS}',
+                'price': index,
+                'tags': [f'tag{index}'],
+            }) + '\n')
+
+        for workers in (1, 4):
+            file.seek(0)
+
+            start = perf_counter()
+            result = CatalogImport.load(file, 'ndjson', workers=workers)
+            elapsed = perf_counter() - start
+
+            print(f'{workers} worker(s): {result.get("created"):,} rows in {elapsed:.2f} s '
+                  f'({result.get("created") / elapsed:,.0f} rows/s)')
+
+            Tag.objects.all().delete()
+            PriceHistory.objects.all().delete()
+            Product.objects.all().delete()
+
+
+if __name__ == '__main__':
+    with test_database():
+        main()
@@ -0,0 +1,76 @@
+"""
+Compares the latency of the first and of a deep page of the price history list,
+with page number and keyset pagination.
+
+Run from the project root, with the same environment as ``manage.py``,
+with ``python -m benchmarks.pagination_benchmark``.
+"""
+
+import timeit
+
+from .utils import test_database
+
+PAGE = 10_000
+PAGE_SIZE = 10
+DUMMY_CACHES = {
+    alias: {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'} for alias in ('default', 'shared')
+}
+
+
+def measure(view, request) -> float:
+    """
+    Best latency out of five requests, in milliseconds
+    """
+
+    return min(timeit.repeat(lambda: view(request), number=1, repeat=5)) * 1000
+
+
+def main():
+    from datetime import date
+    from urllib.parse import parse_qs, urlparse
+
+    from django.test import override_settings
+
+    from rest_framework.pagination import PageNumberPagination
+    from rest_framework.test import APIRequestFactory
+
+    from core.pagination import KeysetPagination
+    from products.models import PriceHistory, Product, Supplier
+    from products.views import PriceHistoryViewSet
+
+    supplier = Supplier.objects.create(name='Benchmark Supplier', address='Street', phone='99999999999')
+    product = Product.objects.create(name='Benchmark Product', description='-', category=1, supplier=supplier)
+
+    PriceHistory.objects.bulk_create(
+        (PriceHistory(product=product, price=index, end=date.today()) for index in range(PAGE * PAGE_SIZE)),
+        batch_size=5000
+    )
+
+    factory = APIRequestFactory()
+
+    # Cursor of the requested page: the position of the last row of the previous one
+    paginator = KeysetPagination()
+    paginator.ordering = paginator.get_ordering(PriceHistory.objects.all(), None)
+    paginator.base_url = 'http://testserver/api/prices/'
+
+    last_row = PriceHistory.objects.order_by(*paginator.ordering)[(PAGE - 1) * PAGE_SIZE - 1]
+    cursor = parse_qs(urlparse(paginator.encode_cursor(last_row, reverse=False)).query)['cursor'][0]
+
+    runs = {
+        'page number': (PageNumberPagination, {'page': PAGE}),
+        'keyset': (KeysetPagination, {'cursor': cursor}),
+    }
+
+    with override_settings(CACHES=DUMMY_CACHES, CACHE_TAGS_ALIAS='default'):
+        for name, (pagination_class, deep_page) in runs.items():
+            view = PriceHistoryViewSet.as_view({'get': 'list'}, pagination_class=pagination_class)
+
+            first_page = measure(view, factory.get('/api/prices/'))
+            last_page = measure(view, factory.get('/api/prices/', data=deep_page))
+
+            print(f'{name:>12}: page 1 {first_page:8.2f} ms | page {PAGE:,} {last_page:8.2f} ms')
+
+
+if __name__ == '__main__':
+    with test_database():
+        main()
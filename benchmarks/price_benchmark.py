@@ -0,0 +1,70 @@
+"""
+Compares the time to price many (product, date) pairs with a query per pair
+and with the resolver, which looks all of them up in a query per chunk.
+
+Run from the project root, with the same environment as ``manage.py``,
+with ``python -m benchmarks.price_benchmark``.
+"""
+
+import random
+
+from datetime import date, timedelta
+from time import perf_counter
+
+from .utils import test_database
+
+PRODUCTS = 1000
+PRICES_PER_PRODUCT = 50
+PAIRS = 10_000
+
+
+def main():
+    from products.models import PriceHistory, Product, Supplier
+    from products.prices import PriceResolver
+
+    supplier = Supplier.objects.create(name='Benchmark Supplier', address='Street', phone='99999999999')
+    products = Product.objects.bulk_create(
+        Product(name=f'Benchmark Product {index}', description='-', sku=f'B-BP{index}', category=1, supplier=supplier)
+        for index in range(PRODUCTS)
+    )
+
+    first_day = date(2020, 1, 1)
+    PriceHistory.objects.bulk_create(
+        (PriceHistory(product=product, price=index, end=first_day + timedelta(days=30 * (index + 1)))
+         for product in products
+         for index in range(PRICES_PER_PRODUCT)),
+        batch_size=5000
+    )
+    # auto_now ignores the start given to bulk_create, so each interval starts where the previous one ended
+    for index in range(PRICES_PER_PRODUCT):
+        PriceHistory.objects.filter(price=index).update(start=first_day + timedelta(days=30 * index))
+
+    random.seed(0)
+    pairs = [(random.choice(products).id, first_day + timedelta(days=random.randrange(30 * PRICES_PER_PRODUCT)))
+             for _ in range(PAIRS)]
+
+    start = perf_counter()
+    naive = {
+        (product_id, at): (PriceHistory.objects
+                           .filter(product__pk=product_id, start__lte=at)
+                           .order_by('-start', '-id')
+                           .values_list('price', flat=True)
+                           .first())
+        for product_id, at in pairs
+    }
+    naive_elapsed = perf_counter() - start
+
+    start = perf_counter()
+    resolved = PriceResolver.resolve(pairs)
+    resolved_elapsed = perf_counter() - start
+
+    assert resolved == naive
+
+    print(f'{PAIRS:,} pairs over {PRODUCTS * PRICES_PER_PRODUCT:,} prices')
+    print(f'  query per pair: {naive_elapsed * 1000:8.1f} ms')
+    print(f'        resolver: {resolved_elapsed * 1000:8.1f} ms ({naive_elapsed / resolved_elapsed:.1f}x)')
+
+
+if __name__ == '__main__':
+    with test_database():
+        main()
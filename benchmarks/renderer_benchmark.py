@@ -0,0 +1,96 @@
+"""
+Compares the time the standard and the fast JSON renderers take to render the data of API responses.
+
+Run from the project root, with the same environment as ``manage.py``,
+with ``python -m benchmarks.renderer_benchmark``.
+"""
+
+import timeit
+
+from .utils import test_database
+
+PRODUCTS = 1000
+SALES = 1000
+DUMMY_CACHES = {
+    alias: {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'} for alias in ('default', 'shared')
+}
+
+
+def measure(run) -> float:
+    """
+    Best time out of twenty runs, in milliseconds
+    """
+
+    return min(timeit.repeat(run, number=1, repeat=20)) * 1000
+
+
+def main():
+    from django.test import override_settings
+
+    from rest_framework.renderers import JSONRenderer
+    from rest_framework.test import APIRequestFactory
+
+    from authentication.models import Customer
+    from cart.models import Sale
+    from cart.serializers import SaleSerializer
+    from core.renderers import FastJSONRenderer, orjson
+    from products.models import PriceHistory, Product, Recommendation, Review, Supplier
+    from products.views import PriceHistoryViewSet, ProductViewSet, RecommendationAlgorithmViewSet
+
+    customers = Customer.objects.bulk_create(
+        Customer(username=f'customer{index}', email=f'customer{index}@bench.dev') for index in range(5)
+    )
+    supplier = Supplier.objects.create(name='Benchmark Supplier', address='Street', phone='99999999999')
+    products = Product.objects.bulk_create(
+        Product(name=f'Product {index}', description='Uma descrição com acentuação', sku=f'BS1-P{index}',
+                category=1, supplier=supplier, current_price=100 + index)
+        for index in range(PRODUCTS)
+    )
+    PriceHistory.objects.bulk_create(PriceHistory(product=product, price=100) for product in products)
+    Review.objects.bulk_create(
+        Review(product=product, customer=customer, value=5) for product in products for customer in customers
+    )
+    Recommendation.objects.bulk_create(
+        Recommendation(product=products[0], recommended=product, score=index)
+        for index, product in enumerate(products[1:21])
+    )
+
+    sales = Sale.objects.bulk_create(
+        Sale(customer=customers[index % 5], total=100, delivery_address='Street', payment_method=1)
+        for index in range(SALES)
+    )
+    Sale.products.through.objects.bulk_create(
+        Sale.products.through(sale=sale, product=product) for sale in sales for product in products[:5]
+    )
+
+    factory = APIRequestFactory()
+
+    with override_settings(CACHES=DUMMY_CACHES, CACHE_TAGS_ALIAS='default'):
+        payloads = {
+            'products page': ProductViewSet.as_view({'get': 'list'})(factory.get('/api/products/')).data,
+            'products (1000)': ProductViewSet.as_view({'get': 'list'}, pagination_class=None)(
+                factory.get('/api/products/')
+            ).data,
+            'prices page': PriceHistoryViewSet.as_view({'get': 'list'})(factory.get('/api/prices/')).data,
+            'related products': RecommendationAlgorithmViewSet.as_view({'get': 'list_related_products'})(
+                factory.get('/'), pk=products[0].id
+            ).data,
+            'sales (1000)': SaleSerializer(Sale.objects.prefetch_related('products'), many=True).data,
+        }
+
+    print(f'orjson {"installed" if orjson is not None else "not installed, both use the standard library"}')
+
+    standard, fast = JSONRenderer(), FastJSONRenderer()
+    for name, data in payloads.items():
+        assert fast.render(data) == standard.render(data)
+
+        standard_time = measure(lambda: standard.render(data))
+        fast_time = measure(lambda: fast.render(data))
+
+        print(f'{name:>18}: standard {standard_time:7.3f} ms | fast {fast_time:7.3f} ms '
+              f'({standard_time / fast_time:.1f}x)')
+
+
+if __name__ == '__main__':
+    with test_database():
+        main()
@@ -0,0 +1,76 @@
+"""
+Compares serializing pages of products, suppliers and price histories with their model serializers
+and with a ValuesSerializer of the same serializer, from the query to the rendered JSON.
+
+Run from the project root, with the same environment as ``manage.py``,
+with ``python -m benchmarks.serializer_benchmark``.
+"""
+
+import timeit
+
+from .utils import test_database
+
+ROWS = (10, 100, 1000)
+
+
+def measure(run) -> float:
+    """
+    Best time out of five runs, in milliseconds
+    """
+
+    return min(timeit.repeat(run, number=1, repeat=5)) * 1000
+
+
+def main():
+    from django.db.models import Prefetch
+
+    from rest_framework.renderers import JSONRenderer
+
+    from authentication.models import Customer
+    from core.serializers import ValuesSerializer
+    from products.models import PriceHistory, Product, Review, Supplier
+    from products.serializers import PriceHistorySerializer, ProductSerializer, SupplierSerializer
+
+    customers = Customer.objects.bulk_create(
+        Customer(username=f'customer{index}', email=f'customer{index}@bench.dev') for index in range(5)
+    )
+    suppliers = Supplier.objects.bulk_create(
+        Supplier(name=f'Supplier {index}', address='Street', phone=f'{index:011d}') for index in range(max(ROWS))
+    )
+    products = Product.objects.bulk_create(
+        Product(name=f'Product {index}', description='Description', sku=f'S{index}-P', category=1,
+                supplier=suppliers[index])
+        for index in range(max(ROWS))
+    )
+    PriceHistory.objects.bulk_create(PriceHistory(product=product, price=100) for product in products)
+    Review.objects.bulk_create(
+        Review(product=product, customer=customer, value=5) for product in products for customer in customers[:2]
+    )
+
+    querysets = {
+        ProductSerializer: Product.objects.prefetch_related(
+            Prefetch('customers', queryset=Customer.objects.only('id'))
+        ),
+        SupplierSerializer: Supplier.objects.all(),
+        PriceHistorySerializer: PriceHistory.objects.all(),
+    }
+
+    renderer = JSONRenderer()
+
+    for serializer_class, queryset in querysets.items():
+        values_serializer = ValuesSerializer(serializer_class)
+
+        for rows in ROWS:
+            page = queryset[:rows]
+            values_page = values_serializer.get_queryset(queryset)[:rows]
+
+            model_serializer = measure(lambda: renderer.render(serializer_class(page.all(), many=True).data))
+            values = measure(lambda: renderer.render(values_serializer.serialize(values_page.all())))
+
+            print(f'{serializer_class.__name__:>22} {rows:>5} rows: serializer {model_serializer:8.2f} ms | '
+                  f'values {values:8.2f} ms ({model_serializer / values:.1f}x)')
+
+
+if __name__ == '__main__':
+    with test_database():
+        main()
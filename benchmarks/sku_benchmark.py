@@ -0,0 +1,54 @@
+"""
+Measures SKU generation throughput, one call at a time and in batches.
+
+Run from the project root with ``python -m benchmarks.sku_benchmark``.
+"""
+
+import re
+import sys
+import timeit
+
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'apps'))
+
+from products.utils import SkuUtils  # noqa: E402
+
+PRODUCTS = 10_000
+SUPPLIERS = 50
+
+
+def generate_sku_without_cache(supplier_name: str, product_name: str, category: int):
+    """
+    SKU generation as it was before the patterns were compiled and the supplier initials cached
+    """
+
+    def get_capitalized_letters(text: str):
+        separated_text = re.sub(r'([A-Za-z])([A-Z])', r'\1 \2', text).title()
+
+        return ''.join(re.findall(r'\b(\w)', separated_text))
+
+    return f'{get_capitalized_letters(supplier_name)}{category}-{get_capitalized_letters(product_name)}'
+
+
+def main():
+    products = [
+        (f'SupplierCompany{index % SUPPLIERS}', f'Some Product Name {index}', index % 4 + 1)
+        for index in range(PRODUCTS)
+    ]
+
+    assert SkuUtils.generate_skus(products) == [generate_sku_without_cache(*product) for product in products]
+
+    runs = {
+        'uncached per call': lambda: [generate_sku_without_cache(*product) for product in products],
+        'per call': lambda: [SkuUtils.generate_sku(*product) for product in products],
+        'batch': lambda: SkuUtils.generate_skus(products),
+    }
+
+    for name, run in runs.items():
+        best = min(timeit.repeat(run, number=1, repeat=5))
+        print(f'{name:>18}: {PRODUCTS / best:>12,.0f} SKUs/s ({best * 1e6 / PRODUCTS:.2f} us per SKU)')
+
+
+if __name__ == '__main__':
+    main()
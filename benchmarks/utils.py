@@ -0,0 +1,29 @@
+import os
+
+from contextlib import contextmanager
+
+
+@contextmanager
+def test_database():
+    """
+    Sets Django up against a throwaway test database, like the one created by ``manage.py test``,
+    so benchmarks never write to the configured database
+    """
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+
+    import django
+
+    django.setup()
+
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    database_name = connection.creation.create_test_db(verbosity=0)
+
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(database_name, verbosity=0)
+        teardown_test_environment()
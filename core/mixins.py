@@ -0,0 +1,43 @@
+from rest_framework.generics import get_object_or_404
+from rest_framework.response import Response
+
+from .serializers import ValuesSerializer
+
+
+class ValuesReadModelMixin:
+    """
+    Lists and retrieves with a ``ValuesSerializer`` of the viewset's serializer class, which builds
+    the same response from ``.values()`` rows. The serializer class still handles every write.
+
+    Objects are never instantiated, so this is only for viewsets without object level permissions
+    """
+
+    __values_serializers = {}
+
+    def get_values_serializer(self) -> ValuesSerializer:
+        serializer_class = self.get_serializer_class()
+
+        values_serializer = self.__values_serializers.get(serializer_class)
+        if values_serializer is None:
+            values_serializer = self.__values_serializers[serializer_class] = ValuesSerializer(serializer_class)
+
+        return values_serializer
+
+    def list(self, request, *args, **kwargs):
+        values_serializer = self.get_values_serializer()
+        queryset = values_serializer.get_queryset(self.filter_queryset(self.get_queryset()))
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(values_serializer.serialize(page))
+
+        return Response(values_serializer.serialize(queryset))
+
+    def retrieve(self, request, *args, **kwargs):
+        values_serializer = self.get_values_serializer()
+        queryset = values_serializer.get_queryset(self.filter_queryset(self.get_queryset()))
+
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        row = get_object_or_404(queryset, **{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+
+        return Response(values_serializer.serialize([row])[0])
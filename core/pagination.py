@@ -0,0 +1,230 @@
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import Q, QuerySet
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginates by the position of the last row of a page instead of an offset, so a deep page
+    costs the same index range scan as the first one.
+
+    Rows are ordered by the view's ``keyset_ordering`` or the model's ``Meta.ordering``, with the
+    primary key as tiebreaker. Cursors are opaque and the ``count`` is only computed on request
+    with ``?count=exact`` or ``?count=approximate``
+    """
+
+    page_size = api_settings.PAGE_SIZE
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    invalid_cursor_message = _('Invalid cursor')
+
+    # Below this planner estimate an exact count is cheap enough to be returned instead
+    approximate_count_threshold = 10_000
+
+    def paginate_queryset(self, queryset: QuerySet, request, view=None):
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(queryset, view)
+        self.count = self.get_count(queryset, request)
+
+        position, self.reverse = self.decode_cursor(request)
+
+        ordering = [self.__invert(field) for field in self.ordering] if self.reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+
+        if position is None:
+            rows = list(queryset[:self.page_size + 1])
+        else:
+            rows = self.__get_rows_after(queryset, ordering, position)
+
+        has_more = len(rows) > self.page_size
+
+        self.page = rows[:self.page_size]
+        if self.reverse:
+            self.page.reverse()
+
+        self.has_next = bool(self.page) if self.reverse else has_more
+        self.has_previous = has_more if self.reverse else position is not None
+
+        return self.page
+
+    def __get_rows_after(self, queryset: QuerySet, ordering: list[str], position: list[str]) -> list:
+        """
+        Up to a page and one rows after the position, reading each tie level of the ordering only
+        while the page is not full
+        """
+
+        try:
+            position_filters = self.__get_position_filters(queryset, ordering, position)
+        except (ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+        rows = []
+        for position_filter in position_filters:
+            rows.extend(queryset.filter(position_filter)[:self.page_size + 1 - len(rows)])
+
+            if len(rows) > self.page_size:
+                break
+
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response({
+            'count': self.count,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        link = {'type': 'string', 'nullable': True, 'format': 'uri'}
+
+        return {
+            'type': 'object',
+            'required': ['count', 'next', 'previous', 'results'],
+            'properties': {
+                'count': {'type': 'integer', 'nullable': True, 'example': None},
+                'next': link,
+                'previous': link,
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Cursor of the page, as given by the next and previous links.',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.count_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Also count the results, either exactly or by the database planner estimate.',
+                'schema': {'type': 'string', 'enum': ['exact', 'approximate']},
+            },
+        ]
+
+    def get_ordering(self, queryset: QuerySet, view) -> list[str]:
+        options = queryset.model._meta
+        ordering = list(getattr(view, 'keyset_ordering', None) or options.ordering)
+
+        # Ordering by a foreign key would sort by the related model's ordering through a join
+        columns = []
+        for field in ordering:
+            descending = field.startswith('-')
+            column = options.get_field(field.lstrip('-')).attname
+
+            columns.append(f'-{column}' if descending else column)
+
+        if options.pk.attname not in (column.lstrip('-') for column in columns):
+            columns.append(options.pk.attname)
+
+        return columns
+
+    def get_count(self, queryset: QuerySet, request) -> int | None:
+        match request.query_params.get(self.count_query_param):
+            case 'exact':
+                return queryset.count()
+
+            case 'approximate':
+                return self.__get_approximate_count(queryset)
+
+            case _:
+                return None
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def decode_cursor(self, request) -> tuple[list[str] | None, bool]:
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, False
+
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(token.encode()))
+            position, reverse = cursor['p'], bool(cursor['r'])
+        except (TypeError, ValueError, KeyError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        return position, reverse
+
+    def encode_cursor(self, instance, reverse: bool) -> str:
+        columns = [field.lstrip('-') for field in self.ordering]
+
+        # Rows of values() querysets are dictionaries keyed by column
+        if isinstance(instance, dict):
+            position = [str(instance[column]) for column in columns]
+        else:
+            position = [str(getattr(instance, column)) for column in columns]
+
+        token = base64.urlsafe_b64encode(json.dumps({'p': position, 'r': reverse}).encode()).decode()
+
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def __get_approximate_count(self, queryset: QuerySet) -> int:
+        """
+        PostgreSQL planner estimate of the number of rows, falling back to an exact count
+        on small results and on other databases
+        """
+
+        if connections[queryset.db].vendor == 'postgresql':
+            plan = json.loads(queryset.order_by().explain(format='json'))
+            estimate = int(plan[0]['Plan']['Plan Rows'])
+
+            if estimate >= self.approximate_count_threshold:
+                return estimate
+
+        return queryset.count()
+
+    @staticmethod
+    def __invert(field: str) -> str:
+        return field[1:] if field.startswith('-') else f'-{field}'
+
+    @staticmethod
+    def __get_position_filters(queryset: QuerySet, ordering: list[str], position: list[str]) -> list[Q]:
+        """
+        Rows after the position, as disjoint filters in the page order: (a = x AND b > y), then (a > x).
+        Each one is a single index seek, unlike their disjunction or a row value comparison
+        """
+
+        options = queryset.model._meta
+        values = [options.get_field(field.lstrip('-')).to_python(value) for field, value in zip(ordering, position)]
+
+        position_filters = []
+        for index in reversed(range(len(ordering))):
+            field = ordering[index]
+            lookup = 'lt' if field.startswith('-') else 'gt'
+
+            position_filter = Q(**{f'{field.lstrip("-")}__{lookup}': values[index]})
+            for previous_field, value in zip(ordering[:index], values):
+                position_filter &= Q(**{previous_field.lstrip('-'): value})
+
+            position_filters.append(position_filter)
+
+        return position_filters
@@ -0,0 +1,40 @@
+import codecs
+import io
+import re
+
+from django.conf import settings
+
+from rest_framework import parsers
+
+from .renderers import FastJSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson reads integers wider than 64 bits as floats, so bodies with long digit runs are left to the standard parser
+WIDE_INTEGER_PATTERN = re.compile(rb'\d{19}')
+
+
+class FastJSONParser(parsers.JSONParser):
+    """
+    JSON parser that decodes UTF-8 bodies with orjson when it is installed. Bodies orjson refuses,
+    such as NaN constants, are parsed again by the standard parser, which raises the same errors as before
+    """
+
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or codecs.lookup(encoding).name != 'utf-8':
+            return super().parse(stream, media_type, parser_context)
+
+        content = stream.read()
+        if WIDE_INTEGER_PATTERN.search(content):
+            return super().parse(io.BytesIO(content), media_type, parser_context)
+
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            return super().parse(io.BytesIO(content), media_type, parser_context)
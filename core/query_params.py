@@ -0,0 +1,15 @@
+from datetime import date
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+
+
+def get_date_query_param(request: Request, param: str) -> date | None:
+    value = request.query_params.get(param)
+    if not value:
+        return None
+
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ValidationError({param: ['Enter a date in the YYYY-MM-DD format.']})
@@ -0,0 +1,34 @@
+from rest_framework import renderers
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    """
+    JSON renderer that encodes with orjson when it is installed. Dates, decimals, lazy translations and
+    the other types orjson does not know are converted by the renderer's encoder class, as the standard
+    renderer does.
+
+    Indented, ASCII only or non compact output, payloads orjson cannot encode and environments without
+    orjson are rendered by the standard library encoder. Unlike it, orjson renders NaN as null
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (orjson is None or data is None or self.ensure_ascii or not self.compact
+                or self.get_indent(accepted_media_type, renderer_context or {}) is not None):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            content = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Escapes the line and paragraph separators like the standard renderer, so the output is valid JavaScript
+        return content.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
@@ -0,0 +1,101 @@
+from collections import defaultdict
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import QuerySet
+
+from rest_framework import serializers
+
+
+class ValuesSerializer:
+    """
+    Serializes ``.values()`` rows the same way a ``ModelSerializer`` serializes model instances,
+    without instantiating models. The conversion of each field is resolved once, so only plain and
+    primary key related fields are supported
+    """
+
+    def __init__(self, serializer_class: type[serializers.ModelSerializer]):
+        self.model = serializer_class.Meta.model
+        self.fields = []
+
+        options = self.model._meta
+        for name, field in serializer_class().fields.items():
+            if field.write_only:
+                continue
+
+            if '.' in field.source or field.source == '*':
+                raise ImproperlyConfigured(f'{serializer_class.__name__}.{name} is not a model column')
+
+            if isinstance(field, serializers.ManyRelatedField):
+                if not isinstance(field.child_relation, serializers.PrimaryKeyRelatedField):
+                    raise ImproperlyConfigured(f'{serializer_class.__name__}.{name} is not a primary key relation')
+
+                self.fields.append((name, options.get_field(field.source), None, True))
+
+            elif isinstance(field, serializers.RelatedField):
+                if not isinstance(field, serializers.PrimaryKeyRelatedField) or field.pk_field is not None:
+                    raise ImproperlyConfigured(f'{serializer_class.__name__}.{name} is not a primary key relation')
+
+                # values() already gives the primary key of the related object
+                self.fields.append((name, field.source, self.__identity, False))
+
+            else:
+                self.fields.append((name, field.source, field.to_representation, False))
+
+        # The primary key groups many to many relations and the ordering builds pagination cursors
+        self.columns = {options.pk.attname}
+        self.columns.update(options.get_field(field.lstrip('-')).attname for field in options.ordering)
+        self.columns.update(column for _, column, _, many in self.fields if not many)
+
+    @staticmethod
+    def __identity(value):
+        return value
+
+    def get_queryset(self, queryset: QuerySet) -> QuerySet:
+        return queryset.prefetch_related(None).values(*self.columns)
+
+    def serialize(self, rows) -> list[dict]:
+        rows = list(rows)
+
+        pk = self.model._meta.pk.attname
+        ids = [row[pk] for row in rows]
+
+        related = {name: self.__get_related_ids(field, ids) for name, field, _, many in self.fields if many}
+
+        return [
+            {
+                name: related[name].get(row[pk], []) if many else
+                None if row[column] is None else to_representation(row[column])
+                for name, column, to_representation, many in self.fields
+            }
+            for row in rows
+        ]
+
+    @staticmethod
+    def __get_related_ids(field, ids: list) -> dict[object, list]:
+        """
+        Related primary keys of each row, from a single query on the through table, ordered like
+        the related model's default ordering
+        """
+
+        if not ids:
+            return {}
+
+        through = field.remote_field.through
+        source = through._meta.get_field(field.m2m_field_name())
+        target = through._meta.get_field(field.m2m_reverse_field_name())
+
+        ordering = [
+            f'-{target.name}__{field.lstrip("-")}' if field.startswith('-') else f'{target.name}__{field}'
+            for field in target.related_model._meta.ordering
+        ]
+
+        pairs = (through.objects
+                 .filter(**{f'{source.name}__in': ids})
+                 .order_by(*ordering)
+                 .values_list(source.attname, target.attname))
+
+        related_ids = defaultdict(list)
+        for source_id, target_id in pairs:
+            related_ids[source_id].append(target_id)
+
+        return related_ids
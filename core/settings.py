@@ -16,6 +16,8 @@ import sys
 from pathlib import Path
 from decouple import config
 
+from celery.schedules import crontab
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -47,6 +49,7 @@ INSTALLED_APPS = [
 
     # Application
     'spectacular_swagger',
+    'caching',
     'authentication',
     'products',
     'cart',
@@ -161,6 +164,17 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ),
 
+    'DEFAULT_RENDERER_CLASSES': (
+        'core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+
+    'DEFAULT_PARSER_CLASSES': (
+        'core.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
 
@@ -232,6 +246,28 @@ CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TIMEZONE = 'America/Sao_Paulo'
 CELERY_ENABLE_UTC = True
 
+# Seconds during which repeated dispatches of a task with the same arguments are collapsed
+TASK_COALESCE_WINDOW = config('TASK_COALESCE_WINDOW', default=5, cast=int)
+
+CELERY_BEAT_SCHEDULE = {
+    'rebuild-all-recommendations': {
+        'task': 'products.tasks.rebuild_all_recommendations',
+        'schedule': crontab(hour=3, minute=0),
+    },
+    'update-co-purchases': {
+        'task': 'products.tasks.update_co_purchases',
+        'schedule': crontab(minute=0),
+    },
+    'update-sales-rollup': {
+        'task': 'cart.tasks.update_sales_rollup',
+        'schedule': crontab(minute='*/10'),
+    },
+    'compact-price-history': {
+        'task': 'products.tasks.compact_price_history',
+        'schedule': crontab(hour=4, minute=0),
+    },
+}
+
 # DRF Spectacular
 
 SPECTACULAR_SETTINGS = {
@@ -245,7 +281,42 @@ SPECTACULAR_SETTINGS = {
 
 CACHES = {
     "default": {
-        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
-        "LOCATION": "cache_table",
-    }
+        "BACKEND": "caching.backends.TieredCache",
+        "LOCATION": "tiered",
+        "OPTIONS": {
+            "SHARED_CACHE": "shared",
+            "MAX_BYTES": config('CACHE_LOCAL_MAX_BYTES', default=64 * 1024 * 1024, cast=int),
+            "LOCAL_TIMEOUT": config('CACHE_LOCAL_TIMEOUT', default=60, cast=int),
+            "RETRY_AFTER": 30,
+        },
+    },
+    "shared": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": config('CACHE_URL', default=CELERY_BROKER_URL, cast=str),
+    },
+}
+
+# Tag versions must be seen by every process as soon as they change, so they skip the local tier
+CACHE_TAGS_ALIAS = 'shared'
+
+# Task dispatch counters are incremented by every process, so they skip the local tier too
+TASK_STATS_CACHE_ALIAS = 'shared'
+
+# The test runner swaps these in, keeping the tiered backend with an in-memory shared tier, and clears
+# them before each test so cached responses do not leak between test cases
+TEST_CACHES = {
+    "default": {
+        "BACKEND": "caching.backends.TieredCache",
+        "LOCATION": "tiered",
+        "OPTIONS": {
+            "SHARED_CACHE": "shared",
+            "RETRY_AFTER": 30,
+        },
+    },
+    "shared": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "shared",
+    },
 }
+
+TEST_RUNNER = 'core.testing.TestRunner'
@@ -0,0 +1,124 @@
+import re
+import unittest
+
+from collections.abc import Iterable
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import Model
+from django.test.runner import DiscoverRunner
+from django.test.utils import CaptureQueriesContext, override_settings
+
+# Statements whose plan can scan a table
+EXPLAINED_STATEMENTS = ('SELECT', 'WITH', 'UPDATE', 'DELETE', 'INSERT')
+
+SQLITE_SCAN = re.compile(r'^SCAN (\w+)$')
+POSTGRESQL_SCAN = re.compile(r'Seq Scan on (\w+)')
+SQL_ALIAS = re.compile(r'"(\w+)"(?: AS)? (\w+)')
+
+
+class QueryPlanTestMixin:
+    """
+    Test case mixin checking the plans of the queries run by the code under test. A sequential scan of
+    a table of ``sequential_scan_threshold`` rows or more fails the test, so hot paths stay on their indexes
+    as the tables grow. Tables must be filled above the threshold for their scans to be noticed.
+
+    Only table scans count: SQLite also reports walks of a whole index as scans ``USING INDEX``,
+    which are how an ordered page is read. PostgreSQL rightly prefers scanning tables as small as test
+    fixtures, so its plans are explained with sequential scans disabled: it then scans a table only
+    when no index can serve the query
+    """
+
+    sequential_scan_threshold = 1000
+
+    @staticmethod
+    def __explain(connection, sql: str) -> list[str]:
+        with connection.cursor() as cursor:
+            if connection.vendor == 'sqlite':
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+                return [row[-1] for row in cursor.fetchall()]
+
+            with transaction.atomic(using=connection.alias):
+                cursor.execute('SET LOCAL enable_seqscan = off')
+                cursor.execute(f'EXPLAIN {sql}')
+                return [row[0] for row in cursor.fetchall()]
+
+    @staticmethod
+    def __get_scanned_tables(connection, sql: str, plan: list[str]) -> set[str]:
+        if connection.vendor == 'sqlite':
+            # SQLite names tables by their alias in the query, if any
+            aliases = {alias: table for table, alias in SQL_ALIAS.findall(sql)}
+            scanned = {aliases.get(match.group(1), match.group(1))
+                       for match in map(SQLITE_SCAN.match, plan) if match is not None}
+        else:
+            scanned = {table for line in plan for table in POSTGRESQL_SCAN.findall(line)}
+
+        # Common table expressions and subqueries are scanned too, but they are not tables
+        return scanned & set(connection.introspection.table_names())
+
+    @staticmethod
+    def __count(connection, table: str) -> int:
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT COUNT(*) FROM {connection.ops.quote_name(table)}')
+            return cursor.fetchone()[0]
+
+    @contextmanager
+    def assertNoSequentialScans(self, full_scans: Iterable[type[Model]] = (), using: str = DEFAULT_DB_ALIAS):
+        """
+        Explains every query run inside the block, once it ends, with fresh planner statistics.
+        The tables of ``full_scans`` are meant to be read whole and may be scanned
+        """
+
+        connection = connections[using]
+        allowed = {model._meta.db_table for model in full_scans}
+
+        with CaptureQueriesContext(connection) as context:
+            yield context
+
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+        for query in context.captured_queries:
+            sql = query.get('sql')
+            if not sql.lstrip().upper().startswith(EXPLAINED_STATEMENTS):
+                continue
+
+            plan = self.__explain(connection, sql)
+            for table in self.__get_scanned_tables(connection, sql, plan) - allowed:
+                rows = self.__count(connection, table)
+                if rows >= self.sequential_scan_threshold:
+                    self.fail(f'Sequential scan of {table} ({rows} rows) in:\n{sql}\n' + '\n'.join(plan))
+
+
+class CacheClearingResultMixin:
+    def startTest(self, test):
+        # Test cases may swap in caches of their own, which they manage themselves
+        for alias in settings.TEST_CACHES.keys() & settings.CACHES.keys():
+            caches[alias].clear()
+
+        super().startTest(test)
+
+
+class TestRunner(DiscoverRunner):
+    """
+    Runs the tests against ``TEST_CACHES``, cleared before each test. Test cases roll back the database
+    but not the caches, so responses cached by one test would otherwise be served to the next
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.__caches = override_settings(CACHES=settings.TEST_CACHES)
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.__caches.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self.__caches.disable()
+        super().teardown_test_environment(**kwargs)
+
+    def get_resultclass(self):
+        resultclass = super().get_resultclass() or unittest.TextTestResult
+        return type(f'CacheClearing{resultclass.__name__}', (CacheClearingResultMixin, resultclass), {})